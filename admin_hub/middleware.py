@@ -0,0 +1,53 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from admin_hub.thread_local import set_current_request, reset_current_request
+from utils.database.tenant_connections import register_tenant_database
+from utils.database.tenant_directory import tenant_directory
+from utils.database.tenant_domains import request_domain, resolve_client_name
+
+
+class TenantResolutionMiddleware:
+    """
+    Resolves the tenant database for the request domain once and binds the
+    request to the current context.
+
+    Views read request.tenant_db / request.tenant_client; helpers use
+    get_current_request(). The alias is deliberately not bound for routing:
+    admin_hub queries only go to a tenant inside `tenant()`/`tenant_alias()`
+    or with an explicit .using(), so unscoped ones keep hitting 'default'.
+    """
+
+    async_capable = True
+    sync_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def resolve(self, request):
+        domain = request_domain(request)
+        tenant_alias = tenant_directory.alias_for_domain(domain)
+        if tenant_alias:
+            register_tenant_database(tenant_alias)
+
+        request.tenant_domain = domain
+        request.tenant_db = tenant_alias
+        request.tenant_client = resolve_client_name(domain)
+        return set_current_request(request)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        request_token = self.resolve(request)
+        try:
+            return self.get_response(request)
+        finally:
+            reset_current_request(request_token)
+
+    async def __acall__(self, request):
+        request_token = self.resolve(request)
+        try:
+            return await self.get_response(request)
+        finally:
+            reset_current_request(request_token)
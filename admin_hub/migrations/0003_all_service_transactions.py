@@ -0,0 +1,328 @@
+from django.db import migrations, models
+
+
+# One normalised row per service transaction across every txn_* table. Postgres
+# pushes filters on txn_ref / service_table / created_at down into each branch,
+# so a lookup uses the per-table ref indexes added below. Any migration that
+# changes a column used here has to drop and recreate the view.
+ALL_SERVICE_TRANSACTIONS_SQL = """
+    CREATE VIEW all_service_transactions AS
+        SELECT 'txn_fund_transfer:' || entry_id AS row_key,
+               'txn_fund_transfer'::varchar AS service_table,
+               entry_id AS service_id,
+               ref_number AS txn_ref,
+               current_status AS txn_status,
+               transfer_amount AS txn_amount,
+               partner_id AS provider_id,
+               mobile_no AS customer_mobile,
+               beneficiary_name AS customer_name,
+               initiated_by AS created_by,
+               created_at AS created_at
+        FROM txn_fund_transfer
+        UNION ALL
+        SELECT 'txn_electricity:' || bill_id AS row_key,
+               'txn_electricity'::varchar AS service_table,
+               bill_id AS service_id,
+               unique_ref AS txn_ref,
+               bill_status AS txn_status,
+               CASE WHEN bill_amount ~ '^[[:space:]]*-?[0-9]+([.][0-9]+)?[[:space:]]*$' THEN btrim(bill_amount)::numeric(15, 2) END AS txn_amount,
+               partner_id AS provider_id,
+               mobile_no AS customer_mobile,
+               consumer_name AS customer_name,
+               created_by AS created_by,
+               created_at AS created_at
+        FROM txn_electricity
+        UNION ALL
+        SELECT 'txn_gas_bill:' || bill_id AS row_key,
+               'txn_gas_bill'::varchar AS service_table,
+               bill_id AS service_id,
+               transaction_ref AS txn_ref,
+               payment_status AS txn_status,
+               CASE WHEN due_amount ~ '^[[:space:]]*-?[0-9]+([.][0-9]+)?[[:space:]]*$' THEN btrim(due_amount)::numeric(15, 2) END AS txn_amount,
+               partner_id AS provider_id,
+               contact_mobile AS customer_mobile,
+               customer_name AS customer_name,
+               created_by AS created_by,
+               created_at AS created_at
+        FROM txn_gas_bill
+        UNION ALL
+        SELECT 'txn_lic_premium:' || premium_id AS row_key,
+               'txn_lic_premium'::varchar AS service_table,
+               premium_id AS service_id,
+               lic_ref_id AS txn_ref,
+               premium_status AS txn_status,
+               CASE WHEN premium_amount ~ '^[[:space:]]*-?[0-9]+([.][0-9]+)?[[:space:]]*$' THEN btrim(premium_amount)::numeric(15, 2) END AS txn_amount,
+               partner_id AS provider_id,
+               registered_mobile AS customer_mobile,
+               NULL::varchar AS customer_name,
+               created_by AS created_by,
+               created_at AS created_at
+        FROM txn_lic_premium
+        UNION ALL
+        SELECT 'txn_mobile_recharge:' || recharge_id AS row_key,
+               'txn_mobile_recharge'::varchar AS service_table,
+               recharge_id AS service_id,
+               request_txn_id AS txn_ref,
+               recharge_status AS txn_status,
+               recharge_amount AS txn_amount,
+               service_partner_id AS provider_id,
+               mobile_number AS customer_mobile,
+               NULL::varchar AS customer_name,
+               created_by AS created_by,
+               created_at AS created_at
+        FROM txn_mobile_recharge
+        UNION ALL
+        SELECT 'txn_bbps_bill:' || bill_id AS row_key,
+               'txn_bbps_bill'::varchar AS service_table,
+               bill_id AS service_id,
+               request_ref AS txn_ref,
+               payment_status AS txn_status,
+               bill_amount AS txn_amount,
+               service_partner_id AS provider_id,
+               customer_mobile AS customer_mobile,
+               NULL::varchar AS customer_name,
+               created_by AS created_by,
+               payment_date AS created_at
+        FROM txn_bbps_bill
+        UNION ALL
+        SELECT 'txn_cashfree_pg:' || cf_txn_id AS row_key,
+               'txn_cashfree_pg'::varchar AS service_table,
+               cf_txn_id AS service_id,
+               cf_order_id AS txn_ref,
+               payment_status AS txn_status,
+               payment_amount AS txn_amount,
+               partner_id AS provider_id,
+               customer_mobile AS customer_mobile,
+               NULL::varchar AS customer_name,
+               created_by AS created_by,
+               created_at AS created_at
+        FROM txn_cashfree_pg
+        UNION ALL
+        SELECT 'txn_phonepe:' || pp_id AS row_key,
+               'txn_phonepe'::varchar AS service_table,
+               pp_id AS service_id,
+               merchant_txn_id AS txn_ref,
+               current_status AS txn_status,
+               amount_paid AS txn_amount,
+               partner_id AS provider_id,
+               mobile AS customer_mobile,
+               NULL::varchar AS customer_name,
+               created_by AS created_by,
+               created_at AS created_at
+        FROM txn_phonepe
+        UNION ALL
+        SELECT 'txn_pg_gateway:' || gateway_txn_id AS row_key,
+               'txn_pg_gateway'::varchar AS service_table,
+               gateway_txn_id AS service_id,
+               order_ref AS txn_ref,
+               txn_status AS txn_status,
+               txn_amount AS txn_amount,
+               partner_id AS provider_id,
+               customer_mobile AS customer_mobile,
+               customer_name AS customer_name,
+               created_by AS created_by,
+               created_at AS created_at
+        FROM txn_pg_gateway
+        UNION ALL
+        SELECT 'txn_money_transfer:' || transfer_id AS row_key,
+               'txn_money_transfer'::varchar AS service_table,
+               transfer_id AS service_id,
+               reference_code AS txn_ref,
+               transfer_status AS txn_status,
+               transfer_amount AS txn_amount,
+               provider_id AS provider_id,
+               beneficiary_mobile AS customer_mobile,
+               beneficiary_name AS customer_name,
+               initiated_by AS created_by,
+               created_at AS created_at
+        FROM txn_money_transfer
+        UNION ALL
+        SELECT 'txn_aeps_cash:' || log_id AS row_key,
+               'txn_aeps_cash'::varchar AS service_table,
+               log_id AS service_id,
+               reference_no AS txn_ref,
+               current_status AS txn_status,
+               CASE WHEN txn_amount ~ '^[[:space:]]*-?[0-9]+([.][0-9]+)?[[:space:]]*$' THEN btrim(txn_amount)::numeric(15, 2) END AS txn_amount,
+               partner_id AS provider_id,
+               customer_mobile AS customer_mobile,
+               NULL::varchar AS customer_name,
+               initiated_by AS created_by,
+               processed_at AS created_at
+        FROM txn_aeps_cash
+        UNION ALL
+        SELECT 'txn_bulk_payout:' || payout_id AS row_key,
+               'txn_bulk_payout'::varchar AS service_table,
+               payout_id AS service_id,
+               payout_ref AS txn_ref,
+               payout_result AS txn_status,
+               CASE WHEN transfer_amount ~ '^[[:space:]]*-?[0-9]+([.][0-9]+)?[[:space:]]*$' THEN btrim(transfer_amount)::numeric(15, 2) END AS txn_amount,
+               admin_id AS provider_id,
+               NULL::varchar AS customer_mobile,
+               NULL::varchar AS customer_name,
+               initiated_by_id AS created_by,
+               created_at AS created_at
+        FROM txn_bulk_payout
+        UNION ALL
+        SELECT 'txn_airtel_cms:' || entry_id AS row_key,
+               'txn_airtel_cms'::varchar AS service_table,
+               entry_id AS service_id,
+               cms_ref AS txn_ref,
+               bill_status AS txn_status,
+               bill_amount AS txn_amount,
+               admin_id AS provider_id,
+               mobile_no AS customer_mobile,
+               biller_name AS customer_name,
+               created_by AS created_by,
+               created_at AS created_at
+        FROM txn_airtel_cms
+        UNION ALL
+        SELECT 'txn_bankit_aeps:' || record_id AS row_key,
+               'txn_bankit_aeps'::varchar AS service_table,
+               record_id AS service_id,
+               bankit_txn AS txn_ref,
+               txn_status AS txn_status,
+               amount AS txn_amount,
+               partner_id AS provider_id,
+               mobile AS customer_mobile,
+               NULL::varchar AS customer_name,
+               created_by AS created_by,
+               created_at AS created_at
+        FROM txn_bankit_aeps
+        UNION ALL
+        SELECT 'txn_micro_atm:' || entry_id AS row_key,
+               'txn_micro_atm'::varchar AS service_table,
+               entry_id AS service_id,
+               txn_ref AS txn_ref,
+               current_status AS txn_status,
+               txn_amount AS txn_amount,
+               admin_id AS provider_id,
+               mobile_no AS customer_mobile,
+               NULL::varchar AS customer_name,
+               created_by AS created_by,
+               created_at AS created_at
+        FROM txn_micro_atm
+        UNION ALL
+        SELECT 'txn_ppi_transfer:' || transfer_id AS row_key,
+               'txn_ppi_transfer'::varchar AS service_table,
+               transfer_id AS service_id,
+               txn_ref_id AS txn_ref,
+               txn_status AS txn_status,
+               amount AS txn_amount,
+               partner_id AS provider_id,
+               customer_mobile AS customer_mobile,
+               NULL::varchar AS customer_name,
+               created_by AS created_by,
+               created_at AS created_at
+        FROM txn_ppi_transfer
+        UNION ALL
+        SELECT 'txn_digikhata:' || entry_id AS row_key,
+               'txn_digikhata'::varchar AS service_table,
+               entry_id AS service_id,
+               reference_no AS txn_ref,
+               current_status AS txn_status,
+               transfer_amount AS txn_amount,
+               admin_id AS provider_id,
+               mobile_no AS customer_mobile,
+               client_name AS customer_name,
+               initiated_by AS created_by,
+               created_at AS created_at
+        FROM txn_digikhata
+        UNION ALL
+        SELECT 'txn_aadhaar_verify:' || verify_id AS row_key,
+               'txn_aadhaar_verify'::varchar AS service_table,
+               verify_id AS service_id,
+               request_id AS txn_ref,
+               NULL::varchar AS txn_status,
+               verify_amount AS txn_amount,
+               partner_id AS provider_id,
+               NULL::varchar AS customer_mobile,
+               NULL::varchar AS customer_name,
+               initiated_by_id AS created_by,
+               created_at AS created_at
+        FROM txn_aadhaar_verify;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admin_hub', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ServiceTransaction',
+            fields=[
+                ('row_key', models.CharField(max_length=150, primary_key=True, serialize=False)),
+                ('service_table', models.CharField(max_length=100)),
+                ('service_id', models.IntegerField()),
+                ('txn_ref', models.CharField(max_length=150, null=True)),
+                ('txn_status', models.CharField(max_length=100, null=True)),
+                ('txn_amount', models.DecimalField(decimal_places=2, max_digits=15, null=True)),
+                ('customer_mobile', models.CharField(max_length=20, null=True)),
+                ('customer_name', models.CharField(max_length=200, null=True)),
+                ('created_by', models.IntegerField(null=True)),
+                ('created_at', models.DateTimeField(null=True)),
+            ],
+            options={
+                'db_table': 'all_service_transactions',
+                'managed': False,
+            },
+        ),
+        migrations.AddIndex(
+            model_name='airtelbillentry',
+            index=models.Index(fields=['cms_ref'], name='txn_airtel__cms_ref_86197a_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='bankitaepsrecord',
+            index=models.Index(fields=['bankit_txn'], name='txn_bankit__bankit__7a1f7f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='billpaymentrecord',
+            index=models.Index(fields=['request_ref'], name='txn_bbps_bi_request_a17262_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='bulkpayoutrecord',
+            index=models.Index(fields=['payout_ref'], name='txn_bulk_pa_payout__e2bc97_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='electricitybillentry',
+            index=models.Index(fields=['unique_ref'], name='txn_electri_unique__d96a1f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='fundtransferentry',
+            index=models.Index(fields=['ref_number'], name='txn_fund_tr_ref_num_2bda78_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='gasbillentry',
+            index=models.Index(fields=['transaction_ref'], name='txn_gas_bil_transac_f3a7e1_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='khatatransferentry',
+            index=models.Index(fields=['reference_no'], name='txn_digikha_referen_fb419b_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='licpremiumentry',
+            index=models.Index(fields=['lic_ref_id'], name='txn_lic_pre_lic_ref_289520_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='microatmentry',
+            index=models.Index(fields=['txn_ref'], name='txn_micro_a_txn_ref_36d96e_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='phonepepaymententry',
+            index=models.Index(fields=['merchant_txn_id'], name='txn_phonepe_merchan_8c999d_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='ppitransferlog',
+            index=models.Index(fields=['txn_ref_id'], name='txn_ppi_tra_txn_ref_7bd4fd_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='rechargehistory',
+            index=models.Index(fields=['request_txn_id'], name='txn_mobile__request_088295_idx'),
+        ),
+        migrations.RunSQL(
+            sql=ALL_SERVICE_TRANSACTIONS_SQL,
+            reverse_sql="DROP VIEW IF EXISTS all_service_transactions;",
+        ),
+    ]
@@ -0,0 +1,45 @@
+import django.db.models.deletion
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admin_hub', '0003_all_service_transactions'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WalletCheckpoint',
+            fields=[
+                ('checkpoint_id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('wallet_name', models.CharField(max_length=50)),
+                ('period', models.CharField(choices=[('DAILY', 'Daily'), ('MONTHLY', 'Monthly')], max_length=10)),
+                ('period_end', models.DateTimeField()),
+                ('balance', models.DecimalField(decimal_places=3, default=Decimal('0.000'), max_digits=20)),
+                ('entry_count', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'core_wallet_checkpoints',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='wallethistory',
+            index=models.Index(fields=['user', 'wallet_name', 'created_at'], name='core_wallet_user_id_0d5c34_idx'),
+        ),
+        migrations.AddField(
+            model_name='walletcheckpoint',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, related_name='wallet_checkpoints', to='admin_hub.portaluser'),
+        ),
+        migrations.AddIndex(
+            model_name='walletcheckpoint',
+            index=models.Index(fields=['user', 'wallet_name', 'period_end'], name='core_wallet_user_id_f83044_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='walletcheckpoint',
+            unique_together={('user', 'wallet_name', 'period', 'period_end')},
+        ),
+    ]
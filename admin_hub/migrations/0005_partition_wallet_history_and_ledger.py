@@ -0,0 +1,30 @@
+from django.db import migrations, models
+from utils.database.partitions import PARTITIONED_TABLES, convert_to_partitioned
+
+
+def partition_tables(apps, schema_editor):
+    for table in PARTITIONED_TABLES:
+        convert_to_partitioned(schema_editor.connection, table)
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction; the swap opens its own.
+    atomic = False
+
+    dependencies = [
+        ('admin_hub', '0004_walletcheckpoint'),
+    ]
+
+    operations = [
+        # Irreversible in place: going back would mean copying every row into a plain table.
+        migrations.RunPython(partition_tables, migrations.RunPython.noop),
+        # The converted tables already carry a matching index, which the parent adopts.
+        migrations.AddIndex(
+            model_name='gltrn',
+            index=models.Index(fields=['recorded_at'], name='core_ledger_recorde_cce9d1_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='wallethistory',
+            index=models.Index(fields=['created_at'], name='core_wallet_created_0ec0d1_idx'),
+        ),
+    ]
@@ -254,6 +254,7 @@ class GlTrn(models.Model):
     class Meta:
         db_table = 'core_ledger_entries'
         ordering = ['-recorded_at']
+        indexes = [models.Index(fields=['recorded_at'])]
 
     def __str__(self):
         return f"Ledger #{self.entry_id} | ₹{self.amount} | {self.get_entry_nature_display()}"
@@ -275,6 +276,7 @@ class WalletHistory(models.Model):
     class Meta:
         db_table = 'core_wallet_history'
         ordering = ['-created_at']
+        indexes = [models.Index(fields=['user', 'wallet_name', 'created_at']), models.Index(fields=['created_at'])]
         verbose_name = 'Wallet Transaction'
         verbose_name_plural = 'Wallet Transactions'
 
@@ -741,6 +743,9 @@ class RechargeHistory(models.Model):
     class Meta:
         db_table = 'txn_mobile_recharge'
         app_label = 'admin_hub'
+        indexes = [
+            models.Index(fields=['request_txn_id']),
+        ]
         
         
 class FundTransferEntry(models.Model):
@@ -771,6 +776,9 @@ class FundTransferEntry(models.Model):
     class Meta:
         db_table = 'txn_fund_transfer'
         app_label = 'admin_hub'
+        indexes = [
+            models.Index(fields=['ref_number']),
+        ]
         
 
 class CashfreeKycProfile(models.Model):
@@ -812,6 +820,9 @@ class BillPaymentRecord(models.Model):
     class Meta:
         db_table = 'txn_bbps_bill'
         app_label = 'admin_hub'
+        indexes = [
+            models.Index(fields=['request_ref']),
+        ]
         
         
 class CashfreePaymentLog(models.Model):
@@ -851,6 +862,9 @@ class PhonePePaymentEntry(models.Model):
     class Meta:
         db_table = 'txn_phonepe'
         app_label = 'admin_hub'
+        indexes = [
+            models.Index(fields=['merchant_txn_id']),
+        ]
         
 
 
@@ -910,6 +924,9 @@ class ElectricityBillEntry(models.Model):
     class Meta:
         db_table = 'txn_electricity'
         app_label = 'admin_hub'
+        indexes = [
+            models.Index(fields=['unique_ref']),
+        ]
 
 
 
@@ -952,6 +969,9 @@ class GasBillEntry(models.Model):
     class Meta:
         db_table = 'txn_gas_bill'
         app_label = 'admin_hub'
+        indexes = [
+            models.Index(fields=['transaction_ref']),
+        ]
         
         
 class LicPremiumEntry(models.Model):
@@ -973,6 +993,9 @@ class LicPremiumEntry(models.Model):
     class Meta:
         db_table = 'txn_lic_premium'
         app_label = 'admin_hub'
+        indexes = [
+            models.Index(fields=['lic_ref_id']),
+        ]
    
    
    
@@ -1157,6 +1180,9 @@ class BulkPayoutRecord(models.Model):
     class Meta:
         db_table = 'txn_bulk_payout'
         app_label = 'admin_hub'
+        indexes = [
+            models.Index(fields=['payout_ref']),
+        ]
         
         
 class AirtelBillEntry(models.Model):
@@ -1180,6 +1206,9 @@ class AirtelBillEntry(models.Model):
     class Meta:
         db_table = 'txn_airtel_cms'
         app_label = 'admin_hub'
+        indexes = [
+            models.Index(fields=['cms_ref']),
+        ]
         
     
 class BankItAepsRecord(models.Model):
@@ -1199,6 +1228,9 @@ class BankItAepsRecord(models.Model):
     class Meta:
         db_table = 'txn_bankit_aeps'
         app_label = 'admin_hub'
+        indexes = [
+            models.Index(fields=['bankit_txn']),
+        ]
         
         
 class MicroAtmEntry(models.Model):
@@ -1216,6 +1248,9 @@ class MicroAtmEntry(models.Model):
     class Meta:
         db_table = 'txn_micro_atm'
         app_label = 'admin_hub'
+        indexes = [
+            models.Index(fields=['txn_ref']),
+        ]
         
         
 class PpiTransferLog(models.Model):
@@ -1236,6 +1271,9 @@ class PpiTransferLog(models.Model):
     class Meta:
         db_table = 'txn_ppi_transfer'
         app_label = 'admin_hub'
+        indexes = [
+            models.Index(fields=['txn_ref_id']),
+        ]
   
  
 
@@ -1321,6 +1359,9 @@ class KhataTransferEntry(models.Model):
     class Meta:
         db_table = 'txn_digikhata'
         app_label = 'admin_hub'
+        indexes = [
+            models.Index(fields=['reference_no']),
+        ]
         
         
 
@@ -1396,4 +1437,51 @@ class HoldTransaction(models.Model):
 
     class Meta:
         db_table = 'ad_hold_amount'
-        app_label = 'admin_hub'
\ No newline at end of file
+        app_label = 'admin_hub'
+
+class ServiceTransaction(models.Model):
+    """Read-only rows of the all_service_transactions view (migration 0003)."""
+    row_key = models.CharField(max_length=150, primary_key=True)
+    service_table = models.CharField(max_length=100)
+    service_id = models.IntegerField()
+    txn_ref = models.CharField(max_length=150, null=True)
+    txn_status = models.CharField(max_length=100, null=True)
+    txn_amount = models.DecimalField(max_digits=15, decimal_places=2, null=True)
+    provider = models.ForeignKey(AdServiceProvider, on_delete=models.DO_NOTHING, db_constraint=False, null=True, related_name='+')
+    customer_mobile = models.CharField(max_length=20, null=True)
+    customer_name = models.CharField(max_length=200, null=True)
+    created_by = models.IntegerField(null=True)
+    created_at = models.DateTimeField(null=True)
+
+    class Meta:
+        managed = False
+        db_table = 'all_service_transactions'
+        app_label = 'admin_hub'
+
+
+class WalletCheckpoint(models.Model):
+    PERIOD_DAILY = 'DAILY'
+    PERIOD_MONTHLY = 'MONTHLY'
+    PERIOD_CHOICES = [
+        (PERIOD_DAILY, 'Daily'),
+        (PERIOD_MONTHLY, 'Monthly'),
+    ]
+
+    checkpoint_id = models.BigAutoField(primary_key=True)
+    user = models.ForeignKey(PortalUser, on_delete=models.PROTECT, related_name='wallet_checkpoints')
+    wallet_name = models.CharField(max_length=50)
+    period = models.CharField(max_length=10, choices=PERIOD_CHOICES)
+    # Balance from every history row created before period_end.
+    period_end = models.DateTimeField()
+    balance = models.DecimalField(max_digits=20, decimal_places=3, default=Decimal('0.000'))
+    entry_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'core_wallet_checkpoints'
+        app_label = 'admin_hub'
+        unique_together = ('user', 'wallet_name', 'period', 'period_end')
+        indexes = [models.Index(fields=['user', 'wallet_name', 'period_end'])]
+
+    def __str__(self):
+        return f"{self.user_id} {self.wallet_name} @ {self.period_end}: {self.balance}"
@@ -1,3 +1,203 @@
-from django.test import TestCase
+from decimal import Decimal
+from unittest import mock
+from django.test import SimpleTestCase
+from utils.database.charge_slabs import ChargeSlab, ChargeSlabError, ProviderCharges, SlabIndex
+from utils.database.tenant_domains import DomainIndex, normalize_domain
+from utils.wallet import engine
 
-# Create your tests here.
+
+class DomainIndexTests(SimpleTestCase):
+    def setUp(self):
+        self.index = DomainIndex(
+            [{"tenant_alpha": ["https://Alpha.example.com/", "alpha.local:8000"]}, {"tenant_beta": ["beta.example.com"]}],
+            {"client_alpha": ["alpha.example.com"], "client_beta": ["http://beta.example.com/login"]},
+        )
+
+    def test_normalize_domain_strips_scheme_path_and_case(self):
+        self.assertEqual(normalize_domain(" HTTPS://Alpha.Example.com/api/v1 "), "alpha.example.com")
+        self.assertEqual(normalize_domain(None), "")
+
+    def test_tenant_alias_resolves_any_spelling_of_the_domain(self):
+        self.assertEqual(self.index.tenant_alias("alpha.example.com"), "tenant_alpha")
+        self.assertEqual(self.index.tenant_alias("http://ALPHA.example.com/dashboard"), "tenant_alpha")
+        self.assertEqual(self.index.tenant_alias("beta.example.com"), "tenant_beta")
+
+    def test_port_is_only_dropped_when_the_exact_host_is_unknown(self):
+        self.assertEqual(self.index.tenant_alias("alpha.local:8000"), "tenant_alpha")
+        self.assertEqual(self.index.tenant_alias("alpha.example.com:443"), "tenant_alpha")
+        self.assertIsNone(self.index.tenant_alias("alpha.local"))
+
+    def test_unknown_or_empty_domain_resolves_to_nothing(self):
+        self.assertIsNone(self.index.tenant_alias("gamma.example.com"))
+        self.assertIsNone(self.index.tenant_alias(""))
+        self.assertIsNone(self.index.client_name(None))
+
+    def test_client_name_is_the_last_part_of_the_key(self):
+        self.assertEqual(self.index.client_name("alpha.example.com"), "alpha")
+        self.assertEqual(self.index.client_name("beta.example.com"), "beta")
+
+    def test_first_mapping_wins_for_a_shared_domain(self):
+        index = DomainIndex([{"first": ["shared.example.com"]}, {"second": ["shared.example.com"]}], {})
+        self.assertEqual(index.tenant_alias("shared.example.com"), "first")
+
+
+class WalletEngineTests(SimpleTestCase):
+    def setUp(self):
+        self.cursor = mock.MagicMock()
+        self.cursor.fetchone.return_value = (11, Decimal('40.000'))
+        connection = mock.MagicMock()
+        connection.ops.quote_name = lambda name: f'"{name}"'
+        connection.cursor.return_value.__enter__.return_value = self.cursor
+        patcher = mock.patch.object(engine, 'connections', {'tenant_a': connection})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def executed(self):
+        sql, params = self.cursor.execute.call_args.args
+        return ' '.join(sql.split()), params
+
+    def test_credit_has_no_balance_guard(self):
+        posting = engine.credit(5, 'main_wallet', '10', 'Top up', db_alias='tenant_a')
+        sql, params = self.executed()
+        self.assertIn('WHERE "portal_user_id" = %s RETURNING', sql)
+        self.assertNotIn('>= 0', sql)
+        self.assertEqual(params[0], Decimal('10'))
+        self.assertEqual((posting.history_id, posting.balance_after, posting.change_type), (11, Decimal('40.000'), 'CR'))
+
+    def test_debit_guards_the_balance_it_lowers(self):
+        engine.debit(5, 'main_wallet', '10', 'Purchase', db_alias='tenant_a')
+        sql, params = self.executed()
+        self.assertIn('WHERE "portal_user_id" = %s AND COALESCE("primary_balance", 0) + %s >= 0', sql)
+        # delta, last_updated_on, user_id, then the guard's delta.
+        self.assertEqual(params[0], Decimal('-10'))
+        self.assertEqual(params[2:4], [5, Decimal('-10')])
+
+    def test_hold_guards_only_the_wallet_it_takes_from(self):
+        engine.hold(5, '10', 'Hold', db_alias='tenant_a')
+        sql, _ = self.executed()
+        self.assertEqual(sql.count('>= 0'), 1)
+        self.assertIn('COALESCE("primary_balance", 0) + %s >= 0', sql)
+        self.assertIn('"hold_balance" = COALESCE("hold_balance", 0) + %s', sql)
+
+    def test_no_row_back_means_missing_wallet_or_short_balance(self):
+        self.cursor.fetchone.return_value = None
+        with mock.patch.object(engine.PortalUserBalance.objects, 'using') as using:
+            using.return_value.filter.return_value.exists.return_value = True
+            with self.assertRaises(engine.InsufficientBalance):
+                engine.debit(5, 'main_wallet', '10', 'Purchase', db_alias='tenant_a')
+            using.return_value.filter.return_value.exists.return_value = False
+            with self.assertRaises(engine.WalletNotFound):
+                engine.debit(5, 'main_wallet', '10', 'Purchase', db_alias='tenant_a')
+
+    def test_invalid_amounts_and_wallets_are_rejected_before_sql(self):
+        for amount in ('0', '-5', 'abc', 'NaN', None):
+            with self.assertRaises(engine.WalletError):
+                engine.credit(5, 'main_wallet', amount, 'Top up', db_alias='tenant_a')
+        with self.assertRaises(engine.WalletError):
+            engine.credit(5, 'bonus_wallet', '10', 'Top up', db_alias='tenant_a')
+        self.cursor.execute.assert_not_called()
+
+    def test_transfer_locks_the_lower_user_first(self):
+        for from_user, to_user, first in ((3, 8, 'debit'), (8, 3, 'credit')):
+            calls = []
+            with mock.patch.object(engine.transaction, 'atomic'), \
+                    mock.patch.object(engine, 'debit', side_effect=lambda user_id, *a: calls.append(('debit', user_id))), \
+                    mock.patch.object(engine, 'credit', side_effect=lambda user_id, *a: calls.append(('credit', user_id))):
+                engine.transfer(from_user, to_user, '10', 'Transfer', db_alias='tenant_a')
+            self.assertEqual(calls[0][0], first)
+            self.assertEqual(calls[0][1], min(from_user, to_user))
+
+    def test_transfer_to_the_same_wallet_is_refused(self):
+        with self.assertRaises(engine.WalletError):
+            engine.transfer(5, 5, '10', 'Transfer', from_wallet='main_wallet', to_wallet='primary_balance', db_alias='tenant_a')
+
+
+def slab(rule_id, minimum, maximum, amount='5', transaction_type='DEBIT'):
+    return ChargeSlab(rule_id, Decimal(minimum), Decimal(maximum), 'FLAT', Decimal(amount), transaction_type)
+
+
+class SlabIndexTests(SimpleTestCase):
+    def setUp(self):
+        # 1-1000 and 1000-5000 share an endpoint; 5000-6000 is a gap.
+        self.index = SlabIndex([slab(3, '6000', '10000'), slab(1, '1', '1000'), slab(2, '1000', '5000')])
+
+    def lookup(self, amount):
+        found = self.index.lookup(Decimal(amount))
+        return found and found.rule_id
+
+    def test_amount_inside_a_slab(self):
+        self.assertEqual(self.lookup('500'), 1)
+        self.assertEqual(self.lookup('2500'), 2)
+        self.assertEqual(self.lookup('8000'), 3)
+
+    def test_shared_endpoint_belongs_to_the_lower_slab(self):
+        self.assertEqual(self.lookup('1000'), 1)
+        self.assertEqual(self.lookup('1000.01'), 2)
+
+    def test_slab_bounds_are_inclusive(self):
+        self.assertEqual(self.lookup('1'), 1)
+        self.assertEqual(self.lookup('5000'), 2)
+        self.assertEqual(self.lookup('6000'), 3)
+        self.assertEqual(self.lookup('10000'), 3)
+
+    def test_gaps_and_out_of_range_amounts_match_nothing(self):
+        self.assertEqual(self.index.gaps, [(Decimal('5000'), Decimal('6000'))])
+        self.assertIsNone(self.lookup('5500'))
+        self.assertIsNone(self.lookup('0.5'))
+        self.assertIsNone(self.lookup('10000.01'))
+
+    def test_overlapping_or_inverted_slabs_are_rejected(self):
+        with self.assertRaises(ChargeSlabError):
+            SlabIndex([slab(1, '1', '1000'), slab(2, '999', '5000')])
+        with self.assertRaises(ChargeSlabError):
+            SlabIndex([slab(1, '1000', '1')])
+
+    def test_zero_zero_rule_covers_every_amount(self):
+        index = SlabIndex([slab(4, '0', '0')])
+        self.assertEqual(index.lookup(Decimal('0.01')).rule_id, 4)
+        self.assertEqual(index.lookup(Decimal('250000')).rule_id, 4)
+
+    def test_zero_zero_rule_cannot_share_its_key(self):
+        with self.assertRaisesRegex(ChargeSlabError, "no amount range"):
+            SlabIndex([slab(4, '0', '0'), slab(1, '1', '1000')])
+
+    def test_provider_raises_for_a_gap_or_a_broken_configuration(self):
+        provider = ProviderCharges(7, Decimal('18'), {('PLATFORM', None, 'DEBIT'): self.index})
+        self.assertEqual(provider.slab_for(Decimal('1000')).rule_id, 1)
+        self.assertIsNone(provider.slab_for(Decimal('1000'), beneficiary='DISTRIBUTOR'))
+        with self.assertRaises(ChargeSlabError):
+            provider.slab_for(Decimal('5500'))
+        with self.assertRaises(ChargeSlabError):
+            ProviderCharges(7, Decimal('18'), error="overlap").slab_for(Decimal('100'))
+
+
+class ProviderChargesTests(SimpleTestCase):
+    def setUp(self):
+        # Every rule below covers 1-1000, as Adcharges allows per operator and transaction type.
+        self.provider = ProviderCharges(7, Decimal('18'), {
+            ('PLATFORM', None, 'DEBIT'): SlabIndex([slab(1, '1', '1000')]),
+            ('PLATFORM', 21, 'DEBIT'): SlabIndex([slab(2, '1', '1000')]),
+            ('PLATFORM', 21, 'CREDIT'): SlabIndex([slab(3, '1', '1000', transaction_type='CREDIT')]),
+            ('PROVIDER', None, 'DEBIT'): SlabIndex([slab(4, '1', '1000')]),
+        })
+
+    def rule_for(self, **keys):
+        return self.provider.slab_for(Decimal('500'), **keys).rule_id
+
+    def test_same_range_rules_for_different_operators(self):
+        self.assertEqual(self.rule_for(identifier_value=21, transaction_type='DEBIT'), 2)
+        self.assertEqual(self.rule_for(transaction_type='DEBIT'), 1)
+
+    def test_operator_without_its_own_rules_falls_back_to_generic_ones(self):
+        self.assertEqual(self.rule_for(identifier_value=99), 1)
+
+    def test_same_range_rules_for_different_transaction_types(self):
+        self.assertEqual(self.rule_for(identifier_value=21, transaction_type='CREDIT'), 3)
+        self.assertEqual(self.rule_for(identifier_value=21, transaction_type='DEBIT'), 2)
+
+    def test_type_is_required_when_both_types_cover_the_amount(self):
+        with self.assertRaisesRegex(ChargeSlabError, "transaction type"):
+            self.provider.slab_for(Decimal('500'), identifier_value=21)
+
+    def test_beneficiary_selects_its_own_rules(self):
+        self.assertEqual(self.rule_for(beneficiary='PROVIDER'), 4)
@@ -1,6 +1,30 @@
-import threading
-_thread_locals = threading.local()
+from contextvars import ContextVar
+
+# Context variables rather than threading.local so the binding follows the
+# request across sync_to_async/async_to_sync hops under ASGI as well as WSGI.
+_current_request = ContextVar("current_request", default=None)
+_current_tenant = ContextVar("current_tenant", default=None)
 
 
 def get_current_request():
-    return getattr(_thread_locals, 'request', None)
+    return _current_request.get()
+
+
+def set_current_request(request):
+    return _current_request.set(request)
+
+
+def reset_current_request(token):
+    _current_request.reset(token)
+
+
+def get_current_tenant():
+    return _current_tenant.get()
+
+
+def set_current_tenant(db_alias):
+    return _current_tenant.set(db_alias)
+
+
+def reset_current_tenant(token):
+    _current_tenant.reset(token)
@@ -1,4 +1,16 @@
+import hashlib
+import json
+from collections import defaultdict
+from decimal import Decimal, InvalidOperation
+from django.core.exceptions import ValidationError
+from django.db.models import Exists, OuterRef
 from ...views import *
+from utils.database.tenant_merge import (
+    InvalidCursor, encode_cursor, decode_cursor, cursor_value, keyset_after, merge_tenant_rows,
+)
+
+
+REPORT_SORT_FIELDS = ("recorded_at", "amount")
 
 
 class SuperAdminTransactionReportView(APIView):
@@ -20,178 +32,267 @@ class SuperAdminTransactionReportView(APIView):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
-    def retrieve_all_database_names(self):
-        try:
-            with connection.cursor() as cur:
-                cur.execute("SELECT datname FROM pg_database WHERE datistemplate = false;")
-                return [row[0] for row in cur.fetchall()]
-        except Exception as exc:
-            print(f"Error listing databases: {exc}")
-            return []
-
-    def resolve_service_and_provider_details(self, provider_id, database_alias):
-        try:
-            if not provider_id:
-                return None, None
-
-            ad_provider = AdServiceProvider.objects.using(database_alias).filter(sp_id=provider_id).first()
-            if not ad_provider or not ad_provider.sys_id:
-                return None, None
+    def parse_report_filters(self, request_data):
+        def parse_amount(raw_value):
+            if raw_value in (None, '', []):
+                return None
+            try:
+                return Decimal(str(raw_value))
+            except (InvalidOperation, TypeError):
+                return None
+
+        sort_field = str(request_data.get('sort_field') or 'recorded_at').lower()
+        return {
+            "sp_id": int(request_data.get('sp_id', 0) or 0),
+            "min_amount": parse_amount(request_data.get('min_amount')),
+            "max_amount": parse_amount(request_data.get('max_amount')),
+            # apply_date_range_filter reads filter_type; this API has always called it date_filter.
+            "date": {
+                "filter_type": request_data.get('date_filter', ''),
+                "start_date": request_data.get('start_date', ''),
+                "end_date": request_data.get('end_date', ''),
+            },
+            "search": str(request_data.get('search', '') or '').strip(),
+            "sort_field": sort_field if sort_field in REPORT_SORT_FIELDS else 'recorded_at',
+            "descending": str(request_data.get('sort_by', 'desc')).lower() != 'asc',
+        }
+
+    def search_condition(self, db_alias, search_term):
+        condition = Q(member__full_name__icontains=search_term)
+        provider_ids = provider_catalogue.tenant_provider_ids_matching(db_alias, search_term)
+        for table in SERVICE_TABLES.values():
+            table_match = Q(**{f"{table.ref_field}__icontains": search_term})
+            if provider_ids:
+                table_match |= Q(**{f"{table.provider_attname}__in": provider_ids})
+            condition |= Q(
+                source_table=table.db_table,
+                linked_service_id__in=table.model.objects.filter(table_match).values('pk'),
+            )
+        return condition
+
+    def resolvable_condition(self, db_alias):
+        # The SQL twin of the checks in resolve_ledger_rows, so counts and pages only see rows it can serve.
+        provider_ids = provider_catalogue.tenant_resolvable_provider_ids(db_alias)
+        condition = Q(pk__in=[])
+        for table in SERVICE_TABLES.values():
+            condition |= Q(
+                source_table=table.db_table,
+                linked_service_id__in=table.model.objects.filter(
+                    **{f"{table.provider_attname}__in": provider_ids}
+                ).values('pk'),
+            )
+        return condition & Q(Exists(PortalUser.objects.filter(pk=OuterRef('member_id'))))
+
+    def build_ledger_queryset(self, db_alias, filters):
+        ledger_qs = GlTrn.objects.filter(
+            member_id=1, wallet_type="main_wallet",
+            linked_service_id__isnull=False, source_table__in=list(SERVICE_TABLES),
+        )
+        if filters["sp_id"] > 0:
+            target_table = get_service_table_for_provider(filters["sp_id"])
+            if not target_table:
+                return GlTrn.objects.none()
+            ledger_qs = ledger_qs.filter(source_table=target_table.db_table)
+        if filters["min_amount"] is not None:
+            ledger_qs = ledger_qs.filter(amount__gte=filters["min_amount"])
+        if filters["max_amount"] is not None:
+            ledger_qs = ledger_qs.filter(amount__lte=filters["max_amount"])
+        ledger_qs = apply_date_range_filter(filters["date"], ledger_qs, date_field='recorded_at')
+        if filters["search"]:
+            ledger_qs = ledger_qs.filter(self.search_condition(db_alias, filters["search"]))
+        ledger_qs = ledger_qs.filter(self.resolvable_condition(db_alias))
+
+        prefix = '-' if filters["descending"] else ''
+        return ledger_qs.order_by(f"{prefix}{filters['sort_field']}", f"{prefix}entry_id")
+
+    def resolve_ledger_rows(self, db_alias, ledger_rows):
+        linked_ids_by_table = defaultdict(set)
+        for global_trn in ledger_rows:
+            linked_ids_by_table[global_trn.source_table].add(global_trn.linked_service_id)
+
+        # One query per service table instead of one per ledger row.
+        service_records = {}
+        for source_table, linked_ids in linked_ids_by_table.items():
+            table = get_service_table(source_table)
+            service_records[source_table] = (
+                table.model.objects.only(table.ref_field, table.provider_attname).in_bulk(linked_ids)
+            )
 
-            main_provider = ServiceProvider.objects.filter(sys_id=ad_provider.sys_id).select_related('service').first()
-            if not main_provider:
-                return None, None
+        portal_user_cache = PortalUser.objects.only('full_name').in_bulk({gt.member_id for gt in ledger_rows})
+
+        tenant_entries = {}
+        for global_trn in ledger_rows:
+            table = get_service_table(global_trn.source_table)
+            txn_record = service_records[global_trn.source_table].get(global_trn.linked_service_id)
+            if not txn_record:
+                continue
+
+            provider = provider_catalogue.tenant_provider(db_alias, getattr(txn_record, table.provider_attname))
+            if not provider:
+                continue
+
+            portal_user_obj = portal_user_cache.get(global_trn.member_id)
+            if not portal_user_obj:
+                continue
+
+            tenant_entries[global_trn.entry_id] = {
+                "global_trn_id": global_trn.entry_id,
+                "amount": global_trn.amount,
+                "effective_amount": global_trn.final_amount,
+                "tds_amount": float(global_trn.tds_amount or 0),
+                "tax_amount": float(global_trn.gst_amount or 0),
+                "txn_datetime": global_trn.recorded_at.strftime("%d %B %Y %H:%M"),
+                "reference_id": getattr(txn_record, table.ref_field, ""),
+                "service": provider.service_name,
+                "provider": provider.provider_name,
+                "user_name": portal_user_obj.full_name,
+            }
 
-            service_title = main_provider.service.service_name if main_provider.service else "Unknown"
-            provider_title = main_provider.sp_name or "Unknown Provider"
+        return tenant_entries
 
-            return service_title, provider_title
-        except Exception as exc:
-            print(f"Error resolving provider details: {exc}")
-            return None, None
+    def fetch_tenant_ledger(self, db_alias, filters, last_key, row_limit, with_total):
+        ledger_qs = self.build_ledger_queryset(db_alias, filters)
+        page_qs = ledger_qs
+        if last_key:
+            page_qs = page_qs.filter(
+                keyset_after(db_alias, filters["sort_field"], "entry_id", last_key, filters["descending"])
+            )
+        return {
+            "total": ledger_qs.count() if with_total else None,
+            "rows": list(page_qs.only('entry_id', 'linked_service_id', 'source_table', 'member_id', filters["sort_field"],
+                                      'amount', 'final_amount', 'tds_amount', 'gst_amount', 'recorded_at')[:row_limit]),
+        }
+
+    def filters_fingerprint(self, filters, admin_identifier):
+        raw = json.dumps([filters, admin_identifier], sort_keys=True, default=str)
+        return hashlib.sha1(raw.encode()).hexdigest()[:12]
+
+    def report_cursor(self, filters, fingerprint, last_alias, last_row, served, total):
+        sort_value = getattr(last_row, filters["sort_field"])
+        return encode_cursor({
+            "q": fingerprint,
+            "v": sort_value.isoformat() if filters["sort_field"] == "recorded_at" else str(sort_value),
+            "t": last_alias,
+            "i": last_row.entry_id,
+            "n": served,
+            "total": total,
+        })
 
     def generate_paginated_report(self, request):
         try:
-            page_num = int(request.data.get('page_number', 1))
-            page_sz = int(request.data.get('page_size', 10))
-            admin_identifier = request.data.get('admin_id', '').strip()
-            order_direction = request.data.get('sort_by', 'desc').lower()
-            min_amt = request.data.get('min_amount')
-            max_amt = request.data.get('max_amount')
-            date_range_type = request.data.get('date_filter', '')
-            from_date = request.data.get('start_date', '')
-            to_date = request.data.get('end_date', '')
-            search_term = request.data.get('search', '').strip().lower()
-            target_sp_id = int(request.data.get('sp_id', 0))  
-
-            report_entries = []
+            page_num = max(1, int(request.data.get('page_number', 1) or 1))
+            page_sz = max(1, min(100, int(request.data.get('page_size', 10) or 10)))
+            admin_identifier = str(request.data.get('admin_id', '') or '').strip()
+            cursor_token = str(request.data.get('cursor', '') or '').strip()
+            filters = self.parse_report_filters(request.data)
+            fingerprint = self.filters_fingerprint(filters, admin_identifier)
+
+            try:
+                apply_date_range_filter(filters["date"], GlTrn.objects.none(), date_field='recorded_at')
+            except ValidationError as exc:
+                return Response(
+                    {"status": "fail", "message": exc.messages[0]},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+            # With a cursor the next page starts right after the cursor's row, so
+            # tenants never re-read earlier pages. Without one, page_number is
+            # served by merging the first offset + page_size rows of each tenant.
+            last_key, served, total_count = None, 0, None
+            if cursor_token:
+                try:
+                    cursor = decode_cursor(cursor_token)
+                    if cursor.get("q") != fingerprint:
+                        raise InvalidCursor("Cursor does not match the current filters.")
+                    value_type = "datetime" if filters["sort_field"] == "recorded_at" else "decimal"
+                    last_key = (cursor_value(cursor["v"], value_type), str(cursor["t"]), int(cursor["i"]))
+                    served, total_count = int(cursor.get("n", 0)), cursor.get("total")
+                except (InvalidCursor, KeyError, TypeError, ValueError) as exc:
+                    return Response(
+                        {"status": "fail", "message": str(exc) if isinstance(exc, InvalidCursor) else "Invalid or expired cursor."},
+                        status=status.HTTP_400_BAD_REQUEST
+                    )
+                offset = 0
+            else:
+                offset = (page_num - 1) * page_sz
+                served = offset
 
             if admin_identifier:
                 try:
-                    target_admin = Admin.objects.get(admin_id=admin_identifier)
-                    database_list = [target_admin.db_name]
+                    database_list = [get_admin_db_name(admin_identifier)]
                 except ObjectDoesNotExist:
                     return Response(
                         {"status": "fail", "message": "Specified admin not found."},
                         status=status.HTTP_404_NOT_FOUND
                     )
             else:
-                all_dbs = self.retrieve_all_database_names()
-                database_list = all_dbs[2:] if len(all_dbs) > 2 else []
-
-            transaction_mappings = {
-                "2": {"model": FundTransferEntry, "table": "ad_dmt_transaction", "sp_field": "dmt_sp_id", "amt_field": "dmt_txn_amount", "status_field": "dmt_txn_status", "cust_name": "dmt_customer_name", "cust_mobile": "dmt_customer_contact_number", "ref_id": "dmt_refrence_id"},
-                "4": {"model": FundTransferEntry, "table": "ad_dmt_transaction", "sp_field": "dmt_sp_id", "amt_field": "dmt_txn_amount", "status_field": "dmt_txn_status", "cust_name": "dmt_customer_name", "cust_mobile": "dmt_customer_contact_number", "ref_id": "dmt_refrence_id"},
-                "6": {"model": FundTransferEntry, "table": "ad_dmt_transaction", "sp_field": "dmt_sp_id", "amt_field": "dmt_txn_amount", "status_field": "dmt_txn_status", "cust_name": "dmt_customer_name", "cust_mobile": "dmt_customer_contact_number", "ref_id": "dmt_refrence_id"},
-                "8": {"model": ElectricityBillEntry, "table": "ad_ux_electricity_transaction", "sp_field": "sp", "amt_field": "amount", "status_field": "ux_status", "cust_name": "consumer_name", "cust_mobile": "mobile_number", "ref_id": "ux_unique_trn_id"},
-                "9": {"model": GasBillEntry, "table": "ad_ux_gas_transaction", "sp_field": "sp", "amt_field": "amount", "status_field": "ux_status", "cust_name": "consumer_name", "cust_mobile": "mobile_number", "ref_id": "ux_unique_trn_id"},
-                "10": {"model": LicPremiumEntry, "table": "ad_ux_LIC_transaction", "sp_field": "sp", "amt_field": "amount", "status_field": "ux_lic_status", "cust_name": "", "cust_mobile": "mobile_number", "ref_id": "ux_lic_unique_trn_id"},
-                "11": {"model": RechargeTransaction, "table": "ad_mobile_recharge", "sp_field": "mr_sp", "amt_field": "mr_amount", "status_field": "mr_status", "cust_name": "", "cust_mobile": "mr_mobile_no", "ref_id": "mr_request_txnid"},
-                "12": {"model": BillPaymentRecord, "table": "ad_bbps_service_trnasaction", "sp_field": "bbps_sp", "amt_field": "bbps_amount", "status_field": "bbps_status", "cust_name": "", "cust_mobile": "bbps_contact_no", "ref_id": "bbps_request_id"},
-                "41": {"model": CashfreePaymentLog, "table": "ad_cashfree_pg_service_transaction", "sp_field": "sp", "amt_field": "cf_pg_trn_amount", "status_field": "cf_pg_trn_status", "cust_name": "", "cust_mobile": "cf_pg_customer_contact_no", "ref_id": "cf_pg_trn_unique_id"},
-                "42": {"model": PhonePePaymentEntry, "table": "ad_phonepe_service_transaction", "sp_field": "sp", "amt_field": "pp_amount", "status_field": "pp_status", "cust_name": "", "cust_mobile": "pp_contact_no", "ref_id": "pp_marchant_trn_id"},
-                "43": {"model": PaymentGatewayRecord, "table": "ad_pg_service_trnasaction", "sp_field": "sp", "amt_field": "pg_trn_amount", "status_field": "pg_trn_status", "cust_name": "pg_customer_name", "cust_mobile": "pg_customer_contact_no", "ref_id": "pg_customer_id"},
-                "44": {"model": MoneyTransferLog, "table": "ad_payout_service_trnasaction", "sp_field": "sp", "amt_field": "trn_amount", "status_field": "trn_status", "cust_name": "customer_name", "cust_mobile": "customer_contact_no", "ref_id": "trn_unique_id"},
-                "47": {"model": AepsCashLog, "table": "ad_aeps_transaction", "sp_field": "at_sp", "amt_field": "at_amount", "status_field": "at_status", "cust_name": "", "cust_mobile": "at_mobile_number", "ref_id": "at_unique_id"},
-                "48": {"model": AepsCashLog, "table": "ad_aeps_transaction", "sp_field": "at_sp", "amt_field": "at_amount", "status_field": "at_status", "cust_name": "", "cust_mobile": "at_mobile_number", "ref_id": "at_unique_id"},
-                "49": {"model": AepsCashLog, "table": "ad_aeps_transaction", "sp_field": "at_sp", "amt_field": "at_amount", "status_field": "at_status", "cust_name": "", "cust_mobile": "at_mobile_number", "ref_id": "at_unique_id"},
-                "50": {"model": AepsCashLog, "table": "ad_aeps_transaction", "sp_field": "at_sp", "amt_field": "at_amount", "status_field": "at_status", "cust_name": "", "cust_mobile": "at_mobile_number", "ref_id": "at_unique_id"},
-                "51": {"model": BulkPayoutRecord, "table": "ad_bulk_pe_customer_transaction", "sp_field": "sp", "amt_field": "amount", "status_field": "payout_status", "cust_name": "customer", "cust_mobile": "customer", "ref_id": "transaction_id"},
-                "52": {"model": AirtelBillEntry, "table": "ad_airtel_cms_transaction", "sp_field": "trn_sp", "amt_field": "trn_amount", "status_field": "trn_status", "cust_name": "", "cust_mobile": "trn_mobile_no", "ref_id": "trn_transaction_id"},
-                "53": {"model": BankItAepsRecord, "table": "ad_bankit_aeps_transaction", "sp_field": "ba_sp", "amt_field": "ba_amount", "status_field": "ba_status", "cust_name": "", "cust_mobile": "ba_mobile", "ref_id": "ba_trn_id"},
-                "59": {"model": MicroAtmEntry, "table": "ad_micro_atm_transaction", "sp_field": "mat_sp", "amt_field": "mat_amount", "status_field": "mat__status", "cust_name": "", "cust_mobile": "mat_mobile", "ref_id": "mat_trn_id"},
-                "62": {"model": FundTransferEntry, "table": "ad_dmt_transaction", "sp_field": "dmt_sp_id", "amt_field": "dmt_txn_amount", "status_field": "dmt_txn_status", "cust_name": "dmt_customer_name", "cust_mobile": "dmt_customer_contact_number", "ref_id": "dmt_refrence_id"},
-                "64": {"model": PpiTransferLog, "table": "ad_dmt_ppi_transaction", "sp_field": "dpt_sp", "amt_field": "dpt_amount", "status_field": "dpt_status", "cust_name": "", "cust_mobile": "dpt_contact_no", "ref_id": "dpt_txn_id"},
-                "67": {"model": KhataTransferEntry, "table": "ad_digi_khata_transaction", "sp_field": "dkt_sp", "amt_field": "dkt_txn_amount", "status_field": "dkt_txn_status", "cust_name": "dkt_customer_name", "cust_mobile": "dkt_customer_contact_number", "ref_id": "dkt_refrence_id"},
-            }
+                database_list = tenant_directory.aliases()
+
+            fetch_outcome = fan_out(
+                database_list,
+                lambda db_alias: self.fetch_tenant_ledger(
+                    db_alias, filters, last_key, offset + page_sz + 1, with_total=total_count is None
+                ),
+                timeout=getattr(settings, 'TENANT_FANOUT_TIMEOUT', 30),
+            )
+            if fetch_outcome.errors:
+                # Paging on without these tenants would skip their rows for good once the cursor moves past them.
+                return Response(
+                    {"status": "fail", "message": "Some admin databases could not be read; retry the page.",
+                     "data": {"tenant_errors": fetch_outcome.errors}},
+                    status=status.HTTP_503_SERVICE_UNAVAILABLE
+                )
+            if total_count is None:
+                total_count = sum(result["total"] for result in fetch_outcome.results.values())
+
+            sort_field = filters["sort_field"]
+            merged, has_more = merge_tenant_rows(
+                {db_alias: result["rows"] for db_alias, result in fetch_outcome.results.items()},
+                sort_key=lambda db_alias, row: (getattr(row, sort_field), db_alias, row.entry_id),
+                limit=offset + page_sz,
+                descending=filters["descending"],
+            )
+            page_rows = merged[offset:]
+
+            # Only the rows that made the page are resolved against the service tables.
+            rows_by_alias = defaultdict(list)
+            for db_alias, global_trn in page_rows:
+                rows_by_alias[db_alias].append(global_trn)
+            resolve_outcome = fan_out(
+                list(rows_by_alias),
+                lambda db_alias: self.resolve_ledger_rows(db_alias, rows_by_alias[db_alias]),
+                timeout=getattr(settings, 'TENANT_FANOUT_TIMEOUT', 30),
+            )
 
-            for db_alias in database_list:
-                db_alias = switch_to_database(db_alias)
-                print(f"Processing database: {db_alias}")
+            if resolve_outcome.errors:
+                return Response(
+                    {"status": "fail", "message": "Some admin databases could not be read; retry the page.",
+                     "data": {"tenant_errors": resolve_outcome.errors}},
+                    status=status.HTTP_503_SERVICE_UNAVAILABLE
+                )
 
-                try:
-                    global_transactions = GlTrn.objects.using(db_alias).filter(
-                        member_id=1,wallet_type="main_wallet"
-                    )
+            page_data = []
+            for db_alias, global_trn in page_rows:
+                entry = resolve_outcome.results.get(db_alias, {}).get(global_trn.entry_id)
+                if entry:
+                    page_data.append(entry)
 
-                    user_ids = [gt.member_id for gt in global_transactions]
-                    portal_user_cache = PortalUser.objects.using(db_alias).in_bulk(user_ids)
-
-                    for global_trn in global_transactions:
-                        try:
-                            service_table = str(global_trn.service_trn_table)
-
-                            config = None
-                            if target_sp_id > 0:
-                                config = transaction_mappings.get(str(target_sp_id))
-                                if config and config["model"]._meta.db_table != service_table:
-                                    config = None
-                            else:
-                                for cfg in transaction_mappings.values():
-                                    if cfg["model"]._meta.db_table == service_table:
-                                        config = cfg
-                                        break
-
-                            if not config:
-                                continue
-
-                            TransactionModel = config["model"]
-                            sp_field_name = config["sp_field"]
-                            ref_id_field = config["ref_id"]
-
-                            txn_record = TransactionModel.objects.using(db_alias).get(pk=global_trn.service_trn_id)
-
-                            reference_id = getattr(txn_record, ref_id_field, "")
-
-                            sp_id_value = getattr(txn_record, f"{sp_field_name}_id", None) or getattr(txn_record, sp_field_name, None)
-
-                            service_title, provider_title = self.resolve_service_and_provider_details(sp_id_value, db_alias)
-                            if not service_title or not provider_title:
-                                continue
-
-                            portal_user_obj = portal_user_cache.get(global_trn.pu_id)
-                            if not portal_user_obj:
-                                continue
-
-                            entry = {
-                                "global_trn_id": global_trn.gl_trn_id,
-                                "amount": global_trn.gl_trn_amt,
-                                "effective_amount": global_trn.effectvie_amt,
-                                "tds_amount": float(global_trn.gl_tds_amt or 0),
-                                "tax_amount": float(global_trn.gl_tax_amt or 0),
-                                "txn_datetime": global_trn.created_at.strftime("%d %B %Y %H:%M"),
-                                "reference_id": reference_id,
-                                "service": service_title,
-                                "provider": provider_title,
-                                "user_name": portal_user_obj.pu_name,
-                            }
-
-                            report_entries.append(entry)
-
-                        except TransactionModel.DoesNotExist:
-                            continue
-                        except Exception as inner_exc:
-                            print(f"Error processing global trn {global_trn.gl_trn_id}: {inner_exc}")
-                            continue
-
-                finally:
-                    connections[db_alias].close()
-
-            total_count = len(report_entries)
-            paginator = Paginator(report_entries, page_sz)
-            try:
-                current_page = paginator.get_page(page_num)
-            except Exception:
-                current_page = paginator.get_page(1)
+            serial_no = served + len(page_data) if filters["descending"] else served + 1
+            for entry in page_data:
+                entry["sr_no"] = serial_no
+                serial_no += -1 if filters["descending"] else 1
 
-            page_data = list(current_page.object_list)
-            add_serial_numbers(page_data, page_num, page_sz, order_direction)
+            next_cursor = None
+            if has_more and page_rows:
+                last_alias, last_row = page_rows[-1]
+                next_cursor = self.report_cursor(filters, fingerprint, last_alias, last_row, served + len(page_rows), total_count)
 
             response_payload = {
                 "total_items": total_count,
-                "total_pages": paginator.num_pages,
-                "current_page": page_num,
-                "results": page_data
+                "total_pages": (total_count + page_sz - 1) // page_sz,
+                "current_page": served // page_sz + 1,
+                "results": page_data,
+                "next_cursor": next_cursor,
             }
 
             return Response(
@@ -203,4 +304,4 @@ class SuperAdminTransactionReportView(APIView):
             return Response(
                 {"status": "error", "message": f"Unexpected error: {str(exc)}"},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
\ No newline at end of file
+            )
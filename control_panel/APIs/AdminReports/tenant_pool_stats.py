@@ -0,0 +1,18 @@
+from ...views import *
+
+
+class TenantPoolStatsView(APIView):
+    authentication_classes = [SecureJWTAuthentication]
+    permission_classes = [IsSuperAdmin]
+
+    def get(self, request):
+        try:
+            return Response(
+                {"status": "success", "message": "Tenant connection pool stats fetched.", "data": tenant_pool.stats()},
+                status=status.HTTP_200_OK
+            )
+        except Exception as exc:
+            return Response(
+                {"status": "error", "message": f"Server error occurred: {str(exc)}"},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
@@ -0,0 +1,54 @@
+from ...views import *
+from django.utils.dateparse import parse_date, parse_datetime
+from django.utils.timezone import is_naive, make_aware
+
+
+class WalletBalanceAsOfView(APIView):
+    """Tenant wallet balances at a past instant, read from the nearest checkpoint plus its history tail."""
+    authentication_classes = [SecureJWTAuthentication]
+    permission_classes = [IsSuperAdmin]
+
+    def post(self, request):
+        admin_id = request.data.get('admin_id')
+        user_id = request.data.get('user_id', 1)
+        wallet = request.data.get('wallet')
+        raw_as_of = str(request.data.get('as_of') or '')
+
+        as_of = self.parse_as_of(raw_as_of)
+        if not admin_id or as_of is None:
+            return Response({"status": "fail", "message": "admin_id and a valid as_of date or datetime are required."}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            with tenant(admin_id) as db_alias:
+                if wallet:
+                    if not wallet_engine.balance_field(wallet):
+                        return Response({"status": "fail", "message": f"Unknown wallet: {wallet}"}, status=status.HTTP_400_BAD_REQUEST)
+                    balances = {wallet_engine.balance_field(wallet): balance_as_of(int(user_id), wallet, as_of, db_alias=db_alias)}
+                else:
+                    balances = balances_as_of(int(user_id), as_of, db_alias=db_alias)
+
+            return Response({
+                "status": "success",
+                "message": "Balances fetched.",
+                "data": {
+                    "user_id": int(user_id),
+                    "as_of": as_of.isoformat(),
+                    "balances": {field: str(balance) for field, balance in balances.items()},
+                }
+            }, status=status.HTTP_200_OK)
+
+        except Admin.DoesNotExist:
+            return Response({"status": "fail", "message": "Admin not found."}, status=status.HTTP_404_NOT_FOUND)
+        except Exception as exc:
+            return Response({"status": "error", "message": f"Server error occurred: {str(exc)}"}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    def parse_as_of(self, raw_as_of):
+        """A bare date means the close of that day."""
+        try:
+            day = parse_date(raw_as_of)
+            as_of = datetime.combine(day + timedelta(days=1), datetime.min.time()) if day else parse_datetime(raw_as_of)
+        except ValueError:
+            return None
+        if as_of is None:
+            return None
+        return make_aware(as_of) if is_naive(as_of) else as_of
@@ -21,9 +21,8 @@ class AdminSessionByPassView(APIView):
                 is_active=True
             )
 
-            switch_to_database(client.db_name)
-
-            portal_user = PortalUser.objects.using(client.db_name).get(id=1)
+            with tenant_alias(client.db_name):
+                portal_user = PortalUser.objects.get(id=1)
 
             temp_token = create_jwt_token(
                 portal_user,
@@ -85,9 +84,8 @@ class VerifySessionBypass(APIView):
             if not db_name:
                 raise ValueError("Database identifier missing from token")
 
-            switch_to_database(db_name)
-
-            user = PortalUser.objects.using(db_name).get(id=user_id)
+            with tenant_alias(db_name):
+                user = PortalUser.objects.get(id=user_id)
 
             refresh = RefreshToken.for_user(user)
             refresh.set_exp(lifetime=timedelta(days=1))
@@ -5,37 +5,6 @@ class DashboardSummaryView(APIView):
     authentication_classes = [SecureJWTAuthentication]
     permission_classes = [IsSuperAdmin]
 
-    SERVICE_TRANSACTION_MAP = {
-        '44':  (MoneyTransferLog, 'provider'),
-        '77':  (MoneyTransferLog, 'provider'),
-        '73':  (PaymentGatewayRecord, 'partner'),
-        '76':  (PaymentGatewayRecord, 'partner'),
-        '11':  (RechargeHistory, 'service_partner'),
-        '2':   (FundTransferEntry, 'partner'),
-        '4':   (FundTransferEntry, 'partner'),
-        '6':   (FundTransferEntry, 'partner'),
-        '12':  (BillPaymentRecord, 'service_partner'),
-        '45':  (BillPaymentRecord, 'service_partner'),
-        '41':  (CashfreePaymentLog, 'partner'),
-        '74':  (CashfreePaymentLog, 'partner'),
-        '42':  (PhonePePaymentEntry, 'partner'),
-        '75':  (PhonePePaymentEntry, 'partner'),
-        '1':   (AadhaarVerifyLog, 'partner'),
-        '8':   (ElectricityBillEntry, 'partner'),
-        '9':   (GasBillEntry, 'partner'),
-        '10':  (LicPremiumEntry, 'partner'),
-        '80':  (AepsCashLog, 'partner'),
-        '84':  (BulkPayoutRecord, 'admin'),
-        '85':  (AirtelBillEntry, 'admin'),
-        '86':  (BankItAepsRecord, 'partner'),
-        '92':  (MicroAtmEntry, 'admin'),
-        '95':  (FundTransferEntry, 'partner'),
-        '97':  (BankItAepsRecord, 'partner'),
-        '103': (MicroAtmEntry, 'admin'),
-        '106': (PpiTransferLog, 'partner'),
-        '109': (KhataTransferEntry, 'admin'),
-    }
-
     def post(self, request):
         admin_id = request.data.get('admin_id')
 
@@ -58,20 +27,18 @@ class DashboardSummaryView(APIView):
 
             services_data = []
 
-            for provider in providers:
-                sp_key = str(provider.sp_id)
+            # One grouped query over all_service_transactions instead of a count per provider.
+            txn_counts = dict(
+                ServiceTransaction.objects.filter(provider__in=providers)
+                .values_list('provider_id')
+                .annotate(total=Count('row_key'))
+            )
 
-                if sp_key not in self.SERVICE_TRANSACTION_MAP:
+            for provider in providers:
+                if not get_service_table_for_provider(provider.system_ref_id):
                     continue
 
-                app_label, model_name = self.SERVICE_TRANSACTION_MAP[sp_key][0].split('.')
-                related_field = self.SERVICE_TRANSACTION_MAP[sp_key][1]
-
-                try:
-                    model = apps.get_model(app_label=app_label, model_name=model_name)
-                    txn_count = model.objects.filter(**{related_field: provider}).count()
-                except:
-                    txn_count = 0
+                txn_count = txn_counts.get(provider.provider_id, 0)
 
                 services_data.append({
                     "service_label": provider.display_name or provider.provider_name,
@@ -162,11 +162,9 @@ class AdminManagementAPIView(APIView):
                 except Exception as e:
                     print("Failed to create activity log:", str(e))  
                     
-            if not setup_admin_database(db_identifier):
-                raise Exception("Database creation failed")
-
-            if not run_migrations_for_admin(db_identifier):
-                raise Exception("Migration failed")
+            db_ready, db_message = acquire_tenant_database(db_identifier)
+            if not db_ready:
+                raise Exception(db_message)
 
             portal_user = PortalUser.objects.using(db_identifier).create(
                 full_name=admin_name,
@@ -177,8 +175,6 @@ class AdminManagementAPIView(APIView):
                 registered_by=None,
             )
 
-            master_data(db_identifier)  
-            
             PortalUserInfo.objects.using(db_identifier).create(
                 user_account=portal_user,
                 aadhaar_number=new_admin.aadhaar or None,
@@ -233,16 +229,12 @@ class AdminManagementAPIView(APIView):
             page_size = int(payload.get('page_size', 10))
 
             queryset = Admin.objects.filter(
-                is_deleted=False
+                is_soft_deleted=False
             ).order_by('-pk')
 
             search = payload.get('search')
             if search:
-                queryset = queryset.filter(
-                    Q(name__icontains=search) |
-                    Q(email__icontains=search) |
-                    Q(company_name__icontains=search)
-                )
+                queryset = queryset.filter(search_q(search, 'name', 'email', 'company_title'))
 
             paginator = Paginator(queryset, page_size)
             page = paginator.get_page(page_num)
@@ -270,17 +270,15 @@ class ManageFundRequestsView(APIView):
             db_name = get_database_from_domain() or "default"
             switch_to_database(db_name)
 
-            user_wallet = PortalUserBalance.objects.using(db_name).get(user=deposit_req.submitted_by)
             amt = deposit_req.deposit_amount
 
             if operation == "APPROVED":
-                user_wallet.primary_balance += Decimal(str(amt))
-                user_wallet.save(using=db_name)
                 self.log_wallet_transaction(db_name, deposit_req, amt, "CR", "Deposit Approved")
             elif operation == "REVERSED":
-                user_wallet.primary_balance -= Decimal(str(amt))
-                user_wallet.save(using=db_name)
-                self.log_wallet_transaction(db_name, deposit_req, amt, "DR", "Deposit Reversed")
+                try:
+                    self.log_wallet_transaction(db_name, deposit_req, amt, "DR", "Deposit Reversed")
+                except InsufficientBalance:
+                    return Response({"error": True, "message": "Insufficient wallet balance to reverse this deposit"}, status=status.HTTP_400_BAD_REQUEST)
 
             deposit_req.status = operation
             if notes:
@@ -385,20 +383,19 @@ class ManageFundRequestsView(APIView):
     
     
     def log_wallet_transaction(self, db_name, deposit_req, amount, dr_cr, suffix=""):
-        GlTrn.objects.using(db_name).create(
-            linked_service_id=deposit_req.request_ref,
-            member=deposit_req.submitted_by,
-            amount=amount,
-            entry_nature=dr_cr,
-            transaction_type="Fund Deposit",
-            final_amount=amount if dr_cr == "CR" else -amount,
-            transaction_time=timezone.now()
-        )
-        WalletHistory.objects.using(db_name).create(
-            user=deposit_req.submitted_by,
-            action_name=f"Deposit Request {suffix}".strip(),
-            changed_amount=amount,
-            change_type=dr_cr,
-            balance_after=PortalUserBalance.objects.using(db_name).get(user=deposit_req.submitted_by).primary_balance,
-            transaction_date=timezone.now()
-        )
\ No newline at end of file
+        with transaction.atomic(using=db_name):
+            gl_entry = GlTrn.objects.using(db_name).create(
+                linked_service_id=deposit_req.request_ref,
+                member=deposit_req.submitted_by,
+                amount=amount,
+                entry_nature=dr_cr,
+                transaction_type="Fund Deposit",
+                final_amount=amount if dr_cr == "CR" else -amount,
+                transaction_time=timezone.now()
+            )
+            post = wallet_engine.credit if dr_cr == "CR" else wallet_engine.debit
+            post(
+                deposit_req.submitted_by_id, 'primary_balance', amount,
+                f"Deposit Request {suffix}".strip(),
+                reference_id=gl_entry.entry_id, db_alias=db_name
+            )
@@ -1,5 +1,14 @@
+from collections import defaultdict
 from ...views import*
 
+
+def dispute_reversal_remarks(row):
+    original = row['entry'].remarks or ''
+    if row['reverse_type'] == 'DR':
+        return f"REVERSED | {original.replace('CR', 'DR')}"
+    return f"REVERSED | {original.replace('DR', 'CR')}"
+
+
 class AdminDisputeRecordsView(APIView):
     authentication_classes = [SecureJWTAuthentication]
     permission_classes = [IsSuperAdmin | IsAdmin]
@@ -67,325 +76,13 @@ class AdminDisputeRecordsView(APIView):
         #     return validation_resp
 
         try:
-            service_model_map = {
-                '2': {
-                    'model': FundTransferEntry,
-                    'ref_field': 'mt_ref_no',
-                    'status_field': 'mt_status',
-                    'amount_field': 'mt_amt',
-                    'table': 'svc_money_transfer',
-                    'creator_field': 'initiated_by',
-                    'cust_mobile': 'benef_mobile',
-                    'cust_name': 'benef_name'
-                },
-                '4': {
-                    'model': FundTransferEntry,
-                    'ref_field': 'mt_ref_no',
-                    'status_field': 'mt_status',
-                    'amount_field': 'mt_amt',
-                    'table': 'svc_money_transfer',
-                    'creator_field': 'initiated_by',
-                    'cust_mobile': 'benef_mobile',
-                    'cust_name': 'benef_name'
-                },
-                '6': {
-                    'model': FundTransferEntry,
-                    'ref_field': 'mt_ref_no',
-                    'status_field': 'mt_status',
-                    'amount_field': 'mt_amt',
-                    'table': 'svc_money_transfer',
-                    'creator_field': 'initiated_by',
-                    'cust_mobile': 'benef_mobile',
-                    'cust_name': 'benef_name'
-                },
-                '8': {
-                    'model': ElectricityBillEntry,
-                    'ref_field': 'ubill_ref',
-                    'status_field': 'ubill_status',
-                    'amount_field': 'bill_amt',
-                    'table': 'svc_utility_electricity',
-                    'creator_field': 'initiated_by',
-                    'cust_mobile': 'consumer_mobile',
-                    'cust_name': 'consumer_name'
-                },
-                '9': {
-                    'model': ElectricityBillEntry,
-                    'ref_field': 'ubill_ref',
-                    'status_field': 'ubill_status',
-                    'amount_field': 'bill_amt',
-                    'table': 'svc_utility_gas',
-                    'creator_field': 'initiated_by',
-                    'cust_mobile': 'consumer_mobile',
-                    'cust_name': 'consumer_name'
-                },
-                '10': {
-                    'model': ElectricityBillEntry,
-                    'ref_field': 'ubill_ref',
-                    'status_field': 'ubill_status',
-                    'amount_field': 'bill_amt',
-                    'table': 'svc_utility_lic',
-                    'creator_field': 'initiated_by',
-                    'cust_mobile': 'consumer_mobile',
-                    'cust_name': 'consumer_name'
-                },
-                '11': {
-                    'model': RechargeTransaction,
-                    'ref_field': 'recharge_ref',
-                    'status_field': 'recharge_status',
-                    'amount_field': 'recharge_amt',
-                    'table': 'svc_recharge',
-                    'creator_field': 'initiated_by',
-                    'cust_mobile': 'mobile_num',
-                    'cust_name': ''
-                },
-                '12': {
-                    'model': BillPaymentRecord,
-                    'ref_field': 'bbps_ref_id',
-                    'status_field': 'bbps_txn_status',
-                    'amount_field': 'paid_amt',
-                    'table': 'svc_bbps_payment',
-                    'creator_field': 'initiated_by',
-                    'cust_mobile': 'bill_mobile',
-                    'cust_name': ''
-                },
-                '45': {
-                    'model': BillPaymentRecord,
-                    'ref_field': 'bbps_ref_id',
-                    'status_field': 'bbps_txn_status',
-                    'amount_field': 'paid_amt',
-                    'table': 'svc_bbps_payment',
-                    'creator_field': 'initiated_by',
-                    'cust_mobile': 'bill_mobile',
-                    'cust_name': ''
-                },
-                '41': {
-                    'model': CashfreePaymentLog,
-                    'ref_field': 'cf_order_ref',
-                    'status_field': 'cf_txn_status',
-                    'amount_field': 'cf_paid_amt',
-                    'table': 'svc_cashfree_txn',
-                    'creator_field': 'initiated_by',
-                    'cust_mobile': 'payer_mobile',
-                    'cust_name': ''
-                },
-                '74': {
-                    'model': CashfreePaymentLog,
-                    'ref_field': 'cf_order_ref',
-                    'status_field': 'cf_txn_status',
-                    'amount_field': 'cf_paid_amt',
-                    'table': 'svc_cashfree_txn',
-                    'creator_field': 'initiated_by',
-                    'cust_mobile': 'payer_mobile',
-                    'cust_name': ''
-                },
-                '42': {
-                    'model': PhonePePaymentEntry,
-                    'ref_field': 'pp_merchant_ref',
-                    'status_field': 'pp_txn_status',
-                    'amount_field': 'pp_paid_amt',
-                    'table': 'svc_phonepe_txn',
-                    'creator_field': 'initiated_by',
-                    'cust_mobile': 'payer_contact',
-                    'cust_name': ''
-                },
-                '75': {
-                    'model': PhonePePaymentEntry,
-                    'ref_field': 'pp_merchant_ref',
-                    'status_field': 'pp_txn_status',
-                    'amount_field': 'pp_paid_amt',
-                    'table': 'svc_phonepe_txn',
-                    'creator_field': 'initiated_by',
-                    'cust_mobile': 'payer_contact',
-                    'cust_name': ''
-                },
-                '43': {
-                    'model': PaymentGatewayRecord,
-                    'ref_field': 'pg_client_ref',
-                    'status_field': 'pg_txn_status',
-                    'amount_field': 'pg_transfer_amt',
-                    'table': 'svc_pg_transaction',
-                    'creator_field': 'initiated_by',
-                    'cust_mobile': 'client_mobile',
-                    'cust_name': 'client_name'
-                },
-                '76': {
-                    'model': PaymentGatewayRecord,
-                    'ref_field': 'pg_client_ref',
-                    'status_field': 'pg_txn_status',
-                    'amount_field': 'pg_transfer_amt',
-                    'table': 'svc_pg_transaction',
-                    'creator_field': 'initiated_by',
-                    'cust_mobile': 'client_mobile',
-                    'cust_name': 'client_name'
-                },
-                '44': {
-                    'model': PaymentGatewayRecord,
-                    'ref_field': 'payout_unique_ref',
-                    'status_field': 'payout_status',
-                    'amount_field': 'payout_amt',
-                    'table': 'svc_payout',
-                    'creator_field': 'initiated_by',
-                    'cust_mobile': 'benef_contact',
-                    'cust_name': 'benef_full_name'
-                },
-                '77': {
-                    'model': PaymentGatewayRecord,
-                    'ref_field': 'payout_unique_ref',
-                    'status_field': 'payout_status',
-                    'amount_field': 'payout_amt',
-                    'table': 'svc_payout',
-                    'creator_field': 'initiated_by',
-                    'cust_mobile': 'benef_contact',
-                    'cust_name': 'benef_full_name'
-                },
-                '80': {
-                    'model': AepsCashLog,
-                    'ref_field': 'aeps_ref_id',
-                    'status_field': 'aeps_txn_status',
-                    'amount_field': 'aeps_amt',
-                    'table': 'svc_aeps',
-                    'creator_field': 'initiated_by',
-                    'cust_mobile': 'aeps_mobile',
-                    'cust_name': ''
-                },
-                '81': {
-                    'model': AepsCashLog,
-                    'ref_field': 'aeps_ref_id',
-                    'status_field': 'aeps_txn_status',
-                    'amount_field': 'aeps_amt',
-                    'table': 'svc_aeps',
-                    'creator_field': 'initiated_by',
-                    'cust_mobile': 'aeps_mobile',
-                    'cust_name': ''
-                },
-                '82': {
-                    'model': AepsCashLog,
-                    'ref_field': 'aeps_ref_id',
-                    'status_field': 'aeps_txn_status',
-                    'amount_field': 'aeps_amt',
-                    'table': 'svc_aeps',
-                    'creator_field': 'initiated_by',
-                    'cust_mobile': 'aeps_mobile',
-                    'cust_name': ''
-                },
-                '83': {
-                    'model': AepsCashLog,
-                    'ref_field': 'aeps_ref_id',
-                    'status_field': 'aeps_txn_status',
-                    'amount_field': 'aeps_amt',
-                    'table': 'svc_aeps',
-                    'creator_field': 'initiated_by',
-                    'cust_mobile': 'aeps_mobile',
-                    'cust_name': ''
-                },
-                '84': {
-                    'model': BulkPayoutRecord,
-                    'ref_field': 'bulk_txn_id',
-                    'status_field': 'bulk_status',
-                    'amount_field': 'bulk_amt',
-                    'table': 'svc_bulk_payout',
-                    'creator_field': 'initiated_by',
-                    'cust_mobile': 'bulk_benef_mobile',
-                    'cust_name': 'bulk_benef_name'
-                },
-                '85': {
-                    'model': AirtelBillEntry,
-                    'ref_field': 'airtel_txn_ref',
-                    'status_field': 'airtel_status',
-                    'amount_field': 'airtel_amt',
-                    'table': 'svc_airtel_cms',
-                    'creator_field': 'initiated_by',
-                    'cust_mobile': 'airtel_mobile',
-                    'cust_name': ''
-                },
-                '86': {
-                    'model': BankItAepsRecord,
-                    'ref_field': 'bankit_ref',
-                    'status_field': 'bankit_status',
-                    'amount_field': 'bankit_amt',
-                    'table': 'svc_bankit_aeps',
-                    'creator_field': 'initiated_by',
-                    'cust_mobile': 'bankit_mobile',
-                    'cust_name': ''
-                },
-                '92': {
-                    'model': MicroAtmEntry,
-                    'ref_field': 'matm_ref',
-                    'status_field': 'matm_status',
-                    'amount_field': 'matm_amt',
-                    'table': 'svc_micro_atm',
-                    'creator_field': 'initiated_by',
-                    'cust_mobile': 'matm_mobile',
-                    'cust_name': ''
-                },
-                '95': {
-                    'model': FundTransferEntry,
-                    'ref_field': 'mt_ref_no',
-                    'status_field': 'mt_status',
-                    'amount_field': 'mt_amt',
-                    'table': 'svc_money_transfer',
-                    'creator_field': 'initiated_by',
-                    'cust_mobile': 'benef_mobile',
-                    'cust_name': 'benef_name'
-                },
-                '97': {
-                    'model': BankItAepsRecord,
-                    'ref_field': 'bankit_ref',
-                    'status_field': 'bankit_status',
-                    'amount_field': 'bankit_amt',
-                    'table': 'svc_bankit_aeps',
-                    'creator_field': 'initiated_by',
-                    'cust_mobile': 'bankit_mobile',
-                    'cust_name': ''
-                },
-                '103': {
-                    'model': MicroAtmEntry,
-                    'ref_field': 'matm_ref',
-                    'status_field': 'matm_status',
-                    'amount_field': 'matm_amt',
-                    'table': 'svc_micro_atm',
-                    'creator_field': 'initiated_by',
-                    'cust_mobile': 'matm_mobile',
-                    'cust_name': ''
-                },
-                '106': {
-                    'model': PpiTransferLog,
-                    'ref_field': 'ppi_txn_ref',
-                    'status_field': 'ppi_status',
-                    'amount_field': 'ppi_amt',
-                    'table': 'svc_dmt_ppi',
-                    'creator_field': 'initiated_by',
-                    'cust_mobile': 'ppi_contact',
-                    'cust_name': ''
-                },
-                '109': {
-                    'model': KhataTransferEntry,
-                    'ref_field': 'digi_ref_id',
-                    'status_field': 'digi_txn_status',
-                    'amount_field': 'digi_txn_amt',
-                    'table': 'svc_digi_ledger',
-                    'creator_field': 'initiated_by',
-                    'cust_mobile': 'digi_customer_mobile',
-                    'cust_name': 'digi_customer_name'
-                },
-            }
-
             complaints_qs = Servicedispute.objects.all().order_by('-created_on')
 
             if admin_id_list:
                 complaints_qs = complaints_qs.filter(admin__in=admin_id_list)
 
             if query_text:
-                base_q = Q(txn_ref__icontains=query_text)
-                admin_ids = Admin.objects.filter(name__icontains=query_text).values_list('admin_id', flat=True)
-                if admin_ids:
-                    base_q |= Q(admin__in=admin_ids)
-
-                provider_ids = ServiceProvider.objects.filter(display_label__icontains=query_text).values_list('sp_id', flat=True)
-                if provider_ids:
-                    base_q |= Q(provider_id__in=provider_ids)
-
-                complaints_qs = complaints_qs.filter(base_q)
+                complaints_qs = complaints_qs.filter(search_q(query_text, 'search_text'))
 
             if provider_id:
                 complaints_qs = complaints_qs.filter(provider_id=provider_id)  # already str → int safe
@@ -433,40 +130,7 @@ class AdminDisputeRecordsView(APIView):
                 item['provider_name'] = None
                 item['admin_full_name'] = None
 
-                admin_obj = Admin.objects.get(admin_id=item['admin'])
-                db_connection = switch_to_database(admin_obj.db_name)
-
-                provider_local = AdServiceProvider.objects.using(db_connection).get(sp_id=item.get('provider_id'))
-                global_provider = ServiceProvider.objects.filter(sys_id=provider_local.sys_id).first()
-                portal_admin = PortalUser.objects.using(db_connection).filter(pk=1).first()
-
-                item['provider_name'] = global_provider.provider_name if global_provider else None
-                item['admin_full_name'] = portal_admin.pu_name if portal_admin else None
-
-                map_entry = service_model_map.get(str(global_provider.sp_id))
-                if not map_entry:
-                    continue
-
-                txn_model = map_entry['model']
-                ref_field = map_entry['ref_field']
-                txn_ref_val = item.get('txn_ref')
-
-                txn_record = txn_model.objects.using(db_connection).filter(**{ref_field: txn_ref_val}).first()
-                if not txn_record:
-                    continue
-
-                creator_id = getattr(txn_record, map_entry.get('creator_field', 'initiated_by'), None)
-                if creator_id:
-                    retailer = PortalUser.objects.using(db_connection).filter(pk=creator_id).first()
-                    retailer_detail = PortalUserInfo.objects.using(db_connection).filter(pu_id=creator_id).first()
-                    item['retailer_id'] = retailer.pk if retailer else None
-                    item['retailer_name'] = retailer.pu_name if retailer else None
-                    item['retailer_code'] = retailer_detail.pud_unique_id if retailer_detail else None
-
-                item['customer_mobile'] = getattr(txn_record, map_entry.get('cust_mobile'), None) if map_entry.get('cust_mobile') else None
-                item['customer_full_name'] = getattr(txn_record, map_entry.get('cust_name'), None) if map_entry.get('cust_name') else None
-                item['txn_amount'] = getattr(txn_record, map_entry['amount_field'], None)
-                item['txn_current_status'] = getattr(txn_record, map_entry['status_field'], None)
+            self.enrich_complaint_records(serialized_data)
 
             pagination_result = add_serial_numbers(serialized_data, page_num, page_size, 'desc')
 
@@ -488,368 +152,133 @@ class AdminDisputeRecordsView(APIView):
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+    def enrich_tenant_records(self, db_alias, items):
+        """
+        Provider, admin, transaction and retailer details for one tenant's
+        complaints, in a fixed number of queries however many rows there are.
+        """
+        enrichment = {}
+        lookups = defaultdict(list)
+        for index, item in items:
+            # Complaints store the system sp_id, not the tenant's provider_id.
+            provider = (
+                provider_catalogue.tenant_provider_for_system(db_alias, item.get('provider_id'))
+                or provider_catalogue.system_provider(item.get('provider_id'))
+            )
+            enrichment[index] = {'provider_name': provider.provider_name if provider else None}
+            service_table = get_service_table_for_provider(provider.sp_id) if provider else None
+            if service_table and item.get('txn_ref'):
+                lookups[(service_table.db_table, item['txn_ref'])].append(index)
+
+        admin_name = PortalUser.objects.filter(pk=1).values_list('full_name', flat=True).first()
+        for details in enrichment.values():
+            details['admin_full_name'] = admin_name
+
+        if not lookups:
+            return enrichment
+
+        txn_rows = ServiceTransaction.objects.filter(
+            service_table__in={table for table, _ in lookups},
+            txn_ref__in={txn_ref for _, txn_ref in lookups},
+        )
+        txn_by_index = {}
+        for txn_row in txn_rows:
+            for index in lookups.get((txn_row.service_table, txn_row.txn_ref), []):
+                txn_by_index.setdefault(index, txn_row)
+
+        creator_ids = {txn_row.created_by for txn_row in txn_by_index.values() if txn_row.created_by}
+        retailers = PortalUser.objects.only('full_name').in_bulk(creator_ids)
+        retailer_codes = dict(
+            PortalUserInfo.objects.filter(user_account_id__in=creator_ids)
+            .values_list('user_account_id', 'unique_member_code')
+        )
+
+        for index, txn_row in txn_by_index.items():
+            details = enrichment[index]
+            retailer = retailers.get(txn_row.created_by)
+            if retailer:
+                details['retailer_id'] = retailer.pk
+                details['retailer_name'] = retailer.full_name
+                details['retailer_code'] = retailer_codes.get(retailer.pk)
+            details['customer_mobile'] = txn_row.customer_mobile
+            details['customer_full_name'] = txn_row.customer_name
+            details['txn_amount'] = txn_row.txn_amount
+            details['txn_current_status'] = txn_row.txn_status
+        return enrichment
+
+    def enrich_complaint_records(self, serialized_data):
+        items_by_alias = defaultdict(list)
+        for index, item in enumerate(serialized_data):
+            try:
+                items_by_alias[get_admin_db_name(item['admin'])].append((index, item))
+            except Admin.DoesNotExist:
+                continue
+
+        outcome = fan_out(
+            list(items_by_alias),
+            lambda db_alias: self.enrich_tenant_records(db_alias, items_by_alias[db_alias]),
+            timeout=getattr(settings, 'TENANT_FANOUT_TIMEOUT', 30),
+        )
+        for db_alias, enrichment in outcome.results.items():
+            for index, details in enrichment.items():
+                serialized_data[index].update(details)
+        for db_alias, error in outcome.errors.items():
+            print(f"Error enriching complaints for {db_alias}: {error}")
+
+    def locate_transaction(self, txn_ref, admin_id, provider_id):
+        """
+        (admin_id, service table, row lookup, sp_id) for txn_ref. The txn_ref
+        directory answers first, so admin_id and provider_id are optional when
+        the reference is unique; otherwise both are needed to find the row.
+        Service table and lookup are None when the row cannot be located.
+        """
+        service_table = get_service_table_for_provider(provider_id) if provider_id else None
+        entry = resolve_txn_ref(txn_ref, admin_id=admin_id, service_table=service_table.db_table if service_table else None)
+        if entry:
+            # The directory holds the tenant's provider_id; complaints and charges use the system sp_id.
+            with tenant_alias(entry.db_name) as db_alias:
+                provider = provider_catalogue.tenant_provider(db_alias, entry.provider_id)
+            sp_id = provider.sp_id if provider else provider_id
+            return entry.admin_id, get_service_table(entry.service_table), {'pk': entry.service_id}, sp_id
+        if not admin_id or not service_table:
+            return admin_id, None, None, provider_id
+        return admin_id, service_table, {service_table.ref_field: txn_ref}, provider_id
+
     def show_reversal_impact(self, request):
-        provider_id = str(request.data.get('provider_id'))
+        provider_id = request.data.get('provider_id')
         txn_ref = request.data.get('txn_ref')
         admin_id = request.data.get('admin_id')
 
-        service_model_map = {
-            '2': {
-                'model': FundTransferEntry,
-                'ref_field': 'mt_ref_no',
-                'status_field': 'mt_status',
-                'amount_field': 'mt_amt',
-                'table': 'svc_money_transfer',
-                'creator_field': 'initiated_by',
-                'cust_mobile': 'benef_mobile',
-                'cust_name': 'benef_name'
-            },
-            '4': {
-                'model': FundTransferEntry,
-                'ref_field': 'mt_ref_no',
-                'status_field': 'mt_status',
-                'amount_field': 'mt_amt',
-                'table': 'svc_money_transfer',
-                'creator_field': 'initiated_by',
-                'cust_mobile': 'benef_mobile',
-                'cust_name': 'benef_name'
-            },
-            '6': {
-                'model': FundTransferEntry,
-                'ref_field': 'mt_ref_no',
-                'status_field': 'mt_status',
-                'amount_field': 'mt_amt',
-                'table': 'svc_money_transfer',
-                'creator_field': 'initiated_by',
-                'cust_mobile': 'benef_mobile',
-                'cust_name': 'benef_name'
-            },
-            '8': {
-                'model': ElectricityBillEntry,
-                'ref_field': 'ubill_ref',
-                'status_field': 'ubill_status',
-                'amount_field': 'bill_amt',
-                'table': 'svc_utility_electricity',
-                'creator_field': 'initiated_by',
-                'cust_mobile': 'consumer_mobile',
-                'cust_name': 'consumer_name'
-            },
-            '9': {
-                'model': ElectricityBillEntry,
-                'ref_field': 'ubill_ref',
-                'status_field': 'ubill_status',
-                'amount_field': 'bill_amt',
-                'table': 'svc_utility_gas',
-                'creator_field': 'initiated_by',
-                'cust_mobile': 'consumer_mobile',
-                'cust_name': 'consumer_name'
-            },
-            '10': {
-                'model': ElectricityBillEntry,
-                'ref_field': 'ubill_ref',
-                'status_field': 'ubill_status',
-                'amount_field': 'bill_amt',
-                'table': 'svc_utility_lic',
-                'creator_field': 'initiated_by',
-                'cust_mobile': 'consumer_mobile',
-                'cust_name': 'consumer_name'
-            },
-            '11': {
-                'model': RechargeTransaction,
-                'ref_field': 'recharge_ref',
-                'status_field': 'recharge_status',
-                'amount_field': 'recharge_amt',
-                'table': 'svc_recharge',
-                'creator_field': 'initiated_by',
-                'cust_mobile': 'mobile_num',
-                'cust_name': ''
-            },
-            '12': {
-                'model': BillPaymentRecord,
-                'ref_field': 'bbps_ref_id',
-                'status_field': 'bbps_txn_status',
-                'amount_field': 'paid_amt',
-                'table': 'svc_bbps_payment',
-                'creator_field': 'initiated_by',
-                'cust_mobile': 'bill_mobile',
-                'cust_name': ''
-            },
-            '45': {
-                'model': BillPaymentRecord,
-                'ref_field': 'bbps_ref_id',
-                'status_field': 'bbps_txn_status',
-                'amount_field': 'paid_amt',
-                'table': 'svc_bbps_payment',
-                'creator_field': 'initiated_by',
-                'cust_mobile': 'bill_mobile',
-                'cust_name': ''
-            },
-            '41': {
-                'model': CashfreePaymentLog,
-                'ref_field': 'cf_order_ref',
-                'status_field': 'cf_txn_status',
-                'amount_field': 'cf_paid_amt',
-                'table': 'svc_cashfree_txn',
-                'creator_field': 'initiated_by',
-                'cust_mobile': 'payer_mobile',
-                'cust_name': ''
-            },
-            '74': {
-                'model': CashfreePaymentLog,
-                'ref_field': 'cf_order_ref',
-                'status_field': 'cf_txn_status',
-                'amount_field': 'cf_paid_amt',
-                'table': 'svc_cashfree_txn',
-                'creator_field': 'initiated_by',
-                'cust_mobile': 'payer_mobile',
-                'cust_name': ''
-            },
-            '42': {
-                'model': PhonePePaymentEntry,
-                'ref_field': 'pp_merchant_ref',
-                'status_field': 'pp_txn_status',
-                'amount_field': 'pp_paid_amt',
-                'table': 'svc_phonepe_txn',
-                'creator_field': 'initiated_by',
-                'cust_mobile': 'payer_contact',
-                'cust_name': ''
-            },
-            '75': {
-                'model': PhonePePaymentEntry,
-                'ref_field': 'pp_merchant_ref',
-                'status_field': 'pp_txn_status',
-                'amount_field': 'pp_paid_amt',
-                'table': 'svc_phonepe_txn',
-                'creator_field': 'initiated_by',
-                'cust_mobile': 'payer_contact',
-                'cust_name': ''
-            },
-            '43': {
-                'model': PaymentGatewayRecord,
-                'ref_field': 'pg_client_ref',
-                'status_field': 'pg_txn_status',
-                'amount_field': 'pg_transfer_amt',
-                'table': 'svc_pg_transaction',
-                'creator_field': 'initiated_by',
-                'cust_mobile': 'client_mobile',
-                'cust_name': 'client_name'
-            },
-            '76': {
-                'model': PaymentGatewayRecord,
-                'ref_field': 'pg_client_ref',
-                'status_field': 'pg_txn_status',
-                'amount_field': 'pg_transfer_amt',
-                'table': 'svc_pg_transaction',
-                'creator_field': 'initiated_by',
-                'cust_mobile': 'client_mobile',
-                'cust_name': 'client_name'
-            },
-            '44': {
-                'model': PaymentGatewayRecord,
-                'ref_field': 'payout_unique_ref',
-                'status_field': 'payout_status',
-                'amount_field': 'payout_amt',
-                'table': 'svc_payout',
-                'creator_field': 'initiated_by',
-                'cust_mobile': 'benef_contact',
-                'cust_name': 'benef_full_name'
-            },
-            '77': {
-                'model': PaymentGatewayRecord,
-                'ref_field': 'payout_unique_ref',
-                'status_field': 'payout_status',
-                'amount_field': 'payout_amt',
-                'table': 'svc_payout',
-                'creator_field': 'initiated_by',
-                'cust_mobile': 'benef_contact',
-                'cust_name': 'benef_full_name'
-            },
-            '80': {
-                'model': AepsCashLog,
-                'ref_field': 'aeps_ref_id',
-                'status_field': 'aeps_txn_status',
-                'amount_field': 'aeps_amt',
-                'table': 'svc_aeps',
-                'creator_field': 'initiated_by',
-                'cust_mobile': 'aeps_mobile',
-                'cust_name': ''
-            },
-            '81': {
-                'model': AepsCashLog,
-                'ref_field': 'aeps_ref_id',
-                'status_field': 'aeps_txn_status',
-                'amount_field': 'aeps_amt',
-                'table': 'svc_aeps',
-                'creator_field': 'initiated_by',
-                'cust_mobile': 'aeps_mobile',
-                'cust_name': ''
-            },
-            '82': {
-                'model': AepsCashLog,
-                'ref_field': 'aeps_ref_id',
-                'status_field': 'aeps_txn_status',
-                'amount_field': 'aeps_amt',
-                'table': 'svc_aeps',
-                'creator_field': 'initiated_by',
-                'cust_mobile': 'aeps_mobile',
-                'cust_name': ''
-            },
-            '83': {
-                'model': AepsCashLog,
-                'ref_field': 'aeps_ref_id',
-                'status_field': 'aeps_txn_status',
-                'amount_field': 'aeps_amt',
-                'table': 'svc_aeps',
-                'creator_field': 'initiated_by',
-                'cust_mobile': 'aeps_mobile',
-                'cust_name': ''
-            },
-            '84': {
-                'model': BulkPayoutRecord,
-                'ref_field': 'bulk_txn_id',
-                'status_field': 'bulk_status',
-                'amount_field': 'bulk_amt',
-                'table': 'svc_bulk_payout',
-                'creator_field': 'initiated_by',
-                'cust_mobile': 'bulk_benef_mobile',
-                'cust_name': 'bulk_benef_name'
-            },
-            '85': {
-                'model': AirtelBillEntry,
-                'ref_field': 'airtel_txn_ref',
-                'status_field': 'airtel_status',
-                'amount_field': 'airtel_amt',
-                'table': 'svc_airtel_cms',
-                'creator_field': 'initiated_by',
-                'cust_mobile': 'airtel_mobile',
-                'cust_name': ''
-            },
-            '86': {
-                'model': BankItAepsRecord,
-                'ref_field': 'bankit_ref',
-                'status_field': 'bankit_status',
-                'amount_field': 'bankit_amt',
-                'table': 'svc_bankit_aeps',
-                'creator_field': 'initiated_by',
-                'cust_mobile': 'bankit_mobile',
-                'cust_name': ''
-            },
-            '92': {
-                'model': MicroAtmEntry,
-                'ref_field': 'matm_ref',
-                'status_field': 'matm_status',
-                'amount_field': 'matm_amt',
-                'table': 'svc_micro_atm',
-                'creator_field': 'initiated_by',
-                'cust_mobile': 'matm_mobile',
-                'cust_name': ''
-            },
-            '95': {
-                'model': FundTransferEntry,
-                'ref_field': 'mt_ref_no',
-                'status_field': 'mt_status',
-                'amount_field': 'mt_amt',
-                'table': 'svc_money_transfer',
-                'creator_field': 'initiated_by',
-                'cust_mobile': 'benef_mobile',
-                'cust_name': 'benef_name'
-            },
-            '97': {
-                'model': BankItAepsRecord,
-                'ref_field': 'bankit_ref',
-                'status_field': 'bankit_status',
-                'amount_field': 'bankit_amt',
-                'table': 'svc_bankit_aeps',
-                'creator_field': 'initiated_by',
-                'cust_mobile': 'bankit_mobile',
-                'cust_name': ''
-            },
-            '103': {
-                'model': MicroAtmEntry,
-                'ref_field': 'matm_ref',
-                'status_field': 'matm_status',
-                'amount_field': 'matm_amt',
-                'table': 'svc_micro_atm',
-                'creator_field': 'initiated_by',
-                'cust_mobile': 'matm_mobile',
-                'cust_name': ''
-            },
-            '106': {
-                'model': PpiTransferLog,
-                'ref_field': 'ppi_txn_ref',
-                'status_field': 'ppi_status',
-                'amount_field': 'ppi_amt',
-                'table': 'svc_dmt_ppi',
-                'creator_field': 'initiated_by',
-                'cust_mobile': 'ppi_contact',
-                'cust_name': ''
-            },
-            '109': {
-                'model': KhataTransferEntry,
-                'ref_field': 'digi_ref_id',
-                'status_field': 'digi_txn_status',
-                'amount_field': 'digi_txn_amt',
-                'table': 'svc_digi_ledger',
-                'creator_field': 'initiated_by',
-                'cust_mobile': 'digi_customer_mobile',
-                'cust_name': 'digi_customer_name'
-            },
-        }
-
         try:
-            if provider_id not in service_model_map:
+            admin_id, service_table, row_lookup, _ = self.locate_transaction(txn_ref, admin_id, provider_id)
+            if not service_table or not service_table.status_field:
                 return Response({'status': 'fail', 'message': 'Unsupported service provider.'}, status=status.HTTP_400_BAD_REQUEST)
 
-            admin_obj = Admin.objects.get(admin_id=admin_id)
-            db_conn = switch_to_database(admin_obj.db_name)
-
-            mapping = service_model_map[provider_id]
-            txn_record = mapping['model'].objects.using(db_conn).get(**{mapping['ref_field']: txn_ref})
-            current_status = getattr(txn_record, mapping['status_field'])
-
-            if current_status not in ['SUCCESS', 'IN PROGRESS', 'DISPUTE RAISED']:
-                return Response({'status': 'fail', 'message': 'Transaction not eligible for reversal.'}, status=status.HTTP_400_BAD_REQUEST)
-
-            gl_entries = GlTrn.objects.using(db_conn).filter(
-                related_table=mapping['table'],
-                related_id=txn_record.pk,
-                pu_id=1
-            ).order_by('gl_entry_id')
-
-            if not gl_entries.exists():
-                return Response({'status': 'fail', 'message': 'No ledger entries found.'}, status=status.HTTP_404_NOT_FOUND)
+            with tenant(admin_id):
+                txn_record = service_table.model.objects.get(**row_lookup)
+                current_status = getattr(txn_record, service_table.status_field)
 
-            gl_ids = gl_entries.values_list('gl_entry_id', flat=True)
-            wallet_entries = WalletHistory.objects.using(db_conn).filter(action_ref__in=gl_ids).order_by('wl_entry_id')
+                if current_status not in REVERSIBLE_STATUSES:
+                    return Response({'status': 'fail', 'message': 'Transaction not eligible for reversal.'}, status=status.HTTP_400_BAD_REQUEST)
 
-            impact_list = []
-            for w_entry in wallet_entries:
-                user = w_entry.pu
-                wallet_type = w_entry.affected_wallet
-                amount = w_entry.affected_amount or 0
-                entry_type = w_entry.entry_direction
-
-                user_wallet = PortalUserBalance.objects.using(db_conn).filter(pu=user).first()
-                current_bal = getattr(user_wallet, wallet_type, 0) if user_wallet else 0
-
-                if entry_type == 'CR':
-                    new_bal = current_bal - amount
-                    rev_direction = 'DR'
-                else:
-                    new_bal = current_bal + amount
-                    rev_direction = 'CR'
-
-                user_code = PortalUserInfo.objects.using(db_conn).get(pu=user).pud_unique_id or 'ADMIN'
-
-                impact_list.append({
-                    'user_code': user_code,
-                    'wallet_type': wallet_type,
-                    'amount': amount,
-                    'original_direction': entry_type,
-                    'reverse_direction': rev_direction,
-                    'current_balance': current_bal,
-                    'after_reversal_balance': new_bal
-                })
+                try:
+                    rows = preview_reversal(service_table, txn_record.pk, member_id=1)
+                except ReversalError as exc:
+                    return Response({'status': 'fail', 'message': str(exc)}, status=status.HTTP_404_NOT_FOUND)
+
+                user_codes = dict(PortalUserInfo.objects.filter(
+                    user_account_id__in={row['entry'].user_id for row in rows}
+                ).values_list('user_account_id', 'unique_member_code'))
+
+                impact_list = [{
+                    'user_code': user_codes.get(row['entry'].user_id) or 'ADMIN',
+                    'wallet_type': row['entry'].wallet_name,
+                    'amount': row['amount'],
+                    'original_direction': row['entry'].change_type,
+                    'reverse_direction': row['reverse_type'],
+                    'current_balance': row['current_balance'],
+                    'after_reversal_balance': row['balance_after']
+                } for row in rows]
 
             return Response({
                 'status': 'success',
@@ -864,402 +293,50 @@ class AdminDisputeRecordsView(APIView):
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
     def execute_reversal(self, request):
-        provider_id = str(request.data.get('provider_id'))
+        provider_id = request.data.get('provider_id') or None
         txn_ref = request.data.get('txn_ref')
         admin_id = request.data.get('admin_id')
         notes = request.data.get('notes', '')
         new_status = request.data.get('new_complaint_status')
 
-        service_model_map = {
-            '2': {
-                'model': FundTransferEntry,
-                'ref_field': 'mt_ref_no',
-                'status_field': 'mt_status',
-                'amount_field': 'mt_amt',
-                'table': 'svc_money_transfer',
-                'creator_field': 'initiated_by',
-                'cust_mobile': 'benef_mobile',
-                'cust_name': 'benef_name'
-            },
-            '4': {
-                'model': FundTransferEntry,
-                'ref_field': 'mt_ref_no',
-                'status_field': 'mt_status',
-                'amount_field': 'mt_amt',
-                'table': 'svc_money_transfer',
-                'creator_field': 'initiated_by',
-                'cust_mobile': 'benef_mobile',
-                'cust_name': 'benef_name'
-            },
-            '6': {
-                'model': FundTransferEntry,
-                'ref_field': 'mt_ref_no',
-                'status_field': 'mt_status',
-                'amount_field': 'mt_amt',
-                'table': 'svc_money_transfer',
-                'creator_field': 'initiated_by',
-                'cust_mobile': 'benef_mobile',
-                'cust_name': 'benef_name'
-            },
-            '8': {
-                'model': ElectricityBillEntry,
-                'ref_field': 'ubill_ref',
-                'status_field': 'ubill_status',
-                'amount_field': 'bill_amt',
-                'table': 'svc_utility_electricity',
-                'creator_field': 'initiated_by',
-                'cust_mobile': 'consumer_mobile',
-                'cust_name': 'consumer_name'
-            },
-            '9': {
-                'model': ElectricityBillEntry,
-                'ref_field': 'ubill_ref',
-                'status_field': 'ubill_status',
-                'amount_field': 'bill_amt',
-                'table': 'svc_utility_gas',
-                'creator_field': 'initiated_by',
-                'cust_mobile': 'consumer_mobile',
-                'cust_name': 'consumer_name'
-            },
-            '10': {
-                'model': ElectricityBillEntry,
-                'ref_field': 'ubill_ref',
-                'status_field': 'ubill_status',
-                'amount_field': 'bill_amt',
-                'table': 'svc_utility_lic',
-                'creator_field': 'initiated_by',
-                'cust_mobile': 'consumer_mobile',
-                'cust_name': 'consumer_name'
-            },
-            '11': {
-                'model': RechargeTransaction,
-                'ref_field': 'recharge_ref',
-                'status_field': 'recharge_status',
-                'amount_field': 'recharge_amt',
-                'table': 'svc_recharge',
-                'creator_field': 'initiated_by',
-                'cust_mobile': 'mobile_num',
-                'cust_name': ''
-            },
-            '12': {
-                'model': BillPaymentRecord,
-                'ref_field': 'bbps_ref_id',
-                'status_field': 'bbps_txn_status',
-                'amount_field': 'paid_amt',
-                'table': 'svc_bbps_payment',
-                'creator_field': 'initiated_by',
-                'cust_mobile': 'bill_mobile',
-                'cust_name': ''
-            },
-            '45': {
-                'model': BillPaymentRecord,
-                'ref_field': 'bbps_ref_id',
-                'status_field': 'bbps_txn_status',
-                'amount_field': 'paid_amt',
-                'table': 'svc_bbps_payment',
-                'creator_field': 'initiated_by',
-                'cust_mobile': 'bill_mobile',
-                'cust_name': ''
-            },
-            '41': {
-                'model': CashfreePaymentLog,
-                'ref_field': 'cf_order_ref',
-                'status_field': 'cf_txn_status',
-                'amount_field': 'cf_paid_amt',
-                'table': 'svc_cashfree_txn',
-                'creator_field': 'initiated_by',
-                'cust_mobile': 'payer_mobile',
-                'cust_name': ''
-            },
-            '74': {
-                'model': CashfreePaymentLog,
-                'ref_field': 'cf_order_ref',
-                'status_field': 'cf_txn_status',
-                'amount_field': 'cf_paid_amt',
-                'table': 'svc_cashfree_txn',
-                'creator_field': 'initiated_by',
-                'cust_mobile': 'payer_mobile',
-                'cust_name': ''
-            },
-            '42': {
-                'model': PhonePePaymentEntry,
-                'ref_field': 'pp_merchant_ref',
-                'status_field': 'pp_txn_status',
-                'amount_field': 'pp_paid_amt',
-                'table': 'svc_phonepe_txn',
-                'creator_field': 'initiated_by',
-                'cust_mobile': 'payer_contact',
-                'cust_name': ''
-            },
-            '75': {
-                'model': PhonePePaymentEntry,
-                'ref_field': 'pp_merchant_ref',
-                'status_field': 'pp_txn_status',
-                'amount_field': 'pp_paid_amt',
-                'table': 'svc_phonepe_txn',
-                'creator_field': 'initiated_by',
-                'cust_mobile': 'payer_contact',
-                'cust_name': ''
-            },
-            '43': {
-                'model': PaymentGatewayRecord,
-                'ref_field': 'pg_client_ref',
-                'status_field': 'pg_txn_status',
-                'amount_field': 'pg_transfer_amt',
-                'table': 'svc_pg_transaction',
-                'creator_field': 'initiated_by',
-                'cust_mobile': 'client_mobile',
-                'cust_name': 'client_name'
-            },
-            '76': {
-                'model': PaymentGatewayRecord,
-                'ref_field': 'pg_client_ref',
-                'status_field': 'pg_txn_status',
-                'amount_field': 'pg_transfer_amt',
-                'table': 'svc_pg_transaction',
-                'creator_field': 'initiated_by',
-                'cust_mobile': 'client_mobile',
-                'cust_name': 'client_name'
-            },
-            '44': {
-                'model': PaymentGatewayRecord,
-                'ref_field': 'payout_unique_ref',
-                'status_field': 'payout_status',
-                'amount_field': 'payout_amt',
-                'table': 'svc_payout',
-                'creator_field': 'initiated_by',
-                'cust_mobile': 'benef_contact',
-                'cust_name': 'benef_full_name'
-            },
-            '77': {
-                'model': PaymentGatewayRecord,
-                'ref_field': 'payout_unique_ref',
-                'status_field': 'payout_status',
-                'amount_field': 'payout_amt',
-                'table': 'svc_payout',
-                'creator_field': 'initiated_by',
-                'cust_mobile': 'benef_contact',
-                'cust_name': 'benef_full_name'
-            },
-            '80': {
-                'model': AepsCashLog,
-                'ref_field': 'aeps_ref_id',
-                'status_field': 'aeps_txn_status',
-                'amount_field': 'aeps_amt',
-                'table': 'svc_aeps',
-                'creator_field': 'initiated_by',
-                'cust_mobile': 'aeps_mobile',
-                'cust_name': ''
-            },
-            '81': {
-                'model': AepsCashLog,
-                'ref_field': 'aeps_ref_id',
-                'status_field': 'aeps_txn_status',
-                'amount_field': 'aeps_amt',
-                'table': 'svc_aeps',
-                'creator_field': 'initiated_by',
-                'cust_mobile': 'aeps_mobile',
-                'cust_name': ''
-            },
-            '82': {
-                'model': AepsCashLog,
-                'ref_field': 'aeps_ref_id',
-                'status_field': 'aeps_txn_status',
-                'amount_field': 'aeps_amt',
-                'table': 'svc_aeps',
-                'creator_field': 'initiated_by',
-                'cust_mobile': 'aeps_mobile',
-                'cust_name': ''
-            },
-            '83': {
-                'model': AepsCashLog,
-                'ref_field': 'aeps_ref_id',
-                'status_field': 'aeps_txn_status',
-                'amount_field': 'aeps_amt',
-                'table': 'svc_aeps',
-                'creator_field': 'initiated_by',
-                'cust_mobile': 'aeps_mobile',
-                'cust_name': ''
-            },
-            '84': {
-                'model': BulkPayoutRecord,
-                'ref_field': 'bulk_txn_id',
-                'status_field': 'bulk_status',
-                'amount_field': 'bulk_amt',
-                'table': 'svc_bulk_payout',
-                'creator_field': 'initiated_by',
-                'cust_mobile': 'bulk_benef_mobile',
-                'cust_name': 'bulk_benef_name'
-            },
-            '85': {
-                'model': AirtelBillEntry,
-                'ref_field': 'airtel_txn_ref',
-                'status_field': 'airtel_status',
-                'amount_field': 'airtel_amt',
-                'table': 'svc_airtel_cms',
-                'creator_field': 'initiated_by',
-                'cust_mobile': 'airtel_mobile',
-                'cust_name': ''
-            },
-            '86': {
-                'model': BankItAepsRecord,
-                'ref_field': 'bankit_ref',
-                'status_field': 'bankit_status',
-                'amount_field': 'bankit_amt',
-                'table': 'svc_bankit_aeps',
-                'creator_field': 'initiated_by',
-                'cust_mobile': 'bankit_mobile',
-                'cust_name': ''
-            },
-            '92': {
-                'model': MicroAtmEntry,
-                'ref_field': 'matm_ref',
-                'status_field': 'matm_status',
-                'amount_field': 'matm_amt',
-                'table': 'svc_micro_atm',
-                'creator_field': 'initiated_by',
-                'cust_mobile': 'matm_mobile',
-                'cust_name': ''
-            },
-            '95': {
-                'model': FundTransferEntry,
-                'ref_field': 'mt_ref_no',
-                'status_field': 'mt_status',
-                'amount_field': 'mt_amt',
-                'table': 'svc_money_transfer',
-                'creator_field': 'initiated_by',
-                'cust_mobile': 'benef_mobile',
-                'cust_name': 'benef_name'
-            },
-            '97': {
-                'model': BankItAepsRecord,
-                'ref_field': 'bankit_ref',
-                'status_field': 'bankit_status',
-                'amount_field': 'bankit_amt',
-                'table': 'svc_bankit_aeps',
-                'creator_field': 'initiated_by',
-                'cust_mobile': 'bankit_mobile',
-                'cust_name': ''
-            },
-            '103': {
-                'model': MicroAtmEntry,
-                'ref_field': 'matm_ref',
-                'status_field': 'matm_status',
-                'amount_field': 'matm_amt',
-                'table': 'svc_micro_atm',
-                'creator_field': 'initiated_by',
-                'cust_mobile': 'matm_mobile',
-                'cust_name': ''
-            },
-            '106': {
-                'model': PpiTransferLog,
-                'ref_field': 'ppi_txn_ref',
-                'status_field': 'ppi_status',
-                'amount_field': 'ppi_amt',
-                'table': 'svc_dmt_ppi',
-                'creator_field': 'initiated_by',
-                'cust_mobile': 'ppi_contact',
-                'cust_name': ''
-            },
-            '109': {
-                'model': KhataTransferEntry,
-                'ref_field': 'digi_ref_id',
-                'status_field': 'digi_txn_status',
-                'amount_field': 'digi_txn_amt',
-                'table': 'svc_digi_ledger',
-                'creator_field': 'initiated_by',
-                'cust_mobile': 'digi_customer_mobile',
-                'cust_name': 'digi_customer_name'
-            },
-        }
-
         try:
+            admin_id, service_table, row_lookup, provider_id = self.locate_transaction(txn_ref, admin_id, provider_id)
             if new_status == "RESOLVED":
-                if provider_id not in service_model_map:
+                if not service_table or not service_table.status_field:
                     return Response({'status': 'fail', 'message': 'Invalid service provider.'}, status=status.HTTP_400_BAD_REQUEST)
 
-                admin_obj = Admin.objects.get(admin_id=admin_id)
-                db_conn = switch_to_database(admin_obj.db_name)
-
-                mapping = service_model_map[provider_id]
-                txn_record = mapping['model'].objects.using(db_conn).filter(**{mapping['ref_field']: txn_ref}).first()
-                if not txn_record:
-                    return Response({'status': 'fail', 'message': 'Transaction not found.'}, status=status.HTTP_404_NOT_FOUND)
-
-                current_status = getattr(txn_record, mapping['status_field'])
-                if current_status not in ['SUCCESS', 'IN PROGRESS', 'DISPUTE RAISED']:
-                    return Response({'status': 'fail', 'message': 'Transaction status not eligible.'}, status=status.HTTP_400_BAD_REQUEST)
-
-                setattr(txn_record, mapping['status_field'], 'REVERSED')
-                txn_record.save(using=db_conn)
-
-                gl_entries = GlTrn.objects.using(db_conn).filter(
-                    related_table=mapping['table'],
-                    related_id=txn_record.pk,
-                    pu_id=1
-                ).order_by('gl_entry_id')
+                govt_charge_filter = {'transaction_ref': txn_ref}
+                if provider_id:
+                    govt_charge_filter['provider_id'] = provider_id
 
-                if not gl_entries.exists():
-                    return Response({'status': 'fail', 'message': 'No ledger entries to reverse.'}, status=status.HTTP_404_NOT_FOUND)
+                with tenant(admin_id):
+                    txn_record = service_table.model.objects.filter(**row_lookup).only('pk').first()
+                    if not txn_record:
+                        return Response({'status': 'fail', 'message': 'Transaction not found.'}, status=status.HTTP_404_NOT_FOUND)
 
-                gl_ids = gl_entries.values_list('gl_entry_id', flat=True)
-                wallet_entries = WalletHistory.objects.using(db_conn).filter(action_ref__in=gl_ids)
-
-                for w_entry in wallet_entries:
-                    gl_rec = GlTrn.objects.using(db_conn).get(gl_entry_id=w_entry.action_ref)
-                    user = w_entry.pu
-                    wallet_field = w_entry.affected_wallet
-                    amt = w_entry.affected_amount or 0
-                    direction = w_entry.entry_direction
-
-                    user_wallet = PortalUserBalance.objects.using(db_conn).filter(pu=user).first()
-                    if user_wallet and wallet_field in ['main_wallet', 'commission_wallet', 'pg_wallet', 'cashin_wallet']:
-                        curr_bal = getattr(user_wallet, wallet_field, 0)
-                        if direction == 'CR':
-                            new_bal = curr_bal - amt
-                            rev_dir = 'DR'
-                            new_label = w_entry.wl_description.replace("CR", "DR")
-                        else:
-                            new_bal = curr_bal + amt
-                            rev_dir = 'CR'
-                            new_label = w_entry.wl_description.replace("DR", "CR")
-                        new_label = f"REVERSED | {new_label}"
-
-                        setattr(user_wallet, wallet_field, new_bal)
-                        user_wallet.save(using=db_conn)
-
-                        if amt > 0:
-                            WalletHistory.objects.using(db_conn).create(
-                                pu=user,
-                                action_type=w_entry.action_type,
-                                wl_description=new_label,
-                                current_balance=new_bal,
-                                affected_wallet=wallet_field,
-                                affected_amount=amt,
-                                entry_direction=rev_dir,
-                                action_ref=w_entry.action_ref,
-                                entry_datetime=now()
-                            )
-
-                for gl in gl_entries:
-                    gl.effective_type = 'DR' if gl.effective_type == 'CR' else 'CR'
-                    gl.save(using=db_conn)
-
-                GovernmentChargeLog.objects.using(db_conn).filter(sp__sp_id=provider_id, transaction_id=txn_ref).update(is_deleted=True)
-                
-            complaint_obj = Servicedispute.objects.get(txn_ref=txn_ref, provider_id=provider_id)
-            complaint_obj.complaint_status = new_status
+                    try:
+                        reverse_transaction(
+                            service_table, txn_record.pk,
+                            remarks_for=dispute_reversal_remarks,
+                            member_id=1,
+                            govt_charge_filter=govt_charge_filter,
+                            performed_by=request.user.id,
+                        )
+                    except ReversalError as exc:
+                        return Response({'status': 'fail', 'message': str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+
+            complaints = Servicedispute.objects.filter(txn_ref=txn_ref)
+            if provider_id:
+                complaints = complaints.filter(provider_id=provider_id)
+            if admin_id:
+                complaints = complaints.filter(admin=admin_id)
+            complaint_obj = complaints.first()
+            if not complaint_obj:
+                return Response({'status': 'fail', 'message': 'Complaint not found.'}, status=status.HTTP_404_NOT_FOUND)
             complaint_obj.admin_notes = notes
-            complaint_obj.updated_by = request.user.id
-            complaint_obj.updated_at = now()
-            complaint_obj.save()
-
-            Servicedispute.objects.create(
-                complaint=complaint_obj,
-                action="Status Updated",
-                user_role="SUPER ADMIN",
-                performed_by=request.user.id
-            )
+            complaint_obj.updated_on = now()
+            complaint_obj.updated_by_user = request.user.id
+            complaint_obj.save(update_fields=['admin_notes', 'updated_on', 'updated_by_user'])
 
             return Response({
                 'status': 'success',
@@ -0,0 +1,246 @@
+import hashlib
+from collections import Counter, defaultdict
+from ...views import*
+from .admin_dispute import dispute_reversal_remarks
+
+
+class AdminDisputeBatchView(APIView):
+    """
+    Reverses many disputed transactions in one call.
+
+    Items are validated together, grouped by tenant and each tenant's group is
+    reversed inside one transaction (a savepoint per item), with tenants run
+    concurrently. The batch is stored under an idempotency key, taken from the
+    Idempotency-Key header or derived from the items, so a retried request
+    gets the original outcome back instead of reversing again.
+    """
+    authentication_classes = [SecureJWTAuthentication]
+    permission_classes = [IsSuperAdmin]
+
+    def post(self, request):
+        items = request.data.get('items')
+        notes = request.data.get('notes', '')
+
+        if not isinstance(items, list) or not items:
+            return Response({'status': 'fail', 'message': 'items must be a non-empty list.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        max_items = getattr(settings, 'DISPUTE_BATCH_MAX_ITEMS', 500)
+        if len(items) > max_items:
+            return Response({'status': 'fail', 'message': f'A batch can hold at most {max_items} items.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            normalized = [self.normalize_item(raw) for raw in items]
+            request_hash = self.batch_hash(normalized, notes)
+            idempotency_key = str(request.headers.get('Idempotency-Key') or request.data.get('idempotency_key') or request_hash)[:128]
+
+            batch, claimed = self.claim_batch(idempotency_key, request_hash, len(normalized), request.user.id)
+            if batch.request_hash != request_hash:
+                return Response({'status': 'fail', 'message': 'Idempotency key was already used for a different batch.'}, status=status.HTTP_409_CONFLICT)
+            if not claimed:
+                if batch.status == DisputeBatch.STATUS_COMPLETED:
+                    return Response({
+                        'status': 'success',
+                        'message': 'Batch already processed.',
+                        'data': dict(batch.results or {}, replayed=True)
+                    }, status=status.HTTP_200_OK)
+                return Response({'status': 'fail', 'message': 'Batch is still being processed.'}, status=status.HTTP_409_CONFLICT)
+
+            try:
+                outcomes = self.process_batch(normalized, notes, request.user.id)
+            except Exception:
+                # Let a retry pick the batch up straight away; items that did
+                # get reversed come back as already reversed.
+                DisputeBatch.objects.filter(pk=batch.pk).update(claimed_on=None)
+                raise
+
+            payload = {
+                'idempotency_key': idempotency_key,
+                'summary': dict(Counter(outcome['status'] for outcome in outcomes)),
+                'items': outcomes,
+            }
+            DisputeBatch.objects.filter(pk=batch.pk).update(
+                status=DisputeBatch.STATUS_COMPLETED,
+                results=payload,
+                completed_on=now()
+            )
+
+            return Response({
+                'status': 'success',
+                'message': 'Batch processed.',
+                'data': dict(payload, replayed=False)
+            }, status=status.HTTP_200_OK)
+
+        except Exception as exc:
+            return Response({
+                'status': 'error',
+                'message': f'Error during batch reversal: {str(exc)}'
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    def normalize_item(self, raw):
+        if not isinstance(raw, dict):
+            raw = {}
+        try:
+            admin_id = int(raw.get('admin_id'))
+        except (TypeError, ValueError):
+            admin_id = None
+        provider_id = str(raw.get('provider_id') or '').strip() or None
+        txn_ref = str(raw.get('txn_ref') or '').strip() or None
+        return {'admin_id': admin_id, 'provider_id': provider_id, 'txn_ref': txn_ref}
+
+    def batch_hash(self, items, notes):
+        raw = json.dumps({'items': items, 'notes': notes}, sort_keys=True, default=str)
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def claim_batch(self, idempotency_key, request_hash, item_count, user_id):
+        """(batch, claimed); claimed is True when this request should run the batch."""
+        batch, created = DisputeBatch.objects.get_or_create(
+            idempotency_key=idempotency_key,
+            defaults={
+                'request_hash': request_hash,
+                'item_count': item_count,
+                'created_by': user_id,
+                'claimed_on': now(),
+            }
+        )
+        if created:
+            return batch, True
+        if batch.request_hash != request_hash or batch.status == DisputeBatch.STATUS_COMPLETED:
+            return batch, False
+
+        stale_before = now() - timedelta(seconds=getattr(settings, 'DISPUTE_BATCH_STALE_AFTER', 900))
+        claimed = DisputeBatch.objects.filter(
+            Q(claimed_on__isnull=True) | Q(claimed_on__lt=stale_before),
+            pk=batch.pk, status=DisputeBatch.STATUS_PROCESSING
+        ).update(claimed_on=now())
+        return batch, bool(claimed)
+
+    def outcome(self, item, item_status, message):
+        return {**item, 'status': item_status, 'message': message}
+
+    def process_batch(self, items, notes, user_id):
+        outcomes = [None] * len(items)
+        seen = set()
+        pending = []
+        for index, item in enumerate(items):
+            if not all(item.values()):
+                outcomes[index] = self.outcome(item, 'failed', 'admin_id, provider_id and txn_ref are required.')
+                continue
+            key = (item['admin_id'], item['provider_id'], item['txn_ref'])
+            if key in seen:
+                outcomes[index] = self.outcome(item, 'skipped', 'Duplicate of an earlier item.')
+                continue
+            seen.add(key)
+
+            service_table = get_service_table_for_provider(item['provider_id'])
+            if not service_table or not service_table.status_field:
+                outcomes[index] = self.outcome(item, 'failed', 'Unsupported service provider.')
+                continue
+            pending.append((index, service_table))
+
+        directory = defaultdict(list)
+        if pending:
+            entries = TransactionReference.objects.using('default').filter(
+                txn_ref__in={items[index]['txn_ref'] for index, _ in pending},
+                admin_id__in={items[index]['admin_id'] for index, _ in pending},
+            )
+            for entry in entries:
+                directory[(entry.admin_id, entry.service_table, entry.txn_ref)].append(entry)
+
+        groups = defaultdict(list)
+        for index, service_table in pending:
+            item = items[index]
+            matches = directory.get((item['admin_id'], service_table.db_table, item['txn_ref']), [])
+            if len(matches) == 1:
+                db_alias, service_id = matches[0].db_name, matches[0].service_id
+            else:
+                db_alias, service_id = tenant_directory.alias_for_admin(item['admin_id']), None
+            if not db_alias:
+                outcomes[index] = self.outcome(item, 'failed', 'Unknown admin.')
+                continue
+            groups[db_alias].append({'index': index, 'table': service_table, 'service_id': service_id, **item})
+
+        fanned = fan_out(groups.keys(), lambda db_alias: self.reverse_tenant_group(db_alias, groups[db_alias], user_id))
+        for db_alias, group in groups.items():
+            tenant_outcomes = fanned.results.get(db_alias)
+            for item in group:
+                index = item['index']
+                if tenant_outcomes is None:
+                    outcomes[index] = self.outcome(items[index], 'failed', f"Tenant error: {fanned.errors.get(db_alias, 'no result')}")
+                else:
+                    outcomes[index] = self.outcome(items[index], *tenant_outcomes[index])
+
+        reversed_items = [items[index] for index, outcome in enumerate(outcomes) if outcome['status'] == 'reversed']
+        if reversed_items:
+            complaint_q = Q()
+            for item in reversed_items:
+                complaint_q |= Q(admin=item['admin_id'], provider_id=item['provider_id'], txn_ref=item['txn_ref'])
+            Servicedispute.objects.filter(complaint_q).update(
+                admin_notes=notes,
+                updated_on=now(),
+                updated_by_user=user_id
+            )
+
+        return outcomes
+
+    def reverse_tenant_group(self, db_alias, group, user_id):
+        """{item index: (status, message)} for one tenant's items; runs inside its tenant scope."""
+        outcomes = {}
+        by_table = defaultdict(list)
+        for item in group:
+            by_table[item['table'].db_table].append(item)
+
+        eligible = []
+        for table_items in by_table.values():
+            service_table = table_items[0]['table']
+            model = service_table.model
+
+            unresolved = [item for item in table_items if item['service_id'] is None]
+            if unresolved:
+                found = defaultdict(list)
+                rows = model.objects.filter(**{
+                    f"{service_table.ref_field}__in": [item['txn_ref'] for item in unresolved]
+                }).values_list('pk', service_table.ref_field)
+                for pk, txn_ref in rows:
+                    found[txn_ref].append(pk)
+                for item in unresolved:
+                    pks = found.get(item['txn_ref'], [])
+                    if len(pks) == 1:
+                        item['service_id'] = pks[0]
+                    else:
+                        outcomes[item['index']] = ('failed', 'Transaction reference is ambiguous.' if pks else 'Transaction not found.')
+
+            resolved = [item for item in table_items if item['index'] not in outcomes]
+            statuses = dict(model.objects.filter(
+                pk__in=[item['service_id'] for item in resolved]
+            ).values_list('pk', service_table.status_field))
+            for item in resolved:
+                current_status = statuses.get(item['service_id'])
+                if current_status is None:
+                    outcomes[item['index']] = ('failed', 'Transaction not found.')
+                elif current_status == 'REVERSED':
+                    outcomes[item['index']] = ('skipped', 'Already reversed.')
+                elif current_status not in REVERSIBLE_STATUSES:
+                    outcomes[item['index']] = ('failed', 'Transaction status not eligible.')
+                else:
+                    eligible.append(item)
+
+        # A fixed lock order keeps two overlapping batches from deadlocking.
+        eligible.sort(key=lambda item: (item['table'].db_table, item['service_id']))
+        with transaction.atomic(using=db_alias):
+            for item in eligible:
+                try:
+                    reverse_transaction(
+                        item['table'], item['service_id'],
+                        remarks_for=dispute_reversal_remarks,
+                        member_id=1,
+                        govt_charge_filter={'provider_id': item['provider_id'], 'transaction_ref': item['txn_ref']},
+                        performed_by=user_id,
+                    )
+                    outcomes[item['index']] = ('reversed', 'Transaction reversed.')
+                except AlreadyReversed:
+                    outcomes[item['index']] = ('skipped', 'Already reversed.')
+                except Exception as exc:
+                    # reverse_transaction runs in its own savepoint, so only this item is rolled back.
+                    outcomes[item['index']] = ('failed', str(exc))
+
+        return outcomes
@@ -36,8 +36,6 @@ class ServiceChargesManagementView(APIView):
             except (PortalUser.DoesNotExist, Admin.DoesNotExist):
                 return self._bad_request("Admin or associated user not found.")
 
-            client_db = switch_to_database(admin_record.db_name)
-
             providers_qs = self._build_provider_queryset(
                 from_date, to_date, provider_id, svc_id, hsn_id, query_text
             )
@@ -53,7 +51,7 @@ class ServiceChargesManagementView(APIView):
                 }, status=status.HTTP_404_NOT_FOUND)
 
             transformed_data = self._format_providers_with_charges(
-                current_page, admin_record, portal_user, client_db
+                current_page, admin_record, portal_user, admin_record.db_name
             )
 
             response_data = {
@@ -206,8 +204,6 @@ class ServiceChargesManagementView(APIView):
 
         try:
             portal_usr = PortalUser.objects.get(id=admin_id)
-            admin_obj = Admin.objects.get(admin_id=admin_id)
-            client_db = switch_to_database(admin_obj.db_name)
 
             sp_obj = ServiceProvider.objects.get(sp_id=sp_id)
 
@@ -219,40 +215,41 @@ class ServiceChargesManagementView(APIView):
                 charge_category='to_provide'
             ).order_by('minimum')
 
-            ad_sp = AdServiceProvider.objects.using(client_db).filter(
-                system_ref_id=sp_obj.sp_id,
-                self_managed=False
-            ).first()
-
-            if ad_sp:
-                for slab in slabs:
-                    if not Adcharges.objects.using(client_db).filter(
-                        service_provider=ad_sp,
-                        charge_category='to_us',
-                        minimum=slab.minimum,
-                        maximum=slab.maximum
-                    ).exists():
-                        Adcharges.objects.using(client_db).create(
+            with tenant(admin_id):
+                ad_sp = AdServiceProvider.objects.filter(
+                    system_ref_id=sp_obj.sp_id,
+                    self_managed=False
+                ).first()
+
+                if ad_sp:
+                    for slab in slabs:
+                        if not Adcharges.objects.filter(
                             service_provider=ad_sp,
-                            minimum=slab.minimum,
-                            maximum=slab.maximum,
-                            charges_type=slab.charges_type,
-                            rate_type=slab.rate_type,
-                            rate=slab.rate,
                             charge_category='to_us',
-                            created_by=portal_usr
-                        )
-
-                new_status = not ad_sp.sa_provided
-                ad_sp.sa_provided = new_status
-                ad_sp.platform_fee_value = getattr(sp_obj, 'platform_charge', None) or 0
-                ad_sp.platform_fee_mode = getattr(sp_obj, 'charge_type', 'PERCENT')
-                ad_sp.api_credentials = getattr(sp_obj, 'api_credentials', {})
-                ad_sp.save(using=client_db)
-
-                toggle_msg = "Service Provider Activated Successfully." if new_status else "Service Provider Deactivated Successfully."
-            else:
-                toggle_msg = "Service Provider not found in admin configuration or is self-managed."
+                            minimum=slab.minimum,
+                            maximum=slab.maximum
+                        ).exists():
+                            Adcharges.objects.create(
+                                service_provider=ad_sp,
+                                minimum=slab.minimum,
+                                maximum=slab.maximum,
+                                charges_type=slab.charges_type,
+                                rate_type=slab.rate_type,
+                                rate=slab.rate,
+                                charge_category='to_us',
+                                created_by=portal_usr
+                            )
+
+                    new_status = not ad_sp.sa_provided
+                    ad_sp.sa_provided = new_status
+                    ad_sp.platform_fee_value = getattr(sp_obj, 'platform_charge', None) or 0
+                    ad_sp.platform_fee_mode = getattr(sp_obj, 'charge_type', 'PERCENT')
+                    ad_sp.api_credentials = getattr(sp_obj, 'api_credentials', {})
+                    ad_sp.save()
+
+                    toggle_msg = "Service Provider Activated Successfully." if new_status else "Service Provider Deactivated Successfully."
+                else:
+                    toggle_msg = "Service Provider not found in admin configuration or is self-managed."
 
 
             admin_services = AdminService.objects.filter(
@@ -297,9 +294,7 @@ class ServiceChargesManagementView(APIView):
                 return self._bad_request('No "to_provide" charges provided.')
 
             admin_obj = Admin.objects.get(admin_id=admin_id)
-            client_db = switch_to_database(admin_obj.db_name)
             sp_obj = ServiceProvider.objects.get(sp_id=sp_id)
-            admin_user = PortalUser.objects.using(admin_obj.db_name).get(id=1)
 
             admin_svcs = AdminService.objects.filter(admin=admin_obj, service_provider=sp_obj)
             if not admin_svcs.exists():
@@ -326,17 +321,19 @@ class ServiceChargesManagementView(APIView):
                         admin_svc.rate = new_rate_val
                     admin_svc.save()
 
-            ad_sps = AdServiceProvider.objects.using(client_db).filter(sys_id=sp_obj.sys_id, is_self_config=False)
-            if ad_sps.exists():
-                ad_charges = Adcharges.objects.using(client_db).filter(
-                    service_provider__in=ad_sps, created_by=admin_user
-                )
-                for ad_charge in ad_charges:
-                    for incoming in to_provide_slabs:
-                        if ad_charge.minimum == incoming.get('minimum') and ad_charge.maximum == incoming.get('maximum'):
-                            if ad_charge.rate != incoming.get('rate'):
-                                ad_charge.rate = incoming.get('rate')
-                                ad_charge.save()
+            with tenant_alias(admin_obj.db_name):
+                admin_user = PortalUser.objects.get(id=1)
+                ad_sps = AdServiceProvider.objects.filter(sys_id=sp_obj.sys_id, is_self_config=False)
+                if ad_sps.exists():
+                    ad_charges = Adcharges.objects.filter(
+                        service_provider__in=ad_sps, created_by=admin_user
+                    )
+                    for ad_charge in ad_charges:
+                        for incoming in to_provide_slabs:
+                            if ad_charge.minimum == incoming.get('minimum') and ad_charge.maximum == incoming.get('maximum'):
+                                if ad_charge.rate != incoming.get('rate'):
+                                    ad_charge.rate = incoming.get('rate')
+                                    ad_charge.save()
 
             return Response({
                 'status': 'success',
@@ -53,13 +53,14 @@ class GadgetPurchaseAPIView(APIView):
 
             item = GadgetItem.objects.get(item_id=item_id)
             current_user = PortalUser.objects.get(id=request.user.id)
-            user_wallet = PortalUserBalance.objects.get(user=current_user)
 
-            if user_wallet.primary_balance < total_amount:
-                return Response({'status': 'fail', 'message': 'Not enough balance in main wallet.'}, status=status.HTTP_400_BAD_REQUEST)
-
-            with transaction.atomic():
+            with transaction.atomic(), transaction.atomic(using=get_current_tenant() or 'default'):
                 ref_code = f'PUR-{uuid.uuid4().hex[:10].upper()}'
+                try:
+                    wallet_engine.hold(current_user.id, total_amount, "GADGET PURCHASE", f"Hold for purchase {ref_code}")
+                except InsufficientBalance:
+                    return Response({'status': 'fail', 'message': 'Not enough balance in main wallet.'}, status=status.HTTP_400_BAD_REQUEST)
+
                 GadgetPurchase.objects.create(
                     item=item,
                     per_unit_cost=item.cost,
@@ -72,10 +73,6 @@ class GadgetPurchaseAPIView(APIView):
                     initiated_by=request.user.id
                 )
 
-                user_wallet.primary_balance -= total_amount
-                user_wallet.hold_balance += total_amount
-                user_wallet.save()
-
                 HoldTransaction.objects.create(
                     ref_id=ref_code,
                     user=current_user,
@@ -179,20 +176,13 @@ class GadgetPurchaseAPIView(APIView):
                 mobile_number=admin.mobile_number
             )
 
-            wallet = PortalUserBalance.objects.using(admin.db_name).get(
-                user=portal_user
-            )
-
             if (
                 user_role == 'ADMIN'
                 and new_status == 'CANCELLED'
                 and purchase.status == 'PENDING'
             ):
                 refund_amt = Decimal(str(purchase.grand_total))
-
-                wallet.primary_balance += refund_amt
-                wallet.hold_balance -= refund_amt
-                wallet.save(using=admin.db_name)
+                wallet_engine.release(portal_user.id, refund_amt, "GADGET PURCHASE", f"Purchase {purchase.order_ref} cancelled", db_alias=admin.db_name)
 
                 purchase.status = 'CANCELLED'
                 purchase.save()
@@ -210,10 +200,7 @@ class GadgetPurchaseAPIView(APIView):
 
             if new_status == 'REJECTED':
                 refund_amt = Decimal(purchase.remaining_qty) * purchase.per_unit_cost
-
-                wallet.primary_balance += refund_amt
-                wallet.hold_balance -= refund_amt
-                wallet.save(using=admin.db_name)
+                wallet_engine.release(portal_user.id, refund_amt, "GADGET PURCHASE", f"Purchase {purchase.order_ref} rejected", db_alias=admin.db_name)
 
                 purchase.status = 'REJECTED'
                 purchase.save()
@@ -234,13 +221,7 @@ class GadgetPurchaseAPIView(APIView):
                 approve_count = len(serial_list)
                 deduct_amount = purchase.per_unit_cost * approve_count
 
-                if wallet.hold_balance < deduct_amount:
-                    return Response(
-                        {'status': 'fail', 'message': 'Insufficient hold balance.'},
-                        status=status.HTTP_400_BAD_REQUEST
-                    )
-
-                with transaction.atomic():
+                with transaction.atomic(), transaction.atomic(using=admin.db_name):
                     valid_serials = ItemSerial.objects.filter(
                         item=purchase.item,
                         serial_code__in=serial_list,
@@ -254,8 +235,23 @@ class GadgetPurchaseAPIView(APIView):
                             status=status.HTTP_400_BAD_REQUEST
                         )
 
-                    wallet.hold_balance -= deduct_amount
-                    wallet.save(using=admin.db_name)
+                    label = super_admin_action_label(
+                        "Gadget Purchase",
+                        deduct_amount,
+                        purchase.order_ref,
+                        "Admin"
+                    )
+                    try:
+                        wallet_engine.release(
+                            portal_user.id, deduct_amount, 'Debit for Gadget', label,
+                            refund=False, db_alias=admin.db_name
+                        )
+                    except InsufficientBalance:
+                        return Response(
+                            {'status': 'fail', 'message': 'Insufficient hold balance.'},
+                            status=status.HTTP_400_BAD_REQUEST
+                        )
+
                     purchase.item.available_stock -= approve_count
                     purchase.item.save()
 
@@ -307,24 +303,6 @@ class GadgetPurchaseAPIView(APIView):
                     purchase.remaining_qty -= approve_count
                     purchase.save()
 
-                    label = super_admin_action_label(
-                        "Gadget Purchase",
-                        deduct_amount,
-                        purchase.order_ref,
-                        "Admin"
-                    )
-
-                    WalletHistory.objects.using(admin.db_name).create(
-                        user=portal_user,
-                        action_type='Debit for Gadget',
-                        wl_label=label,
-                        effectvie_wallet='primary_balance',
-                        effectvie_amt=deduct_amount,
-                        effective_type='DR',
-                        current_balance=wallet.primary_balance,
-                        wl_trn_dt=timezone.now()
-                    )
-
                 return Response(
                     {'status': 'success', 'message': f'Purchase {purchase.status.lower()} successfully.'},
                     status=status.HTTP_200_OK
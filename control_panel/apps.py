@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class ControlPanelConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'control_panel'
+
+    def ready(self):
+        from control_panel import signals  # noqa: F401
@@ -0,0 +1,35 @@
+import time
+from django.core.management.base import BaseCommand, CommandError
+from utils.database.tenant_connections import register_tenant_database
+from utils.database.tenant_directory import tenant_directory
+from utils.database.txn_directory import TXN_DIRECTORY_CHUNK_SIZE, backfill_tenant
+
+
+class Command(BaseCommand):
+    help = "Load every tenant service transaction into the central txn_ref directory."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', action='append', dest='databases', help="Tenant db_name to backfill (repeatable). Defaults to every active admin.")
+        parser.add_argument('--chunk-size', type=int, default=TXN_DIRECTORY_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        databases = options['databases'] or tenant_directory.aliases()
+        total = 0
+        failed = []
+
+        for db_name in databases:
+            started = time.monotonic()
+            try:
+                register_tenant_database(db_name)
+                count = backfill_tenant(db_name, chunk_size=options['chunk_size'])
+            except Exception as exc:
+                failed.append(db_name)
+                self.stderr.write(self.style.ERROR(f"{db_name}: failed - {exc}"))
+                continue
+
+            total += count
+            self.stdout.write(f"{db_name}: {count} references ({time.monotonic() - started:.2f}s)")
+
+        self.stdout.write(self.style.SUCCESS(f"Backfilled {total} references from {len(databases) - len(failed)}/{len(databases)} tenant databases"))
+        if failed:
+            raise CommandError(f"Failed: {', '.join(failed)}")
@@ -0,0 +1,101 @@
+import statistics
+import threading
+import time
+from decimal import Decimal
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from admin_hub.models import PortalUserBalance, WalletHistory
+from utils.database.tenant_connections import register_tenant_database
+from utils.wallet import engine as wallet_engine
+
+
+BENCHMARK_ACTION = "WALLET BENCHMARK"
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure wallet postings per second with every thread hitting the same wallet row. "
+        "Writes real rows: run it against a staging or scratch tenant database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', required=True, help="Tenant db_name to run against.")
+        parser.add_argument('--user-id', type=int, default=1, help="PortalUser whose wallet is posted to.")
+        parser.add_argument('--threads', type=int, default=16)
+        parser.add_argument('--postings', type=int, default=200, help="Postings per thread (credit/debit pairs).")
+        parser.add_argument('--amount', default='1.00')
+        parser.add_argument('--compare-legacy', action='store_true', help="Also run the old read-modify-write save() pattern.")
+        parser.add_argument('--keep-history', action='store_true', help="Keep the WalletHistory rows the run creates.")
+
+    def handle(self, *args, **options):
+        db_name = options['database']
+        register_tenant_database(db_name)
+        user_id = options['user_id']
+        amount = Decimal(options['amount'])
+        if not PortalUserBalance.objects.using(db_name).filter(user_id=user_id).exists():
+            raise CommandError(f"No wallet for user {user_id} in {db_name}")
+
+        self.run_case("engine", db_name, user_id, amount, options, self.engine_posting)
+        if options['compare_legacy']:
+            self.run_case("legacy save()", db_name, user_id, amount, options, self.legacy_posting)
+
+        if not options['keep_history']:
+            deleted, _ = WalletHistory.objects.using(db_name).filter(action_name=BENCHMARK_ACTION).delete()
+            self.stdout.write(f"Removed {deleted} benchmark history rows")
+
+    def engine_posting(self, db_name, user_id, amount, index):
+        post = wallet_engine.credit if index % 2 == 0 else wallet_engine.debit
+        post(user_id, 'primary_balance', amount, BENCHMARK_ACTION, db_alias=db_name)
+
+    def legacy_posting(self, db_name, user_id, amount, index):
+        wallet = PortalUserBalance.objects.using(db_name).get(user_id=user_id)
+        wallet.primary_balance += amount if index % 2 == 0 else -amount
+        wallet.save(using=db_name)
+
+    def run_case(self, label, db_name, user_id, amount, options, posting):
+        start_balance = PortalUserBalance.objects.using(db_name).get(user_id=user_id).primary_balance
+        latencies, failures = [], []
+        lock = threading.Lock()
+        barrier = threading.Barrier(options['threads'])
+
+        def worker():
+            local_latencies, local_failures = [], 0
+            try:
+                barrier.wait()
+                for index in range(options['postings']):
+                    started = time.perf_counter()
+                    try:
+                        posting(db_name, user_id, amount, index)
+                    except Exception:
+                        local_failures += 1
+                    local_latencies.append(time.perf_counter() - started)
+            finally:
+                connections.close_all()
+                with lock:
+                    latencies.extend(local_latencies)
+                    failures.append(local_failures)
+
+        threads = [threading.Thread(target=worker) for _ in range(options['threads'])]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        total = len(latencies)
+        end_balance = PortalUserBalance.objects.using(db_name).get(user_id=user_id).primary_balance
+        # Every thread posts matching credit/debit pairs, so the balance must not move.
+        drift = end_balance - start_balance
+        latencies.sort()
+        p99 = latencies[min(total - 1, int(total * 0.99))] if total else 0
+
+        self.stdout.write(
+            f"{label}: {total} postings from {options['threads']} threads in {elapsed:.2f}s "
+            f"= {total / elapsed:,.0f} postings/s | p50 {statistics.median(latencies) * 1000:.1f}ms "
+            f"p99 {p99 * 1000:.1f}ms | failed {sum(failures)}"
+        )
+        style = self.style.SUCCESS if drift == 0 else self.style.ERROR
+        self.stdout.write(style(f"{label}: balance drift {drift} (lost or duplicated updates)"))
+        if drift and label != "engine":
+            PortalUserBalance.objects.using(db_name).filter(user_id=user_id).update(primary_balance=start_balance)
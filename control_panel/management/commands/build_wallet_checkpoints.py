@@ -0,0 +1,44 @@
+import time
+from datetime import timedelta
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.timezone import now
+from admin_hub.models import WalletCheckpoint
+from utils.database.tenant_connections import register_tenant_database
+from utils.database.tenant_directory import tenant_directory
+from utils.wallet.checkpoints import CHECKPOINT_CHUNK_SIZE, build_checkpoints, prune_daily_checkpoints
+
+
+class Command(BaseCommand):
+    help = "Add wallet balance checkpoints for every completed period since the last run."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--period', choices=['daily', 'monthly'], default='daily')
+        parser.add_argument('--database', action='append', dest='databases', help="Tenant db_name to process (repeatable). Defaults to every active admin.")
+        parser.add_argument('--chunk-size', type=int, default=CHECKPOINT_CHUNK_SIZE)
+        parser.add_argument('--prune-daily-days', type=int, help="Also drop daily checkpoints older than this many days once a monthly checkpoint covers them.")
+
+    def handle(self, *args, **options):
+        period = WalletCheckpoint.PERIOD_DAILY if options['period'] == 'daily' else WalletCheckpoint.PERIOD_MONTHLY
+        databases = options['databases'] or tenant_directory.aliases()
+        total = 0
+        failed = []
+
+        for db_name in databases:
+            started = time.monotonic()
+            try:
+                register_tenant_database(db_name)
+                count = build_checkpoints(period, db_alias=db_name, chunk_size=options['chunk_size'])
+                pruned = 0
+                if options['prune_daily_days'] is not None:
+                    pruned = prune_daily_checkpoints(now() - timedelta(days=options['prune_daily_days']), db_alias=db_name)
+            except Exception as exc:
+                failed.append(db_name)
+                self.stderr.write(self.style.ERROR(f"{db_name}: failed - {exc}"))
+                continue
+
+            total += count
+            self.stdout.write(f"{db_name}: {count} checkpoints, {pruned} pruned ({time.monotonic() - started:.2f}s)")
+
+        self.stdout.write(self.style.SUCCESS(f"Wrote {total} {options['period']} checkpoints for {len(databases) - len(failed)}/{len(databases)} tenant databases"))
+        if failed:
+            raise CommandError(f"Failed: {', '.join(failed)}")
@@ -0,0 +1,75 @@
+import time
+from datetime import datetime
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.db.models import Max
+from admin_hub.models import WalletCheckpoint, WalletHistory
+from utils.database.partitions import PARTITIONED_TABLES, detach_partitions, ensure_partitions, is_partitioned, month_start
+from utils.database.tenant_connections import register_tenant_database
+from utils.database.tenant_directory import tenant_directory
+
+
+class Command(BaseCommand):
+    help = (
+        "Create upcoming monthly partitions of the wallet history and ledger tables, "
+        "and optionally detach old ones for archiving. Run daily."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', action='append', dest='databases', help="Tenant db_name to process (repeatable). Defaults to every active admin.")
+        parser.add_argument('--months-ahead', type=int, help="Months of partitions to keep ready (defaults to TENANT_PARTITION_MONTHS_AHEAD).")
+        parser.add_argument('--detach-before', help="YYYY-MM: detach partitions that end on or before the start of this month.")
+        parser.add_argument(
+            '--include-legacy', action='store_true',
+            help="Also detach the partition holding all pre-partitioning history. Breaks reconcile_wallets --full "
+                 "and as-of balances before the first checkpoint until it is reattached.",
+        )
+
+    def handle(self, *args, **options):
+        detach_before = None
+        if options['detach_before']:
+            try:
+                detach_before = month_start(datetime.strptime(options['detach_before'], "%Y-%m"))
+            except ValueError:
+                raise CommandError("--detach-before must be YYYY-MM.")
+
+        databases = options['databases'] or tenant_directory.aliases()
+        failed = []
+        for db_name in databases:
+            started = time.monotonic()
+            try:
+                register_tenant_database(db_name)
+                connection = connections[db_name]
+                for table in PARTITIONED_TABLES:
+                    if not is_partitioned(connection, table):
+                        self.stdout.write(self.style.WARNING(f"{db_name}: {table} is not partitioned yet (run migrate_tenants)"))
+                        continue
+                    created = ensure_partitions(connection, table, options['months_ahead'])
+                    detached = []
+                    if detach_before:
+                        before = detach_before
+                        if table == WalletHistory._meta.db_table:
+                            before = self.checkpoint_covered(db_name, before)
+                        if before:
+                            detached = detach_partitions(connection, table, before, options['include_legacy'])
+                    self.stdout.write(f"{db_name}: {table} created {created or 'none'}, detached {detached or 'none'}")
+            except Exception as exc:
+                failed.append(db_name)
+                self.stderr.write(self.style.ERROR(f"{db_name}: failed - {exc}"))
+                continue
+            self.stdout.write(f"{db_name}: done ({time.monotonic() - started:.2f}s)")
+
+        self.stdout.write(self.style.SUCCESS(f"Partitions maintained for {len(databases) - len(failed)}/{len(databases)} tenant databases"))
+        if failed:
+            raise CommandError(f"Failed: {', '.join(failed)}")
+
+    def checkpoint_covered(self, db_name, before):
+        """Wallet history may only leave once checkpoints carry its balances; returns the safe cutoff or None."""
+        covered_until = WalletCheckpoint.objects.using(db_name).aggregate(reached=Max('period_end'))['reached']
+        if covered_until is None:
+            self.stdout.write(self.style.WARNING(f"{db_name}: no wallet checkpoints yet, wallet history not detached"))
+            return None
+        if covered_until < before:
+            self.stdout.write(self.style.WARNING(f"{db_name}: wallet history detached only up to checkpoints ({covered_until:%Y-%m-%d})"))
+            return covered_until
+        return before
@@ -0,0 +1,52 @@
+import time
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from django.db.models import Count
+from control_panel.models import TenantDatabasePool
+from utils.database.tenant_warm_pool import drop_database, fill_warm_pool, get_warm_pool_size, reap_stale_provisioning
+
+
+class Command(BaseCommand):
+    help = "Keep a warm pool of migrated, seeded tenant databases ready for new admins."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--size', type=int, default=None, help="Target number of READY databases (defaults to TENANT_WARM_POOL_SIZE).")
+        parser.add_argument('--interval', type=int, default=0, help="Keep running and top the pool up every N seconds.")
+        parser.add_argument('--prune-failed', action='store_true', help="Drop databases of FAILED slots and remove those slots.")
+
+    def handle(self, *args, **options):
+        target_size = options['size'] if options['size'] is not None else get_warm_pool_size()
+
+        while True:
+            close_old_connections()
+            reaped = reap_stale_provisioning()
+            if reaped:
+                self.stdout.write(self.style.WARNING(f"Failed {reaped} slots stuck in PROVISIONING"))
+            if options['prune_failed']:
+                self.prune_failed()
+
+            created = fill_warm_pool(target_size)
+            for slot in created:
+                style = self.style.SUCCESS if slot.status == TenantDatabasePool.STATUS_READY else self.style.ERROR
+                self.stdout.write(style(f"{slot.db_name}: {slot.status} {slot.error_message or ''}".rstrip()))
+            self.report()
+
+            if not options['interval']:
+                break
+            time.sleep(options['interval'])
+
+    def prune_failed(self):
+        for slot in TenantDatabasePool.objects.filter(status=TenantDatabasePool.STATUS_FAILED):
+            try:
+                drop_database(slot.db_name)
+                slot.delete()
+                self.stdout.write(f"Pruned {slot.db_name}")
+            except Exception as exc:
+                self.stderr.write(f"Could not prune {slot.db_name}: {exc}")
+
+    def report(self):
+        counts = dict(
+            TenantDatabasePool.objects.values_list('status').annotate(total=Count('pool_id')).order_by()
+        )
+        summary = ", ".join(f"{code}={counts.get(code, 0)}" for code, _ in TenantDatabasePool.STATUS_CHOICES)
+        self.stdout.write(f"Warm pool: {summary}")
@@ -0,0 +1,144 @@
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from io import StringIO
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.db.migrations.executor import MigrationExecutor
+from django.db.migrations.loader import MigrationLoader
+from django.utils.timezone import now
+from utils.database.tenant_directory import tenant_directory
+from utils.database.tenant_connections import register_tenant_database
+
+
+def _init_worker():
+    import django
+    django.setup()
+
+
+def _pending_migrations(db_name):
+    executor = MigrationExecutor(connections[db_name])
+    plan = executor.migration_plan(executor.loader.graph.leaf_nodes())
+    return [f"{migration.app_label}.{migration.name}" for migration, _backwards in plan]
+
+
+def run_tenant_job(db_name, dry_run):
+    """Runs in a worker process: plans or applies migrations for one tenant."""
+    started = time.monotonic()
+    result = {"db_name": db_name, "ok": True, "pending": [], "error": None}
+    try:
+        register_tenant_database(db_name)
+        result["pending"] = _pending_migrations(db_name)
+        if not dry_run and result["pending"]:
+            call_command('migrate', database=db_name, interactive=False, verbosity=0, stdout=StringIO())
+    except Exception as exc:
+        result["ok"] = False
+        result["error"] = str(exc)
+    finally:
+        connections.close_all()
+    result["seconds"] = round(time.monotonic() - started, 3)
+    return result
+
+
+class Command(BaseCommand):
+    help = "Apply (or plan) pending migrations on every tenant database in parallel."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', action='append', dest='databases', help="Tenant db_name to migrate (repeatable). Defaults to every active admin.")
+        parser.add_argument('--concurrency', type=int, default=getattr(settings, 'TENANT_MIGRATE_CONCURRENCY', 4))
+        parser.add_argument('--dry-run', action='store_true', help="Only list the pending migrations per tenant.")
+        parser.add_argument('--state-file', default=os.path.join(settings.BASE_DIR, '.migrate_tenants_state.json'))
+        parser.add_argument('--resume', action='store_true', help="Skip tenants the state file records as already migrated.")
+
+    def handle(self, *args, **options):
+        databases = options['databases'] or tenant_directory.aliases()
+        dry_run = options['dry_run']
+        state_path = options['state_file']
+        target = sorted(f"{app}.{name}" for app, name in MigrationLoader(None, ignore_no_migrations=True).graph.leaf_nodes())
+        state = self.load_state(state_path) if options['resume'] else {}
+        if state.get("target") != target:
+            # A new migration set invalidates earlier progress.
+            state = {"target": target, "tenants": {}}
+
+        skipped = [db for db in databases if state["tenants"].get(db, {}).get("status") == "ok"]
+        queue = [db for db in databases if db not in skipped]
+        concurrency = max(1, min(options['concurrency'], len(queue) or 1))
+
+        self.stdout.write(
+            f"{'Planning' if dry_run else 'Migrating'} {len(queue)} tenant databases "
+            f"with {concurrency} workers ({len(skipped)} already done)"
+        )
+
+        # Forked workers must not inherit open sockets from this process.
+        connections.close_all()
+        started = time.monotonic()
+        results = []
+
+        with ProcessPoolExecutor(max_workers=concurrency, initializer=_init_worker) as pool:
+            futures = {pool.submit(run_tenant_job, db_name, dry_run): db_name for db_name in queue}
+            for future in as_completed(futures):
+                db_name = futures[future]
+                try:
+                    result = future.result()
+                except Exception as exc:
+                    result = {"db_name": db_name, "ok": False, "pending": [], "error": str(exc), "seconds": 0}
+                results.append(result)
+                self.report_tenant(result, dry_run)
+
+                if not dry_run:
+                    state["tenants"][db_name] = {
+                        "status": "ok" if result["ok"] else "failed",
+                        "seconds": result["seconds"],
+                        "applied": result["pending"] if result["ok"] else [],
+                        "error": result["error"],
+                        "finished_at": now().isoformat(),
+                    }
+                    self.save_state(state_path, state)
+
+        self.report_summary(results, skipped, time.monotonic() - started, dry_run)
+        failed = [r for r in results if not r["ok"]]
+        if failed:
+            raise CommandError(f"{len(failed)} tenant database(s) failed; rerun with --resume to retry only those.")
+
+    def report_tenant(self, result, dry_run):
+        if not result["ok"]:
+            self.stderr.write(self.style.ERROR(f"{result['db_name']}: FAILED in {result['seconds']}s - {result['error']}"))
+        elif dry_run:
+            pending = ", ".join(result["pending"]) or "up to date"
+            self.stdout.write(f"{result['db_name']}: {pending}")
+        else:
+            self.stdout.write(self.style.SUCCESS(
+                f"{result['db_name']}: applied {len(result['pending'])} in {result['seconds']}s"
+            ))
+
+    def report_summary(self, results, skipped, elapsed, dry_run):
+        ok = [r for r in results if r["ok"]]
+        failed = [r for r in results if not r["ok"]]
+        self.stdout.write("")
+        self.stdout.write(
+            f"Summary: {len(ok)} ok, {len(failed)} failed, {len(skipped)} skipped in {elapsed:.1f}s"
+        )
+        if dry_run:
+            behind = [r for r in ok if r["pending"]]
+            self.stdout.write(f"  {len(behind)} tenant(s) have pending migrations")
+        slowest = sorted(ok, key=lambda r: r["seconds"], reverse=True)[:5]
+        for r in slowest:
+            self.stdout.write(f"  slowest: {r['db_name']} {r['seconds']}s")
+        for r in failed:
+            self.stdout.write(f"  failed: {r['db_name']} - {r['error']}")
+
+    def load_state(self, path):
+        try:
+            with open(path) as fh:
+                return json.load(fh)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def save_state(self, path, state):
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as fh:
+            json.dump(state, fh, indent=2)
+        os.replace(tmp_path, path)
@@ -0,0 +1,136 @@
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from decimal import Decimal, InvalidOperation
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from utils.database.tenant_connections import register_tenant_database
+from utils.database.tenant_directory import tenant_directory
+from utils.wallet.reconcile import RECONCILE_BATCH_SIZE, RECONCILE_TOLERANCE, reconcile_tenant
+
+
+def _init_worker():
+    import django
+    django.setup()
+
+
+def run_tenant_job(db_name, use_checkpoints, tolerance, batch_size, max_mismatches):
+    """Runs in a worker process: reconciles one tenant's wallets against history."""
+    started = time.monotonic()
+    result = {"db_name": db_name, "ok": True, "checked": 0, "mismatch_count": 0, "drift": "0", "mismatches": [], "error": None}
+    try:
+        register_tenant_database(db_name)
+        checked, mismatches = reconcile_tenant(db_name, use_checkpoints, Decimal(tolerance), batch_size)
+        result["checked"] = checked
+        result["mismatch_count"] = len(mismatches)
+        result["drift"] = str(sum(((actual or 0) - wanted for _, _, wanted, actual in mismatches), Decimal('0')))
+        result["mismatches"] = [
+            {"user_id": user_id, "wallet": field, "expected": str(wanted), "actual": None if actual is None else str(actual)}
+            for user_id, field, wanted, actual in mismatches[:max_mismatches]
+        ]
+    except Exception as exc:
+        result["ok"] = False
+        result["error"] = str(exc)
+    finally:
+        connections.close_all()
+    result["seconds"] = round(time.monotonic() - started, 3)
+    return result
+
+
+class Command(BaseCommand):
+    help = "Check every tenant's wallet balances against the sum of their wallet history, tenants in parallel."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', action='append', dest='databases', help="Tenant db_name to check (repeatable). Defaults to every active admin.")
+        parser.add_argument(
+            '--workers', '--concurrency', dest='workers', type=int,
+            default=getattr(settings, 'TENANT_RECONCILE_WORKERS', 4),
+            help="Worker processes (defaults to TENANT_RECONCILE_WORKERS).",
+        )
+        parser.add_argument('--full', action='store_true', help="Sum the whole history instead of starting from wallet checkpoints.")
+        parser.add_argument('--tolerance', default=str(RECONCILE_TOLERANCE), help="Largest difference not reported, e.g. 0.01.")
+        parser.add_argument('--batch-size', type=int, default=RECONCILE_BATCH_SIZE)
+        parser.add_argument('--max-mismatches', type=int, default=1000, help="Mismatches kept per tenant in the report.")
+        parser.add_argument('--output', help="Write the full JSON report to this path.")
+        parser.add_argument('--fail-on-mismatch', action='store_true', help="Exit non-zero when any wallet drifts.")
+
+    def handle(self, *args, **options):
+        try:
+            tolerance = Decimal(options['tolerance'])
+        except InvalidOperation:
+            raise CommandError("--tolerance must be a number.")
+        if not tolerance.is_finite() or tolerance < 0:
+            raise CommandError("--tolerance must be zero or more.")
+        for option in ('workers', 'batch_size'):
+            if options[option] < 1:
+                raise CommandError(f"--{option.replace('_', '-')} must be at least 1.")
+
+        databases = options['databases'] or tenant_directory.aliases()
+        concurrency = min(options['workers'], len(databases) or 1)
+        self.stdout.write(f"Reconciling {len(databases)} tenant databases with {concurrency} workers")
+
+        # Forked workers must not inherit open sockets from this process.
+        connections.close_all()
+        started = time.monotonic()
+        results = []
+
+        with ProcessPoolExecutor(max_workers=concurrency, initializer=_init_worker) as pool:
+            futures = {
+                pool.submit(
+                    run_tenant_job, db_name, not options['full'], str(tolerance),
+                    options['batch_size'], options['max_mismatches']
+                ): db_name
+                for db_name in databases
+            }
+            for future in as_completed(futures):
+                db_name = futures[future]
+                try:
+                    result = future.result()
+                except Exception as exc:
+                    result = {"db_name": db_name, "ok": False, "checked": 0, "mismatch_count": 0, "drift": "0", "mismatches": [], "error": str(exc), "seconds": 0}
+                results.append(result)
+                self.report_tenant(result)
+
+        elapsed = time.monotonic() - started
+        self.report_summary(results, elapsed)
+        if options['output']:
+            with open(options['output'], 'w') as fh:
+                json.dump({"seconds": round(elapsed, 3), "tenants": sorted(results, key=lambda r: r["db_name"])}, fh, indent=2)
+            self.stdout.write(f"Report written to {options['output']}")
+
+        failed = [r for r in results if not r["ok"]]
+        if failed:
+            raise CommandError(f"{len(failed)} tenant database(s) could not be reconciled.")
+        if options['fail_on_mismatch'] and any(r["mismatch_count"] for r in results):
+            raise CommandError("Wallet balances drifted from their history.")
+
+    def report_tenant(self, result):
+        if not result["ok"]:
+            self.stderr.write(self.style.ERROR(f"{result['db_name']}: FAILED in {result['seconds']}s - {result['error']}"))
+        elif result["mismatch_count"]:
+            self.stdout.write(self.style.WARNING(
+                f"{result['db_name']}: {result['mismatch_count']} of {result['checked']} wallets drifted "
+                f"(net {result['drift']}) in {result['seconds']}s"
+            ))
+            for mismatch in result["mismatches"][:5]:
+                self.stdout.write(
+                    f"  user {mismatch['user_id']} {mismatch['wallet']}: "
+                    f"expected {mismatch['expected']}, actual {mismatch['actual'] or 'no wallet row'}"
+                )
+        else:
+            self.stdout.write(self.style.SUCCESS(f"{result['db_name']}: {result['checked']} wallets ok in {result['seconds']}s"))
+
+    def report_summary(self, results, elapsed):
+        ok = [r for r in results if r["ok"]]
+        drifted = [r for r in ok if r["mismatch_count"]]
+        failed = [r for r in results if not r["ok"]]
+        self.stdout.write("")
+        self.stdout.write(
+            f"Summary: {len(ok) - len(drifted)} clean, {len(drifted)} drifted, {len(failed)} failed in {elapsed:.1f}s; "
+            f"{sum(r['checked'] for r in ok)} wallets checked, {sum(r['mismatch_count'] for r in ok)} mismatches"
+        )
+        for r in sorted(ok, key=lambda r: r["seconds"], reverse=True)[:5]:
+            self.stdout.write(f"  slowest: {r['db_name']} {r['seconds']}s")
+        for r in failed:
+            self.stdout.write(f"  failed: {r['db_name']} - {r['error']}")
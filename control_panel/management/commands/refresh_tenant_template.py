@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand, CommandError
+from utils.database.tenant_provisioning import get_template_database_name, refresh_template_database
+
+
+class Command(BaseCommand):
+    help = "Migrate and seed the tenant template database used to clone new admin databases."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--template', default=None, help="Template database name (defaults to TENANT_TEMPLATE_DATABASE).")
+
+    def handle(self, *args, **options):
+        template_name = options['template'] or get_template_database_name()
+        ok, message = refresh_template_database(template_name)
+        if not ok:
+            raise CommandError(message)
+        self.stdout.write(self.style.SUCCESS(f"{template_name}: {message}"))
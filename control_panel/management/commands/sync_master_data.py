@@ -0,0 +1,43 @@
+import time
+from django.core.management.base import BaseCommand, CommandError
+from control_panel.master_data import MASTER_DATA_CHUNK_SIZE, load_master_data_source, sync_master_data
+from utils.database.tenant_directory import tenant_directory
+from utils.database.tenant_connections import register_tenant_database
+
+
+class Command(BaseCommand):
+    help = "Push master data (regions, locations, biller groups, operators, hierarchy levels) to tenant databases."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', action='append', dest='databases', help="Tenant db_name to sync (repeatable). Defaults to every active admin.")
+        parser.add_argument('--chunk-size', type=int, default=MASTER_DATA_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        databases = options['databases'] or tenant_directory.aliases()
+        source = load_master_data_source()
+        totals = {}
+        failed = []
+
+        for db_name in databases:
+            started = time.monotonic()
+            try:
+                register_tenant_database(db_name)
+                counts = sync_master_data(db_name, source=source, chunk_size=options['chunk_size'])
+            except Exception as exc:
+                failed.append(db_name)
+                self.stderr.write(self.style.ERROR(f"{db_name}: failed - {exc}"))
+                continue
+
+            for table, table_counts in counts.items():
+                bucket = totals.setdefault(table, {})
+                for key, value in table_counts.items():
+                    bucket[key] = bucket.get(key, 0) + value
+
+            changes = ", ".join(f"{table} +{c['created']} ~{c['updated']}" for table, c in counts.items())
+            self.stdout.write(f"{db_name}: {changes} ({time.monotonic() - started:.2f}s)")
+
+        self.stdout.write(self.style.SUCCESS(f"Synced {len(databases) - len(failed)}/{len(databases)} tenant databases"))
+        for table, table_counts in totals.items():
+            self.stdout.write(f"  {table}: " + ", ".join(f"{key}={value}" for key, value in table_counts.items()))
+        if failed:
+            raise CommandError(f"Failed: {', '.join(failed)}")
@@ -1,78 +1,192 @@
+from django.core.management.color import no_style
+from django.db import connections, transaction
 from admin_hub.models import*
 from control_panel.models import *
 
-def master_data(db_name):
-    default_regions = Region.objects.using('default').all()
-    for reg in default_regions:
-        Region.objects.using(db_name).update_or_create(
-            region_id=reg.region_id, 
-            defaults={
-                'region_name': reg.region_name,
-                'short_code': reg.short_code or '',
-                'status': reg.status,
-                'added_by': reg.added_by,
-                'modified_by': reg.modified_by,
-            }
+MASTER_DATA_CHUNK_SIZE = 1000
+
+HIERARCHY_LEVELS = [
+    {"title": "SUPER DISTRIBUTOR", "code": "SD", "parent": None, "active": True},
+    {"title": "MASTER DISTRIBUTOR", "code": "MD", "parent": 1, "active": True},
+    {"title": "DISTRIBUTOR", "code": "DT", "parent": 2, "active": False},
+]
+
+
+def _chunks(rows, size):
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+
+def _attnames(model, field_names):
+    return [model._meta.get_field(name).attname for name in field_names]
+
+
+def _bulk_upsert(model, db_name, rows, key_field, update_fields, chunk_size):
+    """
+    Diffs rows against the target by key_field and writes only new or changed
+    rows with INSERT ... ON CONFLICT (key_field) DO UPDATE, chunk_size at a time.
+    """
+    compare_fields = _attnames(model, update_fields)
+    existing = {
+        current[key_field]: current
+        for current in model.objects.using(db_name).values(key_field, *compare_fields)
+    }
+
+    counts = {"created": 0, "updated": 0, "unchanged": 0}
+    pending = []
+    for obj in rows:
+        current = existing.get(getattr(obj, key_field))
+        if current is None:
+            counts["created"] += 1
+        elif any(current[name] != getattr(obj, name) for name in compare_fields):
+            counts["updated"] += 1
+        else:
+            counts["unchanged"] += 1
+            continue
+        pending.append(obj)
+
+    for chunk in _chunks(pending, chunk_size):
+        model.objects.using(db_name).bulk_create(
+            chunk,
+            update_conflicts=True,
+            unique_fields=[key_field],
+            update_fields=update_fields,
         )
+    return counts
 
 
-    default_locations = Location.objects.using('default').all()
-    for loc in default_locations:
-        try:
-            tenant_region = Region.objects.using(db_name).get(region_id=loc.region_id)
-        except Region.DoesNotExist:
-            print(f"Warning: Region ID {loc.region_id} not found for location {loc.city_name}. Skipping.")
+def _bulk_insert_missing(model, db_name, rows, key_fields, chunk_size):
+    """
+    Insert-only sync for tables without a unique key; rows already present
+    (matched on key_fields) keep their tenant-side state.
+    """
+    existing = set(model.objects.using(db_name).values_list(*key_fields))
+    pending = []
+    for obj in rows:
+        key = tuple(getattr(obj, name) for name in key_fields)
+        if key in existing:
             continue
+        existing.add(key)
+        pending.append(obj)
+
+    for chunk in _chunks(pending, chunk_size):
+        model.objects.using(db_name).bulk_create(chunk)
+    return {"created": len(pending), "updated": 0, "unchanged": len(rows) - len(pending)}
+
 
-        Location.objects.using(db_name).update_or_create(
-            locality_id=loc.locality_id,  
-            defaults={
-                'region': tenant_region,           
-                'city_name': loc.city_name,
-                'active': loc.active,
-                'created_by': loc.created_by,
-                'updated_by': loc.updated_by,
-            }
+def _reset_sequences(db_name, models_list):
+    # Regions and locations are copied with their default-DB primary keys.
+    connection = connections[db_name]
+    statements = connection.ops.sequence_reset_sql(no_style(), models_list)
+    with connection.cursor() as cursor:
+        for statement in statements:
+            cursor.execute(statement)
+
+
+def load_master_data_source():
+    """
+    Reads every master-data row from the default database once so the same
+    snapshot can be pushed to any number of tenants.
+    """
+    return {
+        "regions": list(Region.objects.using('default').all()),
+        "locations": list(Location.objects.using('default').all()),
+        "biller_groups": list(SaBillerGroup.objects.using('default').filter(is_deleted=False).values_list('name', flat=True)),
+        "operators": list(
+            SaGlobalOperator.objects.using('default').filter(is_deleted=False).values_list('name', 'code', 'operator_type')
+        ),
+    }
+
+
+def sync_master_data(db_name, source=None, chunk_size=MASTER_DATA_CHUNK_SIZE):
+    source = source or load_master_data_source()
+    counts = {}
+
+    with transaction.atomic(using=db_name):
+        region_rows = [
+            Region(
+                region_id=reg.region_id,
+                region_name=reg.region_name,
+                short_code=reg.short_code or '',
+                status=reg.status,
+                added_by=reg.added_by,
+                modified_by=reg.modified_by,
+            )
+            for reg in source["regions"]
+        ]
+        counts["regions"] = _bulk_upsert(
+            Region, db_name, region_rows, 'region_id',
+            ['region_name', 'short_code', 'status', 'added_by', 'modified_by'], chunk_size
         )
 
-    for old_cat in SaBillerGroup.objects.filter(is_deleted=False):
-        BillerGroup.objects.using(db_name).get_or_create(
-            name=old_cat.ss_name,
-            defaults={'is_active': False}
+        tenant_region_ids = set(Region.objects.using(db_name).values_list('region_id', flat=True))
+        location_rows = []
+        skipped_locations = 0
+        for loc in source["locations"]:
+            if loc.region_id not in tenant_region_ids:
+                print(f"Warning: Region ID {loc.region_id} not found for location {loc.city_name}. Skipping.")
+                skipped_locations += 1
+                continue
+            location_rows.append(Location(
+                locality_id=loc.locality_id,
+                region_id=loc.region_id,
+                city_name=loc.city_name,
+                active=loc.active,
+                created_by=loc.created_by,
+                updated_by=loc.updated_by,
+            ))
+        counts["locations"] = _bulk_upsert(
+            Location, db_name, location_rows, 'locality_id',
+            ['region', 'city_name', 'active', 'created_by', 'updated_by'], chunk_size
         )
+        counts["locations"]["skipped"] = skipped_locations
+
+        if counts["regions"]["created"] or counts["locations"]["created"]:
+            _reset_sequences(db_name, [Region, Location])
 
-    for old_op in SaGlobalOperator.objects.filter(is_deleted=False):
-        OperatorList.objects.using(db_name).get_or_create(
-            operator_name=old_op.ss_name,
-            op_code=old_op.operator_code,
-            defaults={
-                'operator_type': old_op.operator_type,
-                'is_active': False
-            }
+        counts["biller_groups"] = _bulk_insert_missing(
+            BillerGroup, db_name,
+            [BillerGroup(name=name, is_active=False) for name in source["biller_groups"]],
+            ['name'], chunk_size
         )
 
-    levels = [
-        {"title": "SUPER DISTRIBUTOR", "code": "SD", "parent": None, "active": True},
-        {"title": "MASTER DISTRIBUTOR", "code": "MD", "parent": 1, "active": True},
-        {"title": "DISTRIBUTOR", "code": "DT", "parent": 2, "active": False},
-    ]
-
-    for item in levels:
-        HierarchyLevel.objects.using(db_name).update_or_create(
-            title=item["title"],
-            defaults={
-                "description": item["title"],
-                "prefix": item["code"],
-                "parent_id": item["parent"],
-                "is_active": item["active"]
-            }
+        counts["operators"] = _bulk_insert_missing(
+            OperatorList, db_name,
+            [
+                OperatorList(operator_name=name, op_code=code, operator_type=operator_type, is_active=False)
+                for name, code, operator_type in source["operators"]
+            ],
+            ['operator_name', 'op_code'], chunk_size
         )
 
-    default_charges = ['instant_transfer_fee', 'bank_transfer_fee']
-    for charge_name in default_charges:
-        SaOperatorCharge.objects.get_or_create(
-            name=charge_name,
-            defaults={'is_active': True}
+        counts["hierarchy_levels"] = _bulk_upsert(
+            HierarchyLevel, db_name,
+            [
+                HierarchyLevel(
+                    title=item["title"],
+                    description=item["title"],
+                    prefix=item["code"],
+                    parent_id=item["parent"],
+                    is_active=item["active"],
+                )
+                for item in HIERARCHY_LEVELS
+            ],
+            'title', ['description', 'prefix', 'parent', 'is_active'], chunk_size
         )
 
-    print(f"Master data (Regions + Locations + Others) successfully synced to database: {db_name}")
\ No newline at end of file
+    return counts
+
+
+def master_data(db_name):
+    counts = sync_master_data(db_name)
+
+    default_charges = ['instant_transfer_fee', 'bank_transfer_fee']
+    existing_charges = set(SaOperatorCharge.objects.filter(name__in=default_charges).values_list('name', flat=True))
+    SaOperatorCharge.objects.bulk_create([
+        SaOperatorCharge(name=charge_name, is_active=True)
+        for charge_name in default_charges if charge_name not in existing_charges
+    ])
+
+    summary = ", ".join(f"{table}: +{c['created']} ~{c['updated']}" for table, c in counts.items())
+    print(f"Master data (Regions + Locations + Others) successfully synced to database: {db_name} ({summary})")
+    return counts
@@ -0,0 +1,28 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('control_panel', '0007_smtpemail_otp_expires_at_smtpemail_verify_otp'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TenantDatabasePool',
+            fields=[
+                ('pool_id', models.AutoField(primary_key=True, serialize=False)),
+                ('db_name', models.CharField(max_length=100, unique=True)),
+                ('status', models.CharField(choices=[('PROVISIONING', 'Provisioning'), ('READY', 'Ready'), ('CLAIMED', 'Claimed'), ('FAILED', 'Failed')], db_index=True, default='PROVISIONING', max_length=20)),
+                ('claimed_as', models.CharField(blank=True, max_length=100, null=True)),
+                ('error_message', models.TextField(blank=True, null=True)),
+                ('created_on', models.DateTimeField(auto_now_add=True)),
+                ('ready_on', models.DateTimeField(blank=True, null=True)),
+                ('claimed_on', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'tenant_database_pool',
+                'ordering': ['pool_id'],
+            },
+        ),
+    ]
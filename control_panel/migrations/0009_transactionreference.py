@@ -0,0 +1,31 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('control_panel', '0008_tenantdatabasepool'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TransactionReference',
+            fields=[
+                ('entry_id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('txn_ref', models.CharField(db_index=True, max_length=150)),
+                ('admin_id', models.IntegerField()),
+                ('db_name', models.CharField(max_length=100)),
+                ('service_table', models.CharField(max_length=100)),
+                ('service_id', models.IntegerField()),
+                ('provider_id', models.IntegerField(blank=True, null=True)),
+                ('txn_amount', models.DecimalField(blank=True, decimal_places=2, max_digits=15, null=True)),
+                ('txn_status', models.CharField(blank=True, max_length=100, null=True)),
+                ('created_at', models.DateTimeField(blank=True, null=True)),
+                ('synced_on', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'txn_reference_directory',
+                'unique_together': {('admin_id', 'service_table', 'service_id')},
+            },
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.9 on 2026-10-18 07:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('control_panel', '0009_transactionreference'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DisputeBatch',
+            fields=[
+                ('batch_id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('idempotency_key', models.CharField(max_length=128, unique=True)),
+                ('request_hash', models.CharField(max_length=64)),
+                ('status', models.CharField(choices=[('PROCESSING', 'Processing'), ('COMPLETED', 'Completed')], default='PROCESSING', max_length=20)),
+                ('item_count', models.PositiveIntegerField(default=0)),
+                ('results', models.JSONField(blank=True, null=True)),
+                ('created_by', models.IntegerField(blank=True, null=True)),
+                ('created_on', models.DateTimeField(auto_now_add=True)),
+                ('claimed_on', models.DateTimeField(blank=True, null=True)),
+                ('completed_on', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'sa_dispute_batch',
+                'ordering': ['-created_on'],
+            },
+        ),
+    ]
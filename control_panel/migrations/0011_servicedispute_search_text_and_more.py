@@ -0,0 +1,59 @@
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Concat
+
+
+def backfill_search_text(apps, schema_editor):
+    Servicedispute = apps.get_model('control_panel', 'Servicedispute')
+    Admin = apps.get_model('control_panel', 'Admin')
+    ServiceProvider = apps.get_model('control_panel', 'ServiceProvider')
+    db_alias = schema_editor.connection.alias
+
+    admin_name = Admin.objects.using(db_alias).filter(admin_id=OuterRef('admin')).values('name')[:1]
+    provider_label = ServiceProvider.objects.using(db_alias).filter(sp_id=OuterRef('provider_id')).values('display_label')[:1]
+    Servicedispute.objects.using(db_alias).update(search_text=Concat(
+        Coalesce(Subquery(admin_name), Value('')), Value(' '),
+        Coalesce(Subquery(provider_label), Value('')), Value(' '),
+        Coalesce('txn_ref', Value('')),
+        output_field=models.TextField(),
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('control_panel', '0010_disputebatch'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name='servicedispute',
+            name='search_text',
+            field=models.TextField(blank=True, default=''),
+        ),
+        migrations.RunPython(backfill_search_text, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='admin',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('name'), name='gin_trgm_ops'), name='admin_name_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='admin',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('email'), name='gin_trgm_ops'), name='admin_email_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='admin',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('company_title'), name='gin_trgm_ops'), name='admin_company_trgm'),
+        ),
+        migrations.AddIndex(
+            model_name='servicedispute',
+            index=models.Index(fields=['admin'], name='sa_service__admin_f23dca_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='servicedispute',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('search_text'), name='gin_trgm_ops'), name='complaint_search_trgm'),
+        ),
+    ]
@@ -1,4 +1,6 @@
 from django.db import models
+from django.db.models.functions import Upper
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.core.validators import RegexValidator
 from web_portal.models import*
 
@@ -132,11 +134,18 @@ class Servicedispute(models.Model):
     created_by_user = models.IntegerField(null=True, blank=True)           
     updated_on = models.DateTimeField(null=True, blank=True)               
     updated_by_user = models.IntegerField(null=True, blank=True)            
+    # Admin name, provider label and txn_ref; kept current by control_panel.signals.
+    search_text = models.TextField(blank=True, default='')
 
     class Meta:
         db_table = 'sa_service_complaint'         
         app_label = 'control_panel'               
         ordering = ['-created_on']
+        indexes = [
+            models.Index(fields=['admin']),
+            # icontains compiles to UPPER(col) LIKE, so the trigram index is on UPPER(col).
+            GinIndex(OpClass(Upper('search_text'), name='gin_trgm_ops'), name='complaint_search_trgm'),
+        ]
 
     def __str__(self):
         return f"Complaint {self.complaint_id} - {self.txn_ref or 'N/A'}"
@@ -311,6 +320,11 @@ class Admin(models.Model):
 
     class Meta:
         db_table = 'admin'
+        indexes = [
+            GinIndex(OpClass(Upper('name'), name='gin_trgm_ops'), name='admin_name_trgm'),
+            GinIndex(OpClass(Upper('email'), name='gin_trgm_ops'), name='admin_email_trgm'),
+            GinIndex(OpClass(Upper('company_title'), name='gin_trgm_ops'), name='admin_company_trgm'),
+        ]
         
   
 
@@ -785,4 +799,84 @@ class GadgetPurchase(models.Model):
         app_label = 'control_panel'
 
     def __str__(self):
-        return self.order_ref
\ No newline at end of file
+        return self.order_ref
+
+
+class TenantDatabasePool(models.Model):
+    STATUS_PROVISIONING = 'PROVISIONING'
+    STATUS_READY = 'READY'
+    STATUS_CLAIMED = 'CLAIMED'
+    STATUS_FAILED = 'FAILED'
+    STATUS_CHOICES = [
+        (STATUS_PROVISIONING, 'Provisioning'),
+        (STATUS_READY, 'Ready'),
+        (STATUS_CLAIMED, 'Claimed'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
+    pool_id = models.AutoField(primary_key=True)
+    db_name = models.CharField(max_length=100, unique=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PROVISIONING, db_index=True)
+    claimed_as = models.CharField(max_length=100, null=True, blank=True)
+    error_message = models.TextField(null=True, blank=True)
+    created_on = models.DateTimeField(auto_now_add=True)
+    ready_on = models.DateTimeField(null=True, blank=True)
+    claimed_on = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'tenant_database_pool'
+        app_label = 'control_panel'
+        ordering = ['pool_id']
+
+    def __str__(self):
+        return f"{self.db_name} ({self.status})"
+
+
+class TransactionReference(models.Model):
+    entry_id = models.BigAutoField(primary_key=True)
+    txn_ref = models.CharField(max_length=150, db_index=True)
+    admin_id = models.IntegerField()
+    db_name = models.CharField(max_length=100)
+    service_table = models.CharField(max_length=100)
+    service_id = models.IntegerField()
+    provider_id = models.IntegerField(null=True, blank=True)
+    txn_amount = models.DecimalField(max_digits=15, decimal_places=2, null=True, blank=True)
+    txn_status = models.CharField(max_length=100, null=True, blank=True)
+    created_at = models.DateTimeField(null=True, blank=True)
+    synced_on = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'txn_reference_directory'
+        app_label = 'control_panel'
+        unique_together = ('admin_id', 'service_table', 'service_id')
+
+    def __str__(self):
+        return f"{self.txn_ref} -> {self.db_name}.{self.service_table}#{self.service_id}"
+
+
+class DisputeBatch(models.Model):
+    STATUS_PROCESSING = 'PROCESSING'
+    STATUS_COMPLETED = 'COMPLETED'
+    STATUS_CHOICES = [
+        (STATUS_PROCESSING, 'Processing'),
+        (STATUS_COMPLETED, 'Completed'),
+    ]
+
+    batch_id = models.BigAutoField(primary_key=True)
+    idempotency_key = models.CharField(max_length=128, unique=True)
+    request_hash = models.CharField(max_length=64)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PROCESSING)
+    item_count = models.PositiveIntegerField(default=0)
+    results = models.JSONField(null=True, blank=True)
+    created_by = models.IntegerField(null=True, blank=True)
+    created_on = models.DateTimeField(auto_now_add=True)
+    claimed_on = models.DateTimeField(null=True, blank=True)
+    completed_on = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'sa_dispute_batch'
+        app_label = 'control_panel'
+        ordering = ['-created_on']
+
+    def __str__(self):
+        return f"Dispute batch {self.idempotency_key} ({self.status})"
@@ -517,7 +517,7 @@ class CitySerializer(serializers.ModelSerializer):
 class DisputeRecordSerializer(serializers.ModelSerializer):
     class Meta:
         model = Servicedispute
-        fields = '__all__'   
+        exclude = ['search_text']
 
 
 class FundRequestSerializer(serializers.ModelSerializer):
@@ -0,0 +1,69 @@
+from django.db.models.signals import post_save, post_delete, pre_save
+from django.dispatch import receiver
+from admin_hub.models import Adcharges, AdServiceProvider
+from control_panel.models import Admin, GSTCode, ServiceProvider, SaCoreService, Servicedispute
+from utils.database.charge_slabs import charge_slabs
+from utils.database.provider_catalogue import provider_catalogue
+from utils.database.search import DISPUTE_SEARCH_SOURCES, refresh_dispute_search
+from utils.database.service_tables import SERVICE_TABLES
+from utils.database.tenant_directory import tenant_directory
+from utils.database.txn_directory import record_on_commit
+
+
+@receiver([post_save, post_delete], sender=Admin)
+def refresh_tenant_directory(sender, **kwargs):
+    tenant_directory.invalidate()
+
+
+@receiver([post_save, post_delete], sender=ServiceProvider)
+@receiver([post_save, post_delete], sender=SaCoreService)
+def refresh_system_providers(sender, **kwargs):
+    provider_catalogue.invalidate()
+
+
+@receiver([post_save, post_delete], sender=AdServiceProvider)
+def refresh_tenant_providers(sender, using=None, **kwargs):
+    provider_catalogue.invalidate(using)
+    charge_slabs.invalidate(using)
+
+
+@receiver([post_save, post_delete], sender=Adcharges)
+def refresh_charge_slabs(sender, using=None, **kwargs):
+    charge_slabs.invalidate(using)
+
+
+@receiver([post_save, post_delete], sender=GSTCode)
+def refresh_charge_slab_gst_rates(sender, **kwargs):
+    # GSTCode is saved on 'default' but every tenant snapshot carries its rates.
+    charge_slabs.invalidate()
+
+
+@receiver(post_save, sender=Servicedispute)
+def refresh_complaint_search(sender, instance, update_fields=None, **kwargs):
+    if update_fields is None or DISPUTE_SEARCH_SOURCES & set(update_fields):
+        refresh_dispute_search(pk=instance.pk)
+
+
+@receiver(pre_save, sender=Admin)
+@receiver(pre_save, sender=ServiceProvider)
+def remember_search_label(sender, instance, **kwargs):
+    field = 'name' if sender is Admin else 'display_label'
+    instance._previous_search_label = (
+        sender.objects.filter(pk=instance.pk).values_list(field, flat=True).first() if instance.pk else None
+    )
+
+
+@receiver(post_save, sender=Admin)
+def refresh_admin_complaint_search(sender, instance, created, **kwargs):
+    if not created and getattr(instance, '_previous_search_label', None) != instance.name:
+        refresh_dispute_search(admin=instance.pk)
+
+
+@receiver(post_save, sender=ServiceProvider)
+def refresh_provider_complaint_search(sender, instance, created, **kwargs):
+    if not created and getattr(instance, '_previous_search_label', None) != instance.display_label:
+        refresh_dispute_search(provider_id=instance.pk)
+
+
+for service_table in SERVICE_TABLES.values():
+    post_save.connect(record_on_commit, sender=service_table.model, dispatch_uid=f"txn_directory_{service_table.db_table}")
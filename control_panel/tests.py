@@ -1,3 +1,174 @@
-from django.test import TestCase
+import time
+from datetime import datetime, timezone
+from decimal import Decimal
+from unittest import mock
+from django.db.models import Q
+from django.test import SimpleTestCase
+from control_panel.APIs.Admin_Transaction import admin_dispute
+from utils.database.provider_catalogue import ProviderCatalogue, ProviderInfo
+from utils.database.tenant_merge import (
+    InvalidCursor, cursor_value, decode_cursor, encode_cursor, keyset_after, merge_tenant_rows,
+)
 
-# Create your tests here.
+
+class ReportCursorTests(SimpleTestCase):
+    def test_cursor_round_trips(self):
+        payload = {"q": "abc123", "v": "2024-05-01T10:00:00+00:00", "t": "tenant_a", "i": 42, "n": 20, "total": 95}
+        token = encode_cursor(payload)
+        self.assertNotIn("=", token)
+        self.assertEqual(decode_cursor(token), payload)
+
+    def test_garbage_cursor_is_rejected(self):
+        for token in ("not-a-cursor!", encode_cursor([1, 2])[:-2], ""):
+            with self.assertRaises(InvalidCursor):
+                decode_cursor(token)
+
+    def test_non_object_cursor_is_rejected(self):
+        with self.assertRaises(InvalidCursor):
+            decode_cursor(encode_cursor(["q", "v"]))
+
+    def test_cursor_value_restores_the_column_type(self):
+        self.assertEqual(
+            cursor_value("2024-05-01T10:00:00+00:00", "datetime"),
+            datetime(2024, 5, 1, 10, tzinfo=timezone.utc),
+        )
+        self.assertEqual(cursor_value("10.50", "decimal"), Decimal("10.50"))
+        with self.assertRaises(InvalidCursor):
+            cursor_value("yesterday", "datetime")
+        with self.assertRaises(InvalidCursor):
+            cursor_value("ten", "decimal")
+
+
+class KeysetAfterTests(SimpleTestCase):
+    last_key = (Decimal("100"), "tenant_b", 7)
+
+    def test_same_tenant_breaks_ties_on_the_primary_key(self):
+        self.assertEqual(
+            keyset_after("tenant_b", "amount", "entry_id", self.last_key),
+            Q(amount__gt=Decimal("100")) | Q(amount=Decimal("100"), entry_id__gt=7),
+        )
+        self.assertEqual(
+            keyset_after("tenant_b", "amount", "entry_id", self.last_key, descending=True),
+            Q(amount__lt=Decimal("100")) | Q(amount=Decimal("100"), entry_id__lt=7),
+        )
+
+    def test_ascending_ties_belong_to_later_aliases_only(self):
+        self.assertEqual(keyset_after("tenant_c", "amount", "entry_id", self.last_key), Q(amount__gte=Decimal("100")))
+        self.assertEqual(keyset_after("tenant_a", "amount", "entry_id", self.last_key), Q(amount__gt=Decimal("100")))
+
+    def test_descending_ties_belong_to_earlier_aliases_only(self):
+        self.assertEqual(
+            keyset_after("tenant_a", "amount", "entry_id", self.last_key, descending=True),
+            Q(amount__lte=Decimal("100")),
+        )
+        self.assertEqual(
+            keyset_after("tenant_c", "amount", "entry_id", self.last_key, descending=True),
+            Q(amount__lt=Decimal("100")),
+        )
+
+
+class MergeTenantRowsTests(SimpleTestCase):
+    rows = {
+        "tenant_b": [(1, 1), (3, 2), (3, 5)],
+        "tenant_a": [(2, 4), (3, 9)],
+    }
+
+    def sort_key(self, db_alias, row):
+        return (row[0], db_alias, row[1])
+
+    def test_merges_in_global_order_with_alias_tie_break(self):
+        merged, has_more = merge_tenant_rows(self.rows, self.sort_key, limit=10)
+        self.assertEqual(
+            merged,
+            [("tenant_b", (1, 1)), ("tenant_a", (2, 4)), ("tenant_a", (3, 9)), ("tenant_b", (3, 2)), ("tenant_b", (3, 5))],
+        )
+        self.assertFalse(has_more)
+
+    def test_reports_rows_left_over(self):
+        merged, has_more = merge_tenant_rows(self.rows, self.sort_key, limit=2)
+        self.assertEqual(merged, [("tenant_b", (1, 1)), ("tenant_a", (2, 4))])
+        self.assertTrue(has_more)
+
+    def test_descending_merge(self):
+        rows = {alias: list(reversed(stream)) for alias, stream in self.rows.items()}
+        merged, _ = merge_tenant_rows(rows, self.sort_key, limit=3, descending=True)
+        self.assertEqual(merged, [("tenant_b", (3, 5)), ("tenant_b", (3, 2)), ("tenant_a", (3, 9))])
+
+
+class DisputeEnrichmentTests(SimpleTestCase):
+    def setUp(self):
+        catalogue = ProviderCatalogue(ttl=60)
+        catalogue._system = {
+            43: ProviderInfo(43, "Razorpay", "Payment Gateway"),
+            81: ProviderInfo(81, "Fingpay", "AEPS"),
+            82: ProviderInfo(82, "Spice Money", "AEPS"),
+        }
+        catalogue._system_loaded_at = time.monotonic()
+        # Tenant provider 43 is a different provider from system sp_id 43.
+        catalogue._tenants['tenant_a'] = {
+            "by_provider": {5: (43, "Razorpay PG"), 43: (81, "Fingpay AEPS")},
+            "by_system": {43: 5, 81: 43},
+            "loaded_at": time.monotonic(),
+        }
+        patchers = [
+            mock.patch.object(admin_dispute, 'provider_catalogue', catalogue),
+            mock.patch.object(admin_dispute, 'PortalUser'),
+            mock.patch.object(admin_dispute, 'PortalUserInfo'),
+            mock.patch.object(admin_dispute, 'ServiceTransaction'),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        admin_dispute.PortalUser.objects.filter.return_value.values_list.return_value.first.return_value = "Admin A"
+        admin_dispute.ServiceTransaction.objects.filter.return_value = []
+
+    def test_complaint_provider_id_is_read_as_the_system_sp_id(self):
+        view = admin_dispute.AdminDisputeRecordsView()
+        enrichment = view.enrich_tenant_records('tenant_a', [(0, {'provider_id': 43, 'txn_ref': 'PG123'})])
+        self.assertEqual(enrichment[0]['provider_name'], "Razorpay")
+        service_tables = admin_dispute.ServiceTransaction.objects.filter.call_args.kwargs['service_table__in']
+        self.assertEqual(service_tables, {'txn_pg_gateway'})
+
+    def test_provider_missing_on_the_tenant_falls_back_to_the_system_name(self):
+        view = admin_dispute.AdminDisputeRecordsView()
+        enrichment = view.enrich_tenant_records('tenant_a', [(0, {'provider_id': 82, 'txn_ref': None})])
+        self.assertEqual(enrichment[0]['provider_name'], "Spice Money")
+        enrichment = view.enrich_tenant_records('tenant_a', [(0, {'provider_id': 999, 'txn_ref': 'X'})])
+        self.assertIsNone(enrichment[0]['provider_name'])
+
+
+class DisputeReversalTests(SimpleTestCase):
+    def setUp(self):
+        self.view = admin_dispute.AdminDisputeRecordsView()
+        self.table = mock.Mock(status_field='txn_status')
+        self.complaint = mock.Mock()
+        patchers = [
+            mock.patch.object(self.view, 'locate_transaction', return_value=(3, self.table, {'pk': 9}, 43)),
+            mock.patch.object(admin_dispute, 'tenant'),
+            mock.patch.object(admin_dispute, 'reverse_transaction'),
+            mock.patch.object(admin_dispute, 'Servicedispute'),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        complaints = admin_dispute.Servicedispute.objects.filter.return_value
+        complaints.filter.return_value = complaints
+        complaints.first.return_value = self.complaint
+
+    def request(self, **data):
+        return mock.Mock(data={'perform_reverse': True, 'txn_ref': 'PG123', 'notes': 'Refunded', **data}, user=mock.Mock(id=17))
+
+    def test_resolved_reverses_and_updates_the_complaint(self):
+        response = self.view.execute_reversal(self.request(new_complaint_status='RESOLVED'))
+        self.assertEqual(response.status_code, 200, response.data)
+        kwargs = admin_dispute.reverse_transaction.call_args.kwargs
+        self.assertEqual(kwargs['govt_charge_filter'], {'transaction_ref': 'PG123', 'provider_id': 43})
+        self.assertEqual((self.complaint.admin_notes, self.complaint.updated_by_user), ('Refunded', 17))
+        self.complaint.save.assert_called_once_with(update_fields=['admin_notes', 'updated_on', 'updated_by_user'])
+        admin_dispute.Servicedispute.objects.create.assert_not_called()
+
+    def test_failed_reversal_leaves_the_complaint_alone(self):
+        admin_dispute.reverse_transaction.side_effect = admin_dispute.ReversalError("Already reversed.")
+        response = self.view.execute_reversal(self.request(new_complaint_status='RESOLVED'))
+        self.assertEqual(response.status_code, 400)
+        self.complaint.save.assert_not_called()
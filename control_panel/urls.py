@@ -1,5 +1,7 @@
 from django.urls import path
 from control_panel.APIs.AdminReports.admin_report import *
+from control_panel.APIs.AdminReports.tenant_pool_stats import *
+from control_panel.APIs.AdminReports.wallet_balance_as_of import WalletBalanceAsOfView
 from control_panel.APIs.Admin_Info.a_credentials import *
 from control_panel.APIs.Admin_Info.admin_static import *
 from control_panel.APIs.Admin_Info.bank_verification import *
@@ -9,6 +11,7 @@ from control_panel.APIs.Admin_Info.dmt_fix_charge import DmtFixChargeView
 from control_panel.APIs.Admin_Info.dmt_priority import *
 from control_panel.APIs.Admin_Info.manual_credit_debit import *
 from control_panel.APIs.Admin_Transaction.admin_dispute import *
+from control_panel.APIs.Admin_Transaction.dispute_batch import AdminDisputeBatchView
 from control_panel.APIs.Admin_charges.charges import ChargeManagementAPIView
 from control_panel.APIs.Admin_limit_config.limitconfig import LimitConfigRuleView
 from control_panel.APIs.Admin_service_charges.admin_service_charge import *
@@ -105,9 +108,12 @@ urlpatterns = [
     
     #ADMIN_TRANSACTION
     path('admin-dispute-records/',AdminDisputeRecordsView.as_view()),
+    path('admin-dispute-batch/',AdminDisputeBatchView.as_view()),
     
     #ADMIN_REPORTS
     path('transaction-report/',SuperAdminTransactionReportView.as_view()),
+    path('tenant-pool-stats/',TenantPoolStatsView.as_view()),
+    path('wallet-balance-as-of/',WalletBalanceAsOfView.as_view()),
     
     #REQUIRED_DOCUMENT_LIST
     path('manage-document/',ManageDocumentTemplatesView.as_view()),
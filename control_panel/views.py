@@ -1,7 +1,7 @@
 from django.http import HttpResponse
 from django.shortcuts import render
 from django.db import transaction
-from django.db.models import Q
+from django.db.models import Q, Count
 from django.core.paginator import Paginator, EmptyPage
 from django.views import View
 from rest_framework.views import APIView
@@ -59,6 +59,21 @@ from site import abs_paths
 from admin_hub.models import PortalUserLog
 from control_panel.master_data import master_data
 from utils.database.admin_database_manage import run_migrations_for_admin, setup_admin_database
+from utils.database.tenant_pool import tenant_pool, tenant_connection, TenantPoolExhausted
+from utils.database.tenant_scope import tenant, tenant_alias, get_admin_db_name
+from utils.database.tenant_provisioning import provision_tenant_database
+from utils.database.tenant_warm_pool import acquire_tenant_database
+from utils.database.tenant_fanout import fan_out
+from utils.database.tenant_directory import tenant_directory
+from utils.database.provider_catalogue import provider_catalogue
+from utils.database.service_tables import SERVICE_TABLES, get_service_table, get_service_table_for_provider
+from utils.database.txn_directory import resolve_txn_ref
+from utils.database.search import search_q
+from admin_hub.thread_local import get_current_tenant
+from utils.wallet import engine as wallet_engine
+from utils.wallet.engine import WalletError, InsufficientBalance
+from utils.wallet.checkpoints import balance_as_of, balances_as_of
+from utils.wallet.reversal import REVERSIBLE_STATUSES, ReversalError, AlreadyReversed, preview_reversal, reverse_transaction
 
 
 
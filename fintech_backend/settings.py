@@ -37,6 +37,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'control_panel',
     'web_portal',
     'rest_framework',
@@ -48,6 +49,7 @@ MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
+    'admin_hub.middleware.TenantResolutionMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
@@ -92,6 +94,51 @@ DATABASES = {
     }
 }
 
+DATABASE_ROUTERS = ['utils.database.tenant_router.TenantDatabaseRouter']
+
+# Tenant (admin_db_*) databases are registered at runtime from the default
+# config; these keep their connections persistent across requests.
+TENANT_CONN_MAX_AGE = 600
+TENANT_CONN_HEALTH_CHECKS = True
+# Per-process cap on open tenant connections (idle ones are closed LRU first)
+# and how long a request waits for a free slot before failing.
+TENANT_POOL_MAX_CONNECTIONS = 50
+TENANT_POOL_WAIT_TIMEOUT = 10
+# Migrated + seeded database new tenants are cloned from
+# (refresh with `manage.py refresh_tenant_template`).
+TENANT_TEMPLATE_DATABASE = 'admin_db_template'
+# READY databases kept by `manage.py maintain_tenant_pool` for instant onboarding.
+TENANT_WARM_POOL_SIZE = 5
+# Seconds after which a slot still PROVISIONING is treated as crashed and failed.
+TENANT_WARM_POOL_PROVISIONING_TIMEOUT = 1800
+# Worker processes used by `manage.py migrate_tenants`.
+TENANT_MIGRATE_CONCURRENCY = 4
+# Worker processes used by `manage.py reconcile_wallets`.
+TENANT_RECONCILE_WORKERS = 4
+# Shared thread pool for cross-tenant reads and the per-tenant time budget (seconds).
+TENANT_FANOUT_WORKERS = 8
+TENANT_FANOUT_TIMEOUT = 30
+# Monthly partitions of wallet history and ledger kept ready ahead of time
+# (`manage.py maintain_partitions`).
+TENANT_PARTITION_MONTHS_AHEAD = 3
+# How often (seconds) the tenant directory checks the admin table for changes
+# made by other processes; local Admin saves refresh it immediately.
+TENANT_DIRECTORY_TTL = 30
+
+# Upper bound (seconds) on how stale the provider catalogue cache can get when
+# providers are edited by another process.
+PROVIDER_CATALOGUE_TTL = 300
+# Same bound for the compiled charge slab cache used by calculate_and_apply_charges.
+CHARGE_SLAB_CACHE_TTL = 300
+
+# Bulk dispute resolution: items accepted per request, and seconds after which
+# an unfinished batch may be claimed again by a retry.
+DISPUTE_BATCH_MAX_ITEMS = 500
+DISPUTE_BATCH_STALE_AFTER = 900
+
+# Wallet checkpoints only cover periods that ended at least this many seconds ago.
+WALLET_CHECKPOINT_GRACE = 300
+
 AUTH_USER_MODEL = 'web_portal.AdminAccount'  
 
 # Password validation
@@ -1,18 +1,23 @@
 import psycopg2
 from django.conf import settings
-from django.db import connections
+from utils.database.tenant_connections import register_tenant_database
 from django.core.management import call_command
 
+def get_maintenance_connection():
+    conn = psycopg2.connect(
+        dbname='postgres',
+        user=settings.DATABASES['default']['USER'],
+        password=settings.DATABASES['default']['PASSWORD'],
+        host=settings.DATABASES['default']['HOST'],
+        port=settings.DATABASES['default']['PORT']
+    )
+    conn.autocommit = True
+    return conn
+
+
 def setup_admin_database(db_identifier):
     try:
-        conn = psycopg2.connect(
-            dbname='postgres',
-            user=settings.DATABASES['default']['USER'],
-            password=settings.DATABASES['default']['PASSWORD'],
-            host=settings.DATABASES['default']['HOST'],
-            port=settings.DATABASES['default']['PORT']
-        )
-        conn.autocommit = True
+        conn = get_maintenance_connection()
         cursor = conn.cursor()
 
         cursor.execute("SELECT 1 FROM pg_catalog.pg_database WHERE datname = %s", [db_identifier])
@@ -25,11 +30,7 @@ def setup_admin_database(db_identifier):
         cursor.close()
         conn.close()
 
-        settings.DATABASES[db_identifier] = {
-            **settings.DATABASES['default'],
-            'NAME': db_identifier,
-        }
-        connections.databases = settings.DATABASES  
+        register_tenant_database(db_identifier)
 
         if not hasattr(settings, 'TENANT_DATABASES'):
             settings.TENANT_DATABASES = []
@@ -0,0 +1,221 @@
+import threading
+import time
+from bisect import bisect_right
+from collections import defaultdict
+from decimal import Decimal
+from django.conf import settings
+from admin_hub.models import Adcharges, AdServiceProvider
+
+
+class ChargeSlabError(Exception):
+    pass
+
+
+class ChargeSlab:
+    __slots__ = ("rule_id", "minimum", "maximum", "charge_mode", "charge_amount", "transaction_type")
+
+    def __init__(self, rule_id, minimum, maximum, charge_mode, charge_amount, transaction_type):
+        self.rule_id = rule_id
+        self.minimum = minimum
+        self.maximum = maximum
+        self.charge_mode = charge_mode
+        self.charge_amount = charge_amount
+        self.transaction_type = transaction_type
+
+    @property
+    def is_percent(self):
+        return self.charge_mode == 'PERCENT'
+
+    @property
+    def is_unbounded(self):
+        # A rule saved with the model's default 0/0 range applies to every amount.
+        return self.minimum == 0 and self.maximum == 0
+
+    def charge_for(self, amount):
+        return amount * self.charge_amount / 100 if self.is_percent else self.charge_amount
+
+
+class SlabIndex:
+    """
+    One provider's slabs for one (beneficiary, identifier_value,
+    transaction_type) key, sorted by minimum.
+
+    Slabs are closed ranges; two may share an endpoint, which then belongs to
+    the lower slab. Overlaps are rejected at build time, gaps are recorded in
+    `gaps` and amounts inside them match no slab. A 0/0 rule covers every
+    amount and must then be the key's only rule.
+    """
+
+    __slots__ = ("minimums", "slabs", "gaps", "unbounded")
+
+    def __init__(self, slabs):
+        slabs = sorted(slabs, key=lambda slab: (slab.minimum, slab.maximum))
+        self.unbounded = next((slab for slab in slabs if slab.is_unbounded), None)
+        if self.unbounded and len(slabs) > 1:
+            others = ", ".join(str(slab.rule_id) for slab in slabs if slab is not self.unbounded)
+            raise ChargeSlabError(
+                f"Charge rule {self.unbounded.rule_id} has no amount range (0-0) and so covers every amount, "
+                f"but rules {others} share its beneficiary, operator and transaction type."
+            )
+        gaps = []
+        for slab in slabs:
+            if slab.minimum > slab.maximum:
+                raise ChargeSlabError(f"Charge rule {slab.rule_id}: minimum {slab.minimum} is above maximum {slab.maximum}.")
+        for lower, upper in zip(slabs, slabs[1:]):
+            if upper.minimum < lower.maximum:
+                raise ChargeSlabError(
+                    f"Charge rules {lower.rule_id} ({lower.minimum}-{lower.maximum}) and "
+                    f"{upper.rule_id} ({upper.minimum}-{upper.maximum}) overlap."
+                )
+            if upper.minimum > lower.maximum:
+                gaps.append((lower.maximum, upper.minimum))
+        self.minimums = [slab.minimum for slab in slabs]
+        self.slabs = slabs
+        self.gaps = gaps
+
+    def lookup(self, amount):
+        if self.unbounded:
+            return self.unbounded
+        position = bisect_right(self.minimums, amount) - 1
+        if position < 0:
+            return None
+        if position > 0 and amount <= self.slabs[position - 1].maximum:
+            position -= 1
+        slab = self.slabs[position]
+        return slab if amount <= slab.maximum else None
+
+
+class ProviderCharges:
+    __slots__ = ("provider_id", "gst_rate", "indexes", "error")
+
+    def __init__(self, provider_id, gst_rate, indexes=None, error=None):
+        self.provider_id = provider_id
+        self.gst_rate = gst_rate
+        self.indexes = indexes or {}
+        self.error = error
+
+    def slab_for(self, amount, beneficiary='PLATFORM', identifier_value=None, transaction_type=None):
+        """
+        The slab covering amount, or None when the provider has no slabs for
+        the key. Rules for identifier_value (the operator) take precedence over
+        the provider's generic rules; without a transaction_type the amount
+        must fall in slabs of one type only.
+        """
+        if self.error:
+            raise ChargeSlabError(self.error)
+        indexes = self._indexes_for(beneficiary, identifier_value, transaction_type)
+        if not indexes:
+            return None
+        found = [slab for slab in (index.lookup(amount) for index in indexes) if slab]
+        if not found:
+            raise ChargeSlabError(f"No charge slab of provider {self.provider_id} covers amount {amount}.")
+        if len(found) > 1:
+            raise ChargeSlabError(
+                f"Charge rules {', '.join(str(slab.rule_id) for slab in found)} of provider {self.provider_id} "
+                f"all cover amount {amount}; pass the transaction type."
+            )
+        return found[0]
+
+    def _indexes_for(self, beneficiary, identifier_value, transaction_type):
+        for identifier in dict.fromkeys((identifier_value, None)):
+            indexes = [
+                index for (key_beneficiary, key_identifier, key_type), index in self.indexes.items()
+                if key_beneficiary == beneficiary and key_identifier == identifier
+                and (transaction_type is None or key_type == transaction_type)
+            ]
+            if indexes:
+                return indexes
+        return []
+
+
+def _gst_rate(igst, cgst, sgst):
+    if igst is not None:
+        return igst
+    return (cgst or Decimal('0')) + (sgst or Decimal('0'))
+
+
+class ChargeSlabCatalogue:
+    """
+    In-process cache of every tenant's compiled charge slabs and provider GST
+    rates, built with two queries per tenant so charge lookups need none.
+
+    post_save/post_delete on Adcharges, AdServiceProvider and GSTCode call
+    invalidate(); snapshots also expire after CHARGE_SLAB_CACHE_TTL seconds
+    to pick up changes made by other processes.
+    """
+
+    def __init__(self, ttl=None):
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._tenants = {}
+        self.version = 0
+
+    @property
+    def ttl(self):
+        if self._ttl is not None:
+            return self._ttl
+        return getattr(settings, 'CHARGE_SLAB_CACHE_TTL', 300)
+
+    def invalidate(self, db_alias=None):
+        with self._lock:
+            self.version += 1
+            if db_alias is None:
+                self._tenants = {}
+            else:
+                self._tenants.pop(db_alias, None)
+
+    def _build(self, db_alias):
+        gst_rates = {
+            provider_id: _gst_rate(igst, cgst, sgst)
+            for provider_id, igst, cgst, sgst in AdServiceProvider.objects.using(db_alias).values_list(
+                'provider_id', 'hsn_sac__igst', 'hsn_sac__cgst', 'hsn_sac__sgst'
+            )
+        }
+        # Same key as Adcharges.unique_together: rules for different operators
+        # or transaction types may share an amount range.
+        grouped = defaultdict(lambda: defaultdict(list))
+        rules = Adcharges.objects.using(db_alias).filter(is_disabled=False, is_deleted=False).values_list(
+            'rule_id', 'provider_id', 'beneficiary', 'identifier_value', 'min_txn_amount', 'max_txn_amount',
+            'charge_mode', 'charge_amount', 'transaction_type',
+        )
+        for rule_id, provider_id, beneficiary, identifier_value, minimum, maximum, mode, amount, txn_type in rules:
+            grouped[provider_id][(beneficiary, identifier_value, txn_type)].append(
+                ChargeSlab(rule_id, minimum, maximum, mode, amount, txn_type)
+            )
+
+        providers = {}
+        for provider_id, gst_rate in gst_rates.items():
+            try:
+                indexes = {key: SlabIndex(slabs) for key, slabs in grouped[provider_id].items()}
+                providers[provider_id] = ProviderCharges(provider_id, gst_rate, indexes)
+                for key, index in indexes.items():
+                    if index.gaps:
+                        print(f"Charge slabs of provider {provider_id} {key} on {db_alias} leave gaps: {index.gaps}")
+            except ChargeSlabError as exc:
+                # One misconfigured provider must not take the tenant's other providers down with it.
+                print(f"Charge slabs of provider {provider_id} on {db_alias} are invalid: {exc}")
+                providers[provider_id] = ProviderCharges(provider_id, gst_rate, error=str(exc))
+        return providers
+
+    def _tenant_snapshot(self, db_alias):
+        snapshot = self._tenants.get(db_alias)
+        if snapshot is not None and time.monotonic() - snapshot["loaded_at"] < self.ttl:
+            return snapshot
+
+        version = self.version
+        snapshot = {"providers": self._build(db_alias), "loaded_at": time.monotonic()}
+        with self._lock:
+            # Drop the result if an invalidation raced with the build.
+            if version == self.version:
+                self._tenants[db_alias] = snapshot
+        return snapshot
+
+    def provider(self, db_alias, provider_id):
+        try:
+            provider_id = int(provider_id)
+        except (TypeError, ValueError):
+            return None
+        return self._tenant_snapshot(db_alias)["providers"].get(provider_id)
+
+
+charge_slabs = ChargeSlabCatalogue()
@@ -0,0 +1,233 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+import re
+from django.conf import settings
+from django.db import transaction
+from django.utils.dateparse import parse_datetime
+from django.utils.timezone import now
+
+
+# table: (id column, partition key column)
+PARTITIONED_TABLES = {
+    'core_wallet_history': ('history_id', 'created_at'),
+    'core_ledger_entries': ('entry_id', 'recorded_at'),
+}
+# Catalog-only steps must not queue behind long transactions and stall every writer.
+PARTITION_LOCK_TIMEOUT = '5s'
+
+_UPPER_BOUND = re.compile(r"TO \('([^']+)'\)")
+
+
+def months_ahead():
+    return getattr(settings, 'TENANT_PARTITION_MONTHS_AHEAD', 3)
+
+
+def month_start(value):
+    return datetime(value.year, value.month, 1, tzinfo=dt_timezone.utc)
+
+
+def add_months(start, months):
+    index = start.year * 12 + start.month - 1 + months
+    return start.replace(year=index // 12, month=index % 12 + 1)
+
+
+def partition_name(table, start):
+    return f"{table}_p{start:%Y%m}"
+
+
+def _literal(value):
+    return f"'{value.isoformat()}'"
+
+
+def is_partitioned(connection, table):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT 1 FROM pg_partitioned_table p JOIN pg_class c ON c.oid = p.partrelid "
+            "WHERE c.relname = %s AND pg_table_is_visible(c.oid)",
+            [table],
+        )
+        return cursor.fetchone() is not None
+
+
+def partitions(connection, table):
+    """[(partition name, upper bound)] of `table`; the bound is None for the default partition."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT child.relname, pg_get_expr(child.relpartbound, child.oid) FROM pg_inherits "
+            "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE parent.relname = %s AND pg_table_is_visible(parent.oid) ORDER BY child.relname",
+            [table],
+        )
+        rows = cursor.fetchall()
+    result = []
+    for name, bound in rows:
+        match = _UPPER_BOUND.search(bound or '')
+        result.append((name, parse_datetime(match.group(1)) if match else None))
+    return result
+
+
+def ensure_partitions(connection, table, ahead=None):
+    """
+    Creates the monthly partitions from the current month through `ahead`
+    months out, plus a default partition so an insert never fails for want
+    of one. Returns the names created.
+    """
+    if not is_partitioned(connection, table):
+        return []
+    ahead = months_ahead() if ahead is None else ahead
+    qn = connection.ops.quote_name
+    covered_until = max((upper for _, upper in partitions(connection, table) if upper), default=None)
+
+    created = []
+    start = month_start(now())
+    last = add_months(start, ahead)
+    with connection.cursor() as cursor:
+        while start <= last:
+            if covered_until is None or start >= covered_until:
+                name = partition_name(table, start)
+                cursor.execute(
+                    f"CREATE TABLE IF NOT EXISTS {qn(name)} PARTITION OF {qn(table)} "
+                    f"FOR VALUES FROM ({_literal(start)}) TO ({_literal(add_months(start, 1))})"
+                )
+                created.append(name)
+            start = add_months(start, 1)
+        cursor.execute(f"CREATE TABLE IF NOT EXISTS {qn(table + '_default')} PARTITION OF {qn(table)} DEFAULT")
+    return created
+
+
+def detach_partitions(connection, table, before, include_legacy=False):
+    """
+    Detaches every partition that ends on or before `before`. The detached
+    tables stay in the database, out of every query, ready to be dumped and
+    dropped. Returns the names detached.
+
+    The partition the conversion attached holds the tenant's whole history
+    before partitioning, so it is only detached with include_legacy.
+    """
+    qn = connection.ops.quote_name
+    detached = []
+    for name, upper in partitions(connection, table):
+        if upper is None or upper > before:
+            continue
+        if name == f"{table}_legacy" and not include_legacy:
+            continue
+        with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+            cursor.execute(f"SET LOCAL lock_timeout = '{PARTITION_LOCK_TIMEOUT}'")
+            cursor.execute(f"ALTER TABLE {qn(table)} DETACH PARTITION {qn(name)}")
+        detached.append(name)
+    return detached
+
+
+def _index_is_invalid(cursor, index):
+    cursor.execute(
+        "SELECT NOT i.indisvalid FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+        "WHERE c.relname = %s AND pg_table_is_visible(c.oid)",
+        [index],
+    )
+    row = cursor.fetchone()
+    return bool(row and row[0])
+
+
+def convert_to_partitioned(connection, table):
+    """
+    Turns `table` into a table range-partitioned by month without rewriting
+    its rows.
+
+    The existing table becomes the first partition, covering everything up to
+    a boundary a month or so ahead. The slow work runs first, under locks
+    that let reads and writes continue: building a unique index on
+    (id, key) concurrently, and validating a CHECK constraint that matches
+    the partition bound. The swap then takes a short exclusive lock and only
+    changes the catalog. Returns False when the table is already partitioned
+    or the database is not PostgreSQL.
+
+    Must run outside a transaction (CREATE INDEX CONCURRENTLY).
+    """
+    if connection.vendor != 'postgresql' or is_partitioned(connection, table):
+        return False
+    id_column, key = PARTITIONED_TABLES[table]
+    qn = connection.ops.quote_name
+    legacy = f"{table}_legacy"
+    composite = f"{table}_id_key_uniq"
+    key_index = f"{table}_key_part"
+    bound_check = f"{table}_legacy_bound"
+    # A week of headroom so a run near month end still converts before rows pass the bound.
+    boundary = add_months(month_start(now() + timedelta(days=7)), 1)
+
+    with connection.cursor() as cursor:
+        for index, columns in ((composite, f"{qn(id_column)}, {qn(key)}"), (key_index, qn(key))):
+            if _index_is_invalid(cursor, index):
+                cursor.execute(f"DROP INDEX CONCURRENTLY {qn(index)}")
+            unique = "UNIQUE " if index == composite else ""
+            cursor.execute(f"CREATE {unique}INDEX CONCURRENTLY IF NOT EXISTS {qn(index)} ON {qn(table)} ({columns})")
+        cursor.execute(f"ALTER TABLE {qn(table)} DROP CONSTRAINT IF EXISTS {qn(bound_check)}")
+        cursor.execute(
+            f"ALTER TABLE {qn(table)} ADD CONSTRAINT {qn(bound_check)} "
+            f"CHECK ({qn(key)} IS NOT NULL AND {qn(key)} < {_literal(boundary)}) NOT VALID"
+        )
+        cursor.execute(f"ALTER TABLE {qn(table)} VALIDATE CONSTRAINT {qn(bound_check)}")
+
+    with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+        cursor.execute(f"SET LOCAL lock_timeout = '{PARTITION_LOCK_TIMEOUT}'")
+        cursor.execute(f"LOCK TABLE {qn(table)} IN ACCESS EXCLUSIVE MODE")
+
+        # Definitions are read before the rename so they still name `table`
+        # and can be replayed on the partitioned parent as they are.
+        cursor.execute(
+            "SELECT indexname, indexdef FROM pg_indexes WHERE tablename = %s AND schemaname = current_schema()",
+            [table],
+        )
+        indexes = cursor.fetchall()
+        cursor.execute(
+            "SELECT conname, contype, pg_get_constraintdef(oid) FROM pg_constraint "
+            "WHERE conrelid = %s::regclass AND contype IN ('p', 'f')",
+            [table],
+        )
+        constraints = cursor.fetchall()
+        primary_key = next((name for name, kind, _ in constraints if kind == 'p'), None)
+        foreign_keys = [(name, definition) for name, kind, definition in constraints if kind == 'f']
+
+        cursor.execute("SELECT pg_get_serial_sequence(%s, %s)", [table, id_column])
+        old_sequence = cursor.fetchone()[0]
+        next_id = 1
+        if old_sequence:
+            cursor.execute(f"SELECT last_value FROM {old_sequence}")
+            next_id = cursor.fetchone()[0] + 1
+        cursor.execute(f"SELECT COALESCE(MAX({qn(id_column)}), 0) + 1 FROM {qn(table)}")
+        next_id = max(next_id, cursor.fetchone()[0])
+
+        cursor.execute(f"ALTER TABLE {qn(table)} RENAME TO {qn(legacy)}")
+        cursor.execute(f"ALTER TABLE {qn(legacy)} ALTER COLUMN {qn(id_column)} DROP IDENTITY IF EXISTS")
+        cursor.execute(f"ALTER TABLE {qn(legacy)} ALTER COLUMN {qn(id_column)} DROP DEFAULT")
+        # A partitioned parent's primary key must include the partition key, and
+        # only a partition whose own primary key matches can be attached without a rebuild.
+        if primary_key:
+            cursor.execute(f"ALTER TABLE {qn(legacy)} DROP CONSTRAINT {qn(primary_key)}")
+        cursor.execute(f"ALTER TABLE {qn(legacy)} ADD CONSTRAINT {qn(legacy + '_pkey')} PRIMARY KEY USING INDEX {qn(composite)}")
+
+        replayed = []
+        for name, definition in indexes:
+            if name in (primary_key, composite, key_index):
+                continue
+            cursor.execute(f"ALTER INDEX {qn(name)} RENAME TO {qn(name[:58] + '_lgcy')}")
+            replayed.append(definition)
+
+        sequence = f"{table}_{id_column}_seq"
+        cursor.execute(f"CREATE SEQUENCE IF NOT EXISTS {qn(sequence)}")
+        cursor.execute("SELECT setval(%s, %s, false)", [sequence, next_id])
+        cursor.execute(f"CREATE TABLE {qn(table)} (LIKE {qn(legacy)} INCLUDING DEFAULTS) PARTITION BY RANGE ({qn(key)})")
+        cursor.execute(f"ALTER TABLE {qn(table)} ALTER COLUMN {qn(id_column)} SET DEFAULT nextval('{sequence}'::regclass)")
+        cursor.execute(f"ALTER SEQUENCE {qn(sequence)} OWNED BY {qn(table)}.{qn(id_column)}")
+
+        # The validated CHECK proves the bound, so ATTACH skips its scan.
+        cursor.execute(f"ALTER TABLE {qn(table)} ATTACH PARTITION {qn(legacy)} FOR VALUES FROM (MINVALUE) TO ({_literal(boundary)})")
+        cursor.execute(f"ALTER TABLE {qn(legacy)} DROP CONSTRAINT {qn(bound_check)}")
+        # Each of these finds its match already on the partition and adopts it instead of building one.
+        cursor.execute(f"ALTER TABLE {qn(table)} ADD CONSTRAINT {qn(table + '_pkey')} PRIMARY KEY ({qn(id_column)}, {qn(key)})")
+        for name, definition in foreign_keys:
+            cursor.execute(f"ALTER TABLE {qn(table)} ADD CONSTRAINT {qn(name)} {definition}")
+        for definition in replayed:
+            cursor.execute(definition)
+
+    ensure_partitions(connection, table)
+    return True
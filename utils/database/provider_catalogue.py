@@ -0,0 +1,152 @@
+import threading
+import time
+from django.conf import settings
+from admin_hub.models import AdServiceProvider
+from control_panel.models import ServiceProvider
+
+
+class ProviderInfo:
+    __slots__ = ("sp_id", "provider_name", "service_name", "provider_id", "display_name")
+
+    def __init__(self, sp_id, provider_name, service_name, provider_id=None, display_name=None):
+        self.sp_id = sp_id
+        self.provider_name = provider_name
+        self.service_name = service_name
+        self.provider_id = provider_id
+        self.display_name = display_name
+
+
+class ProviderCatalogue:
+    """
+    In-process cache of the provider catalogue.
+
+    System providers (ServiceProvider + SaCoreService) are keyed by sp_id and
+    each tenant's AdServiceProvider rows by provider_id and by system_ref_id.
+    Tenant snapshots only hold ids; names are joined from the system snapshot
+    at lookup time, so a rename on the super-admin side never needs a tenant reload.
+
+    post_save/post_delete on the three models call invalidate(); snapshots also
+    expire after PROVIDER_CATALOGUE_TTL seconds to pick up changes made by
+    other processes. `version` increases on every invalidation.
+    """
+
+    def __init__(self, ttl=None):
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._system = None
+        self._system_loaded_at = 0.0
+        self._tenants = {}
+        self.version = 0
+
+    @property
+    def ttl(self):
+        if self._ttl is not None:
+            return self._ttl
+        return getattr(settings, 'PROVIDER_CATALOGUE_TTL', 300)
+
+    def invalidate(self, db_alias=None):
+        with self._lock:
+            self.version += 1
+            if db_alias is None:
+                self._system = None
+                self._tenants = {}
+            else:
+                self._tenants.pop(db_alias, None)
+
+    def _expired(self, loaded_at):
+        return time.monotonic() - loaded_at >= self.ttl
+
+    def _system_snapshot(self):
+        system = self._system
+        if system is not None and not self._expired(self._system_loaded_at):
+            return system
+
+        version = self.version
+        rows = ServiceProvider.objects.using('default').values_list('sp_id', 'display_label', 'service__title')
+        system = {
+            sp_id: ProviderInfo(sp_id, display_label or "Unknown Provider", service_title or "Unknown")
+            for sp_id, display_label, service_title in rows
+        }
+        with self._lock:
+            # Drop the result if an invalidation raced with the load.
+            if version == self.version:
+                self._system = system
+                self._system_loaded_at = time.monotonic()
+        return system
+
+    def _tenant_snapshot(self, db_alias):
+        snapshot = self._tenants.get(db_alias)
+        if snapshot is not None and not self._expired(snapshot["loaded_at"]):
+            return snapshot
+
+        version = self.version
+        rows = AdServiceProvider.objects.using(db_alias).values_list('provider_id', 'system_ref_id', 'display_name')
+        by_provider = {provider_id: (system_ref_id, display_name) for provider_id, system_ref_id, display_name in rows}
+        snapshot = {
+            "by_provider": by_provider,
+            "by_system": {
+                system_ref_id: provider_id
+                for provider_id, (system_ref_id, _) in by_provider.items()
+                if system_ref_id is not None
+            },
+            "loaded_at": time.monotonic(),
+        }
+        with self._lock:
+            if version == self.version:
+                self._tenants[db_alias] = snapshot
+        return snapshot
+
+    def system_provider(self, sp_id):
+        try:
+            return self._system_snapshot().get(int(sp_id))
+        except (TypeError, ValueError):
+            return None
+
+    def tenant_provider(self, db_alias, provider_id):
+        try:
+            provider_id = int(provider_id)
+        except (TypeError, ValueError):
+            return None
+        local = self._tenant_snapshot(db_alias)["by_provider"].get(provider_id)
+        if not local:
+            return None
+        system_ref_id, display_name = local
+        system = self.system_provider(system_ref_id)
+        if not system:
+            return None
+        return ProviderInfo(system.sp_id, system.provider_name, system.service_name, provider_id, display_name)
+
+    def tenant_resolvable_provider_ids(self, db_alias):
+        """Tenant provider_ids that tenant_provider() resolves, i.e. whose system provider exists."""
+        system = self._system_snapshot()
+        return [
+            provider_id
+            for provider_id, (system_ref_id, _) in self._tenant_snapshot(db_alias)["by_provider"].items()
+            if system_ref_id in system
+        ]
+
+    def tenant_provider_ids_matching(self, db_alias, search_term):
+        """Tenant provider_ids whose provider, service or local display name contains search_term."""
+        needle = search_term.lower()
+        system = self._system_snapshot()
+        matches = []
+        for provider_id, (system_ref_id, display_name) in self._tenant_snapshot(db_alias)["by_provider"].items():
+            names = [display_name]
+            if system_ref_id in system:
+                names += [system[system_ref_id].provider_name, system[system_ref_id].service_name]
+            if any(name and needle in name.lower() for name in names):
+                matches.append(provider_id)
+        return matches
+
+    def tenant_provider_for_system(self, db_alias, sp_id):
+        try:
+            sp_id = int(sp_id)
+        except (TypeError, ValueError):
+            return None
+        provider_id = self._tenant_snapshot(db_alias)["by_system"].get(sp_id)
+        if provider_id is None:
+            return None
+        return self.tenant_provider(db_alias, provider_id)
+
+
+provider_catalogue = ProviderCatalogue()
@@ -0,0 +1,33 @@
+from functools import reduce
+from operator import or_
+from django.db.models import OuterRef, Q, Subquery, TextField, Value
+from django.db.models.functions import Coalesce, Concat
+from control_panel.models import Admin, ServiceProvider, Servicedispute
+
+
+# Fields whose change alters a complaint's search_text.
+DISPUTE_SEARCH_SOURCES = {'admin', 'provider_id', 'txn_ref'}
+
+
+def search_q(term, *fields):
+    """
+    OR of icontains over `fields`. Each field has an UPPER(col) gin_trgm_ops
+    index, which serves the UPPER(col) LIKE '%term%' that icontains compiles to.
+    """
+    return reduce(or_, (Q(**{f"{field}__icontains": term}) for field in fields))
+
+
+def dispute_search_expression():
+    admin_name = Admin.objects.filter(admin_id=OuterRef('admin')).values('name')[:1]
+    provider_label = ServiceProvider.objects.filter(sp_id=OuterRef('provider_id')).values('display_label')[:1]
+    return Concat(
+        Coalesce(Subquery(admin_name), Value('')), Value(' '),
+        Coalesce(Subquery(provider_label), Value('')), Value(' '),
+        Coalesce('txn_ref', Value('')),
+        output_field=TextField(),
+    )
+
+
+def refresh_dispute_search(**filters):
+    """Recomputes search_text for the complaints matching `filters` in one UPDATE."""
+    return Servicedispute.objects.filter(**filters).update(search_text=dispute_search_expression())
@@ -0,0 +1,101 @@
+from admin_hub.models import (
+    AadhaarVerifyLog, FundTransferEntry, ElectricityBillEntry, GasBillEntry, LicPremiumEntry,
+    RechargeHistory, BillPaymentRecord, CashfreePaymentLog, PhonePePaymentEntry,
+    PaymentGatewayRecord, MoneyTransferLog, AepsCashLog, BulkPayoutRecord,
+    AirtelBillEntry, BankItAepsRecord, MicroAtmEntry, PpiTransferLog, KhataTransferEntry,
+)
+
+
+class ServiceTable:
+    """
+    Column names of one tenant service-transaction table. `provider_field` is
+    the FK to AdServiceProvider; optional columns are None when the table has none.
+
+    The all_service_transactions view (admin_hub migration 0003) is built from
+    the same columns; keep both in step when a service table changes.
+    """
+
+    def __init__(self, model, ref_field, status_field, amount_field, provider_field,
+                 mobile_field=None, name_field=None, created_field="created_at", creator_field="created_by"):
+        self.model = model
+        self.ref_field = ref_field
+        self.status_field = status_field
+        self.amount_field = amount_field
+        self.provider_field = provider_field
+        self.mobile_field = mobile_field
+        self.name_field = name_field
+        self.created_field = created_field
+        self.creator_field = creator_field
+
+    @property
+    def db_table(self):
+        return self.model._meta.db_table
+
+    @property
+    def provider_attname(self):
+        return f"{self.provider_field}_id"
+
+    @property
+    def creator_attname(self):
+        return self.model._meta.get_field(self.creator_field).attname
+
+    def field_names(self):
+        names = [self.model._meta.pk.attname, self.ref_field, self.amount_field,
+                 self.provider_attname, self.created_field, self.creator_attname]
+        names += [name for name in (self.status_field, self.mobile_field, self.name_field) if name]
+        return names
+
+
+_TABLES = [
+    ServiceTable(FundTransferEntry, "ref_number", "current_status", "transfer_amount", "partner", "mobile_no", "beneficiary_name", creator_field="initiated_by"),
+    ServiceTable(ElectricityBillEntry, "unique_ref", "bill_status", "bill_amount", "partner", "mobile_no", "consumer_name"),
+    ServiceTable(GasBillEntry, "transaction_ref", "payment_status", "due_amount", "partner", "contact_mobile", "customer_name"),
+    ServiceTable(LicPremiumEntry, "lic_ref_id", "premium_status", "premium_amount", "partner", "registered_mobile"),
+    ServiceTable(RechargeHistory, "request_txn_id", "recharge_status", "recharge_amount", "service_partner", "mobile_number"),
+    ServiceTable(BillPaymentRecord, "request_ref", "payment_status", "bill_amount", "service_partner", "customer_mobile", created_field="payment_date"),
+    ServiceTable(CashfreePaymentLog, "cf_order_id", "payment_status", "payment_amount", "partner", "customer_mobile"),
+    ServiceTable(PhonePePaymentEntry, "merchant_txn_id", "current_status", "amount_paid", "partner", "mobile"),
+    ServiceTable(PaymentGatewayRecord, "order_ref", "txn_status", "txn_amount", "partner", "customer_mobile", "customer_name"),
+    ServiceTable(MoneyTransferLog, "reference_code", "transfer_status", "transfer_amount", "provider", "beneficiary_mobile", "beneficiary_name", creator_field="initiated_by"),
+    ServiceTable(AepsCashLog, "reference_no", "current_status", "txn_amount", "partner", "customer_mobile", created_field="processed_at", creator_field="initiated_by"),
+    ServiceTable(BulkPayoutRecord, "payout_ref", "payout_result", "transfer_amount", "admin", creator_field="initiated_by"),
+    ServiceTable(AirtelBillEntry, "cms_ref", "bill_status", "bill_amount", "admin", "mobile_no", "biller_name"),
+    ServiceTable(BankItAepsRecord, "bankit_txn", "txn_status", "amount", "partner", "mobile"),
+    ServiceTable(MicroAtmEntry, "txn_ref", "current_status", "txn_amount", "admin", "mobile_no"),
+    ServiceTable(PpiTransferLog, "txn_ref_id", "txn_status", "amount", "partner", "customer_mobile"),
+    ServiceTable(KhataTransferEntry, "reference_no", "current_status", "transfer_amount", "admin", "mobile_no", "client_name", creator_field="initiated_by"),
+    ServiceTable(AadhaarVerifyLog, "request_id", None, "verify_amount", "partner", creator_field="initiated_by"),
+]
+
+# GlTrn.source_table -> table descriptor
+SERVICE_TABLES = {table.db_table: table for table in _TABLES}
+
+# Super-admin ServiceProvider.sp_id -> GlTrn.source_table
+PROVIDER_SERVICE_TABLES = {
+    '1': 'txn_aadhaar_verify',
+    '2': 'txn_fund_transfer', '4': 'txn_fund_transfer', '6': 'txn_fund_transfer', '95': 'txn_fund_transfer',
+    '8': 'txn_electricity',
+    '9': 'txn_gas_bill',
+    '10': 'txn_lic_premium',
+    '11': 'txn_mobile_recharge',
+    '12': 'txn_bbps_bill', '45': 'txn_bbps_bill',
+    '41': 'txn_cashfree_pg', '74': 'txn_cashfree_pg',
+    '42': 'txn_phonepe', '75': 'txn_phonepe',
+    '43': 'txn_pg_gateway', '73': 'txn_pg_gateway', '76': 'txn_pg_gateway',
+    '44': 'txn_money_transfer', '77': 'txn_money_transfer',
+    '80': 'txn_aeps_cash', '81': 'txn_aeps_cash', '82': 'txn_aeps_cash', '83': 'txn_aeps_cash',
+    '84': 'txn_bulk_payout',
+    '85': 'txn_airtel_cms',
+    '86': 'txn_bankit_aeps', '97': 'txn_bankit_aeps',
+    '92': 'txn_micro_atm', '103': 'txn_micro_atm',
+    '106': 'txn_ppi_transfer',
+    '109': 'txn_digikhata',
+}
+
+
+def get_service_table(db_table):
+    return SERVICE_TABLES.get(db_table)
+
+
+def get_service_table_for_provider(sp_id):
+    return SERVICE_TABLES.get(PROVIDER_SERVICE_TABLES.get(str(sp_id)))
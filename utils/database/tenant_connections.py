@@ -0,0 +1,53 @@
+import threading
+from copy import deepcopy
+from django.conf import settings
+from django.db import connections
+
+
+_registry_lock = threading.Lock()
+_registered_aliases = set()
+
+
+def build_tenant_config(db_alias: str) -> dict:
+    # connections.settings already carries every Django default for 'default',
+    # so a copy of it is a complete config and needs no ConnectionHandler rebuild.
+    tenant_config = deepcopy(connections.settings['default'])
+    tenant_config.update({
+        'NAME': db_alias,
+        'ATOMIC_REQUESTS': False,
+        'CONN_MAX_AGE': getattr(settings, 'TENANT_CONN_MAX_AGE', 600),
+        'CONN_HEALTH_CHECKS': getattr(settings, 'TENANT_CONN_HEALTH_CHECKS', True),
+    })
+    return tenant_config
+
+
+def register_tenant_database(db_alias: str) -> str:
+    if db_alias in _registered_aliases:
+        return db_alias
+
+    with _registry_lock:
+        if db_alias not in connections.settings:
+            connections.settings[db_alias] = build_tenant_config(db_alias)
+        _registered_aliases.add(db_alias)
+
+    return db_alias
+
+
+def is_tenant_registered(db_alias: str) -> bool:
+    return db_alias in _registered_aliases
+
+
+def registered_tenant_aliases() -> list:
+    with _registry_lock:
+        return sorted(_registered_aliases)
+
+
+def unregister_tenant_database(db_alias: str) -> None:
+    # Used when a tenant database is renamed or dropped; only the calling
+    # thread's connection can be closed here, so callers close others first.
+    with _registry_lock:
+        if db_alias in connections.settings and db_alias != 'default':
+            connections[db_alias].close()
+            del connections[db_alias]
+            del connections.settings[db_alias]
+        _registered_aliases.discard(db_alias)
@@ -0,0 +1,96 @@
+import threading
+import time
+from django.conf import settings
+from django.db.models import Count, Max
+from control_panel.models import Admin
+from utils.database.tenant_domains import resolve_tenant_alias
+
+
+class TenantDirectory:
+    """
+    In-process map of real tenants: active, not soft-deleted admins that have
+    a db_name.
+
+    The snapshot is rebuilt when an Admin is saved or deleted in this process
+    (signals) and, for changes made by other processes, when the admin table's
+    fingerprint (row count, latest updated_at) moves. The fingerprint is checked
+    at most every TENANT_DIRECTORY_TTL seconds. `version` increases on every rebuild.
+    """
+
+    def __init__(self, ttl=None):
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._alias_by_admin = {}
+        self._admin_by_alias = {}
+        self._fingerprint = None
+        self._checked_at = 0.0
+        self._stale = True
+        self.version = 0
+
+    @property
+    def ttl(self):
+        if self._ttl is not None:
+            return self._ttl
+        return getattr(settings, 'TENANT_DIRECTORY_TTL', 30)
+
+    def invalidate(self):
+        self._stale = True
+
+    def _current_fingerprint(self):
+        stats = Admin.objects.using('default').aggregate(total=Count('admin_id'), latest=Max('updated_at'))
+        return stats['total'], stats['latest']
+
+    def _rebuild(self, fingerprint):
+        rows = (
+            Admin.objects.using('default')
+            .filter(is_active=True, is_soft_deleted=False, db_name__isnull=False)
+            .exclude(db_name='')
+            .order_by('admin_id')
+            .values_list('admin_id', 'db_name')
+        )
+        alias_by_admin = {admin_id: db_name for admin_id, db_name in rows}
+        self._alias_by_admin = alias_by_admin
+        self._admin_by_alias = {db_name: admin_id for admin_id, db_name in alias_by_admin.items()}
+        self._fingerprint = fingerprint
+        self.version += 1
+
+    def _ensure_fresh(self):
+        now = time.monotonic()
+        if not self._stale and now - self._checked_at < self.ttl:
+            return
+        with self._lock:
+            if not self._stale and now - self._checked_at < self.ttl:
+                return
+            fingerprint = self._current_fingerprint()
+            if self._stale or fingerprint != self._fingerprint:
+                self._rebuild(fingerprint)
+            self._stale = False
+            self._checked_at = time.monotonic()
+
+    def aliases(self):
+        self._ensure_fresh()
+        return list(self._alias_by_admin.values())
+
+    def alias_for_admin(self, admin_id):
+        self._ensure_fresh()
+        try:
+            return self._alias_by_admin.get(int(admin_id))
+        except (TypeError, ValueError):
+            return None
+
+    def admin_for_alias(self, db_alias):
+        self._ensure_fresh()
+        return self._admin_by_alias.get(db_alias)
+
+    def is_tenant(self, db_alias):
+        self._ensure_fresh()
+        return db_alias in self._admin_by_alias
+
+    def alias_for_domain(self, raw_domain):
+        db_alias = resolve_tenant_alias(raw_domain)
+        if db_alias and self.is_tenant(db_alias):
+            return db_alias
+        return None
+
+
+tenant_directory = TenantDirectory()
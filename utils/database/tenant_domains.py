@@ -0,0 +1,88 @@
+import os
+import json
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+def _load_json_env(env_key, default):
+    try:
+        return json.loads(os.getenv(env_key, default))
+    except json.JSONDecodeError as err:
+        print(f"Error parsing {env_key} JSON: {err}")
+        return json.loads(default)
+
+
+def normalize_domain(raw_domain) -> str:
+    if not raw_domain:
+        return ""
+    domain = str(raw_domain).strip().lower()
+    domain = domain.replace("https://", "").replace("http://", "")
+    return domain.split("/")[0].strip()
+
+
+def _strip_port(domain: str) -> str:
+    return domain.rsplit(":", 1)[0] if ":" in domain else domain
+
+
+class DomainIndex:
+    """
+    Precomputed domain -> tenant lookups built once per process.
+
+    DOMAIN_DB_MAPPING is a list of {db_alias: [domains]} and DB_DOMAIN_MAPPING a
+    dict of {client_key: [domains]}. Both are flattened into plain dicts keyed by
+    the normalised domain so a lookup is a single hash probe.
+    """
+
+    def __init__(self, domain_db_mapping, db_domain_mapping):
+        self.alias_by_domain = {}
+        self.client_by_domain = {}
+
+        for entry in domain_db_mapping or []:
+            for db_alias, allowed_domains in entry.items():
+                for domain in allowed_domains or []:
+                    self.alias_by_domain.setdefault(normalize_domain(domain), db_alias)
+
+        for client_key, domain_list in (db_domain_mapping or {}).items():
+            client_name = client_key.split("_")[-1]
+            for domain in domain_list or []:
+                self.client_by_domain.setdefault(normalize_domain(domain), client_name)
+
+    def _lookup(self, table, raw_domain):
+        domain = normalize_domain(raw_domain)
+        if not domain:
+            return None
+        found = table.get(domain)
+        if found is None and ":" in domain:
+            found = table.get(_strip_port(domain))
+        return found
+
+    def tenant_alias(self, raw_domain):
+        return self._lookup(self.alias_by_domain, raw_domain)
+
+    def client_name(self, raw_domain):
+        return self._lookup(self.client_by_domain, raw_domain)
+
+
+domain_index = DomainIndex(
+    _load_json_env("DOMAIN_DB_MAPPING", "[]"),
+    _load_json_env("DB_DOMAIN_MAPPING", "{}"),
+)
+
+
+def request_domain(request) -> str:
+    raw_domain = (
+        request.META.get("HTTP_DOMAIN") or
+        request.META.get("HTTP_ORIGIN") or
+        request.META.get("HTTP_HOST") or
+        ""
+    )
+    return normalize_domain(raw_domain)
+
+
+def resolve_tenant_alias(raw_domain):
+    return domain_index.tenant_alias(raw_domain)
+
+
+def resolve_client_name(raw_domain, default="unknown_client"):
+    return domain_index.client_name(raw_domain) or default
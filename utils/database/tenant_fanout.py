@@ -0,0 +1,112 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from django.conf import settings
+from django.db import connections
+from utils.database.tenant_scope import tenant_alias
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_fanout_executor():
+    # One long-lived pool per process so worker threads keep their persistent
+    # tenant connections between reports instead of reconnecting every call.
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=getattr(settings, 'TENANT_FANOUT_WORKERS', 8),
+                    thread_name_prefix="tenant-fanout",
+                )
+    return _executor
+
+
+class FanOutResult:
+    def __init__(self):
+        self.results = {}
+        self.errors = {}
+        self.timings = {}
+
+    @property
+    def ok(self):
+        return not self.errors
+
+    def summary(self):
+        return {
+            "tenants_ok": len(self.results),
+            "tenants_failed": len(self.errors),
+            "errors": self.errors,
+        }
+
+
+def _set_statement_timeout(db_alias, seconds):
+    with connections[db_alias].cursor() as cursor:
+        if seconds:
+            cursor.execute("SET statement_timeout = %s", [int(seconds * 1000)])
+        else:
+            cursor.execute("RESET statement_timeout")
+
+
+def _run_for_tenant(db_alias, func, timeout, started_at):
+    started_at[db_alias] = time.monotonic()
+    with tenant_alias(db_alias):
+        if timeout:
+            _set_statement_timeout(db_alias, timeout)
+        try:
+            return func(db_alias)
+        finally:
+            if timeout:
+                try:
+                    _set_statement_timeout(db_alias, None)
+                except Exception as exc:
+                    print(f"Could not reset statement_timeout on {db_alias}: {exc}")
+
+
+def fan_out(db_aliases, func, timeout=None):
+    """
+    Runs func(db_alias) for every tenant concurrently, each inside its own
+    tenant scope, and collects whatever finishes.
+
+    timeout is per tenant, counted from when that tenant's task starts. It is
+    enforced on the server through statement_timeout, and the caller stops
+    waiting for that tenant once it passes. Failures and timeouts end up in
+    .errors; the other tenants' results are still returned.
+    """
+    outcome = FanOutResult()
+    started_at = {}
+    executor = get_fanout_executor()
+    futures = {
+        executor.submit(_run_for_tenant, db_alias, func, timeout, started_at): db_alias
+        for db_alias in dict.fromkeys(db_aliases)
+    }
+
+    pending = set(futures)
+    while pending:
+        wait_for = None
+        if timeout:
+            now = time.monotonic()
+            deadlines = [started_at[futures[f]] + timeout for f in pending if futures[f] in started_at]
+            wait_for = max(min(deadlines) - now, 0) if deadlines else timeout
+
+        done, pending = wait(pending, timeout=wait_for, return_when=FIRST_COMPLETED)
+        for future in done:
+            db_alias = futures[future]
+            outcome.timings[db_alias] = round(time.monotonic() - started_at.get(db_alias, time.monotonic()), 3)
+            try:
+                outcome.results[db_alias] = future.result()
+            except Exception as exc:
+                outcome.errors[db_alias] = str(exc)
+
+        if timeout:
+            now = time.monotonic()
+            for future in list(pending):
+                db_alias = futures[future]
+                if db_alias in started_at and now - started_at[db_alias] >= timeout:
+                    pending.discard(future)
+                    outcome.errors[db_alias] = f"Timed out after {timeout}s"
+                    outcome.timings[db_alias] = round(now - started_at[db_alias], 3)
+
+    return outcome
@@ -0,0 +1,68 @@
+import base64
+import heapq
+import json
+from datetime import datetime
+from decimal import Decimal
+from itertools import islice, repeat
+from django.db.models import Q
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(payload: dict) -> str:
+    raw = json.dumps(payload, separators=(",", ":"), default=str).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> dict:
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError) as exc:
+        raise InvalidCursor("Invalid or expired cursor.") from exc
+    if not isinstance(payload, dict):
+        raise InvalidCursor("Invalid or expired cursor.")
+    return payload
+
+
+def cursor_value(raw_value, value_type):
+    """Turns a cursor's JSON value back into the column type it was taken from."""
+    try:
+        if value_type == "datetime":
+            return datetime.fromisoformat(raw_value)
+        if value_type == "decimal":
+            return Decimal(raw_value)
+        return raw_value
+    except (ValueError, TypeError, ArithmeticError) as exc:
+        raise InvalidCursor("Invalid or expired cursor.") from exc
+
+
+def keyset_after(db_alias, sort_field, pk_field, last_key, descending=False):
+    """
+    Filter for the rows of `db_alias` that come after `last_key` in the global
+    (sort value, tenant alias, pk) order used by merge_tenant_rows.
+    """
+    last_value, last_alias, last_pk = last_key
+    lookup = "lt" if descending else "gt"
+    if db_alias == last_alias:
+        return Q(**{f"{sort_field}__{lookup}": last_value}) | Q(**{sort_field: last_value, f"{pk_field}__{lookup}": last_pk})
+
+    # Ties on the sort value are broken by alias, so a whole tenant sorts
+    # either before or after the cursor's tenant for an equal value.
+    ties_follow = db_alias < last_alias if descending else db_alias > last_alias
+    return Q(**{f"{sort_field}__{lookup}e" if ties_follow else f"{sort_field}__{lookup}": last_value})
+
+
+def merge_tenant_rows(rows_by_alias, sort_key, limit, descending=False):
+    """
+    K-way heap merge of per-tenant lists that are already sorted by sort_key.
+
+    Returns the first `limit` (db_alias, row) pairs in global order and whether
+    any rows were left over.
+    """
+    streams = [zip(repeat(db_alias), rows) for db_alias, rows in rows_by_alias.items()]
+    merged = heapq.merge(*streams, key=lambda item: sort_key(*item), reverse=descending)
+    page = list(islice(merged, limit + 1))
+    return page[:limit], len(page) > limit
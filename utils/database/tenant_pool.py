@@ -0,0 +1,236 @@
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from utils.database.tenant_connections import is_tenant_registered, register_tenant_database
+
+
+class TenantPoolExhausted(Exception):
+    pass
+
+
+class _TenantSlot:
+    __slots__ = ("alias", "wrapper", "owner", "leases", "last_used")
+
+    def __init__(self, alias, wrapper, owner):
+        self.alias = alias
+        self.wrapper = wrapper
+        self.owner = owner
+        self.leases = 0
+        self.last_used = time.monotonic()
+
+
+class TenantConnectionPool:
+    """
+    Caps how many tenant connections one process keeps open.
+
+    Django holds one connection per (thread, alias). Each of those is a slot
+    here, whether it was opened through lease() or by a plain .using(alias)
+    query (tracked via connection_created), so the cap counts every tenant
+    connection. When the cap is reached, callers wait up to
+    TENANT_POOL_WAIT_TIMEOUT seconds for room.
+
+    A connection is only closed by the thread that owns it, or once that
+    thread has exited: a slot without a lease may still be mid-query on an
+    unleased .using() call. Releasing the last lease while others wait closes
+    the releasing thread's own connection to hand its slot over.
+    """
+
+    def __init__(self, max_connections=None, wait_timeout=None):
+        self._max_connections = max_connections
+        self._wait_timeout = wait_timeout
+        self._slots = OrderedDict()
+        self._cond = threading.Condition(threading.Lock())
+        self._waiting = 0
+        self._counters = {
+            "leases": 0,
+            "reused": 0,
+            "opened": 0,
+            "evicted": 0,
+            "waits": 0,
+            "wait_seconds": 0.0,
+            "timeouts": 0,
+        }
+
+    @property
+    def max_connections(self):
+        if self._max_connections is not None:
+            return self._max_connections
+        return getattr(settings, "TENANT_POOL_MAX_CONNECTIONS", 50)
+
+    @property
+    def wait_timeout(self):
+        if self._wait_timeout is not None:
+            return self._wait_timeout
+        return getattr(settings, "TENANT_POOL_WAIT_TIMEOUT", 10)
+
+    @contextmanager
+    def lease(self, db_alias, timeout=None):
+        key = self._acquire(db_alias, timeout)
+        try:
+            yield db_alias
+        finally:
+            self._release(key)
+
+    def _acquire(self, db_alias, timeout):
+        register_tenant_database(db_alias)
+        key = (threading.get_ident(), db_alias)
+        wait_for = self.wait_timeout if timeout is None else timeout
+
+        with self._cond:
+            self._counters["leases"] += 1
+            slot = self._slots.get(key)
+            if slot is not None:
+                self._counters["reused"] += 1
+                slot.leases += 1
+                self._slots.move_to_end(key)
+                return key
+
+            self._sweep_closed()
+            if len(self._slots) >= self.max_connections:
+                self._wait_for_room(db_alias, wait_for)
+
+            slot = _TenantSlot(db_alias, connections[db_alias], key[0])
+            slot.leases = 1
+            self._slots[key] = slot
+            self._counters["opened"] += 1
+            return key
+
+    def _wait_for_room(self, db_alias, wait_for):
+        deadline = time.monotonic() + wait_for
+        started = time.monotonic()
+        self._counters["waits"] += 1
+        self._waiting += 1
+        try:
+            while len(self._slots) >= self.max_connections:
+                if self._evict_idle():
+                    continue
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._counters["timeouts"] += 1
+                    raise TenantPoolExhausted(
+                        f"No tenant connection available for {db_alias} "
+                        f"({self.max_connections} in use)"
+                    )
+                self._cond.wait(remaining)
+                self._sweep_closed()
+        finally:
+            self._waiting -= 1
+            self._counters["wait_seconds"] += time.monotonic() - started
+
+    def track(self, wrapper):
+        """Counts a tenant connection opened outside lease(); called on connection_created."""
+        key = (threading.get_ident(), wrapper.alias)
+        with self._cond:
+            if key in self._slots:
+                return
+            self._sweep_closed()
+            if len(self._slots) >= self.max_connections:
+                # Already open, so it cannot wait; make room where it is safe to.
+                self._evict_idle()
+            self._slots[key] = _TenantSlot(wrapper.alias, wrapper, key[0])
+            self._counters["opened"] += 1
+
+    def _release(self, key):
+        with self._cond:
+            slot = self._slots.get(key)
+            if slot is None:
+                return
+            slot.leases -= 1
+            slot.last_used = time.monotonic()
+            if slot.leases <= 0:
+                slot.leases = 0
+                if self._waiting:
+                    # We own this connection, so closing it here is safe.
+                    del self._slots[key]
+                    self._close_wrapper(slot)
+                    self._counters["evicted"] += 1
+                self._cond.notify()
+
+    def _closable(self, slot, live_threads):
+        return slot.leases == 0 and (slot.owner == threading.get_ident() or slot.owner not in live_threads)
+
+    def _evict_idle(self):
+        live_threads = {thread.ident for thread in threading.enumerate()}
+        for key, slot in self._slots.items():
+            if self._closable(slot, live_threads):
+                del self._slots[key]
+                self._close_wrapper(slot)
+                self._counters["evicted"] += 1
+                return True
+        return False
+
+    def _sweep_closed(self):
+        # Connections closed by Django itself (CONN_MAX_AGE, errors) free their slot.
+        stale = [
+            key for key, slot in self._slots.items()
+            if slot.leases == 0 and slot.wrapper.connection is None
+        ]
+        for key in stale:
+            del self._slots[key]
+
+    @staticmethod
+    def _close_wrapper(slot):
+        wrapper = slot.wrapper
+        # Only reached for our own connection or one whose thread has exited.
+        shared = slot.owner != threading.get_ident()
+        if shared:
+            wrapper.inc_thread_sharing()
+        try:
+            wrapper.close()
+        except Exception as exc:
+            print(f"Error closing tenant connection {wrapper.alias}: {exc}")
+        finally:
+            if shared:
+                wrapper.dec_thread_sharing()
+
+    def close_idle(self, older_than=0):
+        """Closes idle connections of the calling thread and of exited threads."""
+        closed = 0
+        now = time.monotonic()
+        live_threads = {thread.ident for thread in threading.enumerate()}
+        with self._cond:
+            for key, slot in list(self._slots.items()):
+                if self._closable(slot, live_threads) and now - slot.last_used >= older_than:
+                    del self._slots[key]
+                    self._close_wrapper(slot)
+                    closed += 1
+            if closed:
+                self._cond.notify_all()
+        return closed
+
+    def stats(self):
+        with self._cond:
+            per_alias = {}
+            in_use = 0
+            for slot in self._slots.values():
+                per_alias[slot.alias] = per_alias.get(slot.alias, 0) + 1
+                if slot.leases:
+                    in_use += 1
+            return {
+                "max_connections": self.max_connections,
+                "open": len(self._slots),
+                "in_use": in_use,
+                "idle": len(self._slots) - in_use,
+                "waiting": self._waiting,
+                "per_alias": per_alias,
+                **self._counters,
+            }
+
+
+tenant_pool = TenantConnectionPool()
+
+
+def _track_tenant_connection(sender, connection, **kwargs):
+    if connection.alias != 'default' and is_tenant_registered(connection.alias):
+        tenant_pool.track(connection)
+
+
+connection_created.connect(_track_tenant_connection, dispatch_uid="tenant_pool_track")
+
+
+def tenant_connection(db_alias, timeout=None):
+    return tenant_pool.lease(db_alias, timeout=timeout)
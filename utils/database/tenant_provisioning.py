@@ -0,0 +1,164 @@
+import time
+from functools import lru_cache
+from psycopg2 import sql, errors
+from django.conf import settings
+from django.db import connections
+from django.db.migrations.loader import MigrationLoader
+from django.db.migrations.recorder import MigrationRecorder
+from admin_hub.models import HierarchyLevel
+from control_panel.master_data import master_data
+from utils.database.admin_database_manage import (
+    get_maintenance_connection, setup_admin_database, run_migrations_for_admin,
+)
+from utils.database.tenant_connections import register_tenant_database
+
+
+def get_template_database_name() -> str:
+    return getattr(settings, 'TENANT_TEMPLATE_DATABASE', 'admin_db_template')
+
+
+def database_exists(db_identifier) -> bool:
+    conn = get_maintenance_connection()
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM pg_catalog.pg_database WHERE datname = %s", [db_identifier])
+            return cursor.fetchone() is not None
+    finally:
+        conn.close()
+
+
+@lru_cache(maxsize=1)
+def expected_migration_leaves():
+    loader = MigrationLoader(None, ignore_no_migrations=True)
+    return frozenset(loader.graph.leaf_nodes())
+
+
+def verify_tenant_database(db_alias):
+    """
+    Returns (missing_migrations, is_seeded) for a registered tenant alias.
+    Applied leaf migrations imply their ancestors, so only leaves are compared.
+    """
+    register_tenant_database(db_alias)
+    applied = set(MigrationRecorder(connections[db_alias]).applied_migrations())
+    missing = sorted(expected_migration_leaves() - applied)
+    is_seeded = HierarchyLevel.objects.using(db_alias).exists()
+    return missing, is_seeded
+
+
+def _close_local_connection(db_alias):
+    if db_alias in connections.settings:
+        connections[db_alias].close()
+
+
+def _set_template_flags(cursor, template_name, is_template):
+    cursor.execute(
+        sql.SQL("ALTER DATABASE {} WITH IS_TEMPLATE {} ALLOW_CONNECTIONS {}").format(
+            sql.Identifier(template_name),
+            sql.SQL("true" if is_template else "false"),
+            sql.SQL("false" if is_template else "true"),
+        )
+    )
+
+
+def refresh_template_database(template_name=None):
+    """
+    Brings the template database up to the current migrations and master data,
+    then locks it as a connection-less Postgres template.
+    """
+    template_name = template_name or get_template_database_name()
+
+    db_ready, db_message = setup_admin_database(template_name)
+    if not db_ready:
+        return False, f"Template database unavailable: {db_message}"
+
+    conn = get_maintenance_connection()
+    try:
+        with conn.cursor() as cursor:
+            _set_template_flags(cursor, template_name, is_template=False)
+
+        if not run_migrations_for_admin(template_name):
+            return False, "Template migration failed"
+        master_data(template_name)
+
+        missing, is_seeded = verify_tenant_database(template_name)
+        _close_local_connection(template_name)
+        if missing or not is_seeded:
+            return False, f"Template verification failed (missing={missing}, seeded={is_seeded})"
+
+        with conn.cursor() as cursor:
+            _set_template_flags(cursor, template_name, is_template=True)
+        return True, "Template database refreshed"
+    finally:
+        conn.close()
+
+
+def clone_from_template(db_identifier, template_name=None):
+    template_name = template_name or get_template_database_name()
+    _close_local_connection(template_name)
+
+    create_stmt = sql.SQL("CREATE DATABASE {} TEMPLATE {}").format(
+        sql.Identifier(db_identifier), sql.Identifier(template_name)
+    )
+    grant_stmt = sql.SQL("GRANT ALL ON DATABASE {} TO {}").format(
+        sql.Identifier(db_identifier), sql.Identifier(settings.DATABASES['default']['USER'])
+    )
+
+    conn = get_maintenance_connection()
+    try:
+        with conn.cursor() as cursor:
+            try:
+                cursor.execute(create_stmt)
+            except errors.ObjectInUse:
+                # A stray session on the template blocks the copy; drop it and retry once.
+                cursor.execute(
+                    "SELECT pg_terminate_backend(pid) FROM pg_stat_activity "
+                    "WHERE datname = %s AND pid <> pg_backend_pid()",
+                    [template_name]
+                )
+                cursor.execute(create_stmt)
+            cursor.execute(grant_stmt)
+    finally:
+        conn.close()
+
+
+def provision_from_scratch(db_identifier):
+    db_ready, db_message = setup_admin_database(db_identifier)
+    if not db_ready:
+        return False, f"Database creation failed: {db_message}"
+    if not run_migrations_for_admin(db_identifier):
+        return False, "Migration failed"
+    master_data(db_identifier)
+    return True, "Database created and migrated"
+
+
+def provision_tenant_database(db_identifier):
+    """
+    Creates a tenant database by cloning the template (a metadata copy inside
+    Postgres). Falls back to create + migrate + seed when the template is missing
+    or the clone cannot be verified. Returns (ok, message).
+    """
+    started = time.monotonic()
+    template_name = get_template_database_name()
+
+    try:
+        if not database_exists(db_identifier) and database_exists(template_name):
+            clone_from_template(db_identifier, template_name)
+            register_tenant_database(db_identifier)
+
+            missing, is_seeded = verify_tenant_database(db_identifier)
+            if missing:
+                # Template is behind the code; apply only the newer migrations.
+                run_migrations_for_admin(db_identifier)
+                missing, is_seeded = verify_tenant_database(db_identifier)
+            if not is_seeded:
+                master_data(db_identifier)
+                missing, is_seeded = verify_tenant_database(db_identifier)
+
+            if not missing and is_seeded:
+                elapsed = time.monotonic() - started
+                return True, f"Database cloned from {template_name} in {elapsed:.2f}s"
+            print(f"Template clone of {db_identifier} failed verification: missing={missing}")
+    except Exception as exc:
+        print(f"Template clone failed for {db_identifier}: {exc}")
+
+    return provision_from_scratch(db_identifier)
@@ -0,0 +1,43 @@
+from admin_hub.thread_local import get_current_tenant
+
+
+TENANT_APP_LABELS = {"admin_hub"}
+SHARED_APP_LABELS = {"control_panel", "web_portal"}
+
+
+class TenantDatabaseRouter:
+    """
+    Routes admin_hub models to the tenant bound by a `with tenant(...)` /
+    `with tenant_alias(...)` scope, and the shared apps to 'default'. Outside
+    a scope admin_hub goes to 'default', even on a tenant domain.
+
+    An explicit .using(alias) always wins, and instances stay on the database
+    they were loaded from.
+    """
+
+    def _route(self, model, **hints):
+        instance = hints.get("instance")
+        if instance is not None and instance._state.db:
+            return instance._state.db
+
+        app_label = model._meta.app_label
+        if app_label in TENANT_APP_LABELS:
+            return get_current_tenant()
+        if app_label in SHARED_APP_LABELS:
+            return "default"
+        return None
+
+    def db_for_read(self, model, **hints):
+        return self._route(model, **hints)
+
+    def db_for_write(self, model, **hints):
+        return self._route(model, **hints)
+
+    def allow_relation(self, obj1, obj2, **hints):
+        if obj1._state.db and obj2._state.db:
+            return obj1._state.db == obj2._state.db
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Every app is migrated into every tenant database today.
+        return None
@@ -0,0 +1,31 @@
+from contextlib import contextmanager
+from admin_hub.thread_local import set_current_tenant, reset_current_tenant
+from control_panel.models import Admin
+from utils.database.tenant_directory import tenant_directory
+from utils.database.tenant_pool import tenant_connection
+
+
+def get_admin_db_name(admin_id) -> str:
+    db_name = tenant_directory.alias_for_admin(admin_id)
+    if not db_name:
+        # Inactive admins are not in the directory but their data is still reachable.
+        db_name = Admin.objects.filter(admin_id=admin_id).values_list("db_name", flat=True).first()
+    if not db_name:
+        raise Admin.DoesNotExist(f"No tenant database for admin {admin_id}")
+    return db_name
+
+
+@contextmanager
+def tenant_alias(db_alias):
+    with tenant_connection(db_alias):
+        token = set_current_tenant(db_alias)
+        try:
+            yield db_alias
+        finally:
+            reset_current_tenant(token)
+
+
+@contextmanager
+def tenant(admin_id):
+    with tenant_alias(get_admin_db_name(admin_id)) as db_alias:
+        yield db_alias
@@ -0,0 +1,219 @@
+import threading
+import uuid
+from datetime import timedelta
+from psycopg2 import sql, errors
+from django.conf import settings
+from django.db import connections, transaction
+from django.utils.timezone import now
+from control_panel.models import TenantDatabasePool
+from utils.database.admin_database_manage import get_maintenance_connection
+from utils.database.tenant_connections import register_tenant_database, unregister_tenant_database
+from utils.database.tenant_provisioning import provision_tenant_database, verify_tenant_database
+
+
+_refill_lock = threading.Lock()
+# pg_advisory_xact_lock key serialising refills across processes.
+WARM_POOL_REFILL_LOCK = 7_340_001
+
+
+def get_warm_pool_size() -> int:
+    return getattr(settings, 'TENANT_WARM_POOL_SIZE', 5)
+
+
+def get_provisioning_timeout() -> int:
+    return getattr(settings, 'TENANT_WARM_POOL_PROVISIONING_TIMEOUT', 1800)
+
+
+def new_pool_database_name() -> str:
+    return f"admin_pool_{uuid.uuid4().hex[:12]}"
+
+
+def _terminate_sessions(cursor, db_name):
+    cursor.execute(
+        "SELECT pg_terminate_backend(pid) FROM pg_stat_activity "
+        "WHERE datname = %s AND pid <> pg_backend_pid()",
+        [db_name]
+    )
+
+
+def rename_database(old_name, new_name):
+    unregister_tenant_database(old_name)
+    conn = get_maintenance_connection()
+    try:
+        with conn.cursor() as cursor:
+            _terminate_sessions(cursor, old_name)
+            cursor.execute(
+                sql.SQL("ALTER DATABASE {} RENAME TO {}").format(
+                    sql.Identifier(old_name), sql.Identifier(new_name)
+                )
+            )
+    finally:
+        conn.close()
+
+
+def drop_database(db_name):
+    unregister_tenant_database(db_name)
+    conn = get_maintenance_connection()
+    try:
+        with conn.cursor() as cursor:
+            _terminate_sessions(cursor, db_name)
+            cursor.execute(sql.SQL("DROP DATABASE IF EXISTS {}").format(sql.Identifier(db_name)))
+    finally:
+        conn.close()
+
+
+def add_warm_database():
+    return _provision_slot(TenantDatabasePool.objects.create(db_name=new_pool_database_name()))
+
+
+def _provision_slot(slot):
+    try:
+        ok, message = provision_tenant_database(slot.db_name)
+    except Exception as exc:
+        ok, message = False, str(exc)
+    finally:
+        # RENAME needs the database free of sessions, including ours.
+        unregister_tenant_database(slot.db_name)
+
+    if ok:
+        slot.status = TenantDatabasePool.STATUS_READY
+        slot.ready_on = now()
+        slot.error_message = None
+    else:
+        slot.status = TenantDatabasePool.STATUS_FAILED
+        slot.error_message = message
+    slot.save(update_fields=['status', 'ready_on', 'error_message'])
+    return slot
+
+
+def reap_stale_provisioning():
+    """
+    Fails PROVISIONING slots older than the provisioning timeout. A refill that
+    crashed mid-way leaves its slot PROVISIONING, which would otherwise count
+    toward the target forever; as FAILED it is retried and can be pruned.
+    """
+    cutoff = now() - timedelta(seconds=get_provisioning_timeout())
+    return TenantDatabasePool.objects.filter(
+        status=TenantDatabasePool.STATUS_PROVISIONING, created_on__lt=cutoff
+    ).update(status=TenantDatabasePool.STATUS_FAILED, error_message="Provisioning did not finish in time.")
+
+
+def fill_warm_pool(target_size=None):
+    """
+    Tops the pool up to target_size. The shortfall is counted and its slots
+    reserved as PROVISIONING under one advisory lock, so concurrent refills
+    in any process never clone past the target; the slow cloning runs after
+    the lock is released.
+    """
+    target_size = get_warm_pool_size() if target_size is None else target_size
+    with transaction.atomic(using='default'):
+        with connections['default'].cursor() as cursor:
+            cursor.execute("SELECT pg_advisory_xact_lock(%s)", [WARM_POOL_REFILL_LOCK])
+        reap_stale_provisioning()
+        pending = TenantDatabasePool.objects.filter(
+            status__in=[TenantDatabasePool.STATUS_READY, TenantDatabasePool.STATUS_PROVISIONING]
+        ).count()
+        slots = [
+            TenantDatabasePool.objects.create(db_name=new_pool_database_name())
+            for _ in range(max(target_size - pending, 0))
+        ]
+    return [_provision_slot(slot) for slot in slots]
+
+
+def refill_warm_pool_async():
+    """
+    Tops the pool up on a daemon thread. A refill already in progress in this
+    process makes this a no-op.
+    """
+    if not _refill_lock.acquire(blocking=False):
+        return None
+
+    def _refill():
+        try:
+            fill_warm_pool()
+        except Exception as exc:
+            print(f"Warm pool refill failed: {exc}")
+        finally:
+            connections.close_all()
+            _refill_lock.release()
+
+    worker = threading.Thread(target=_refill, name="tenant-warm-pool-refill", daemon=True)
+    worker.start()
+    return worker
+
+
+def _release_slot(slot, status=TenantDatabasePool.STATUS_READY, error_message=None):
+    slot.status = status
+    slot.claimed_as = None
+    slot.claimed_on = None
+    slot.error_message = error_message
+    slot.save(update_fields=['status', 'claimed_as', 'claimed_on', 'error_message'])
+
+
+def claim_warm_database(db_identifier):
+    """
+    Takes one READY database and renames it to db_identifier. Returns the
+    claimed slot, or None when the pool is empty.
+
+    ALTER DATABASE cannot run inside a transaction, so the slot is reserved
+    and committed first, then the database renamed, then the slot records the
+    new name. A failure after the rename renames the database back and
+    returns the slot to the pool.
+    """
+    while True:
+        with transaction.atomic(using='default'):
+            slot = (
+                TenantDatabasePool.objects.select_for_update(skip_locked=True)
+                .filter(status=TenantDatabasePool.STATUS_READY)
+                .order_by('pool_id')
+                .first()
+            )
+            if slot is None:
+                return None
+            slot.status = TenantDatabasePool.STATUS_CLAIMED
+            slot.save(update_fields=['status'])
+
+        try:
+            rename_database(slot.db_name, db_identifier)
+        except errors.InvalidCatalogName as exc:
+            # The pooled database vanished; retire the slot and try the next one.
+            _release_slot(slot, TenantDatabasePool.STATUS_FAILED, str(exc))
+            continue
+        except Exception:
+            _release_slot(slot)
+            raise
+
+        try:
+            slot.claimed_as = db_identifier
+            slot.claimed_on = now()
+            slot.save(update_fields=['claimed_as', 'claimed_on'])
+        except Exception:
+            rename_database(db_identifier, slot.db_name)
+            _release_slot(slot)
+            raise
+
+        register_tenant_database(db_identifier)
+        return slot
+
+
+def acquire_tenant_database(db_identifier):
+    """
+    Provisioning entry point for new admins: claims a warm database when one is
+    ready, otherwise clones the template inline. Either way the pool is refilled
+    in the background. Returns (ok, message).
+    """
+    try:
+        slot = claim_warm_database(db_identifier)
+    except Exception as exc:
+        print(f"Warm pool claim failed for {db_identifier}: {exc}")
+        slot = None
+
+    refill_warm_pool_async()
+
+    if slot is not None:
+        missing, is_seeded = verify_tenant_database(db_identifier)
+        if not missing and is_seeded:
+            return True, f"Database claimed from warm pool ({slot.db_name})"
+        return provision_tenant_database(db_identifier)
+
+    return provision_tenant_database(db_identifier)
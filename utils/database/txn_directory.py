@@ -0,0 +1,115 @@
+from decimal import Decimal, InvalidOperation
+from django.db import transaction
+from admin_hub.models import ServiceTransaction
+from control_panel.models import Admin, TransactionReference
+from utils.database.service_tables import SERVICE_TABLES
+from utils.database.tenant_directory import tenant_directory
+
+
+TXN_DIRECTORY_CHUNK_SIZE = 2000
+TXN_DIRECTORY_FIELDS = ["txn_ref", "db_name", "provider_id", "txn_amount", "txn_status", "created_at"]
+
+
+def _admin_id_for(db_alias):
+    admin_id = tenant_directory.admin_for_alias(db_alias)
+    if admin_id is None:
+        admin_id = Admin.objects.using('default').filter(db_name=db_alias).values_list('admin_id', flat=True).first()
+    return admin_id
+
+
+def _amount(raw_value):
+    # Some service tables keep amounts in CharFields; the view casts the same way.
+    try:
+        return Decimal(str(raw_value).strip()).quantize(Decimal('0.01'))
+    except (InvalidOperation, TypeError, ValueError):
+        return None
+
+
+def _upsert(entries):
+    TransactionReference.objects.using('default').bulk_create(
+        entries,
+        update_conflicts=True,
+        unique_fields=["admin_id", "service_table", "service_id"],
+        update_fields=TXN_DIRECTORY_FIELDS + ["synced_on"],
+    )
+
+
+def record_service_transaction(db_alias, table, instance):
+    """Upserts the directory row for one service-table record of tenant db_alias."""
+    admin_id = _admin_id_for(db_alias)
+    txn_ref = getattr(instance, table.ref_field, None)
+    if admin_id is None or not txn_ref:
+        return
+
+    _upsert([TransactionReference(
+        txn_ref=txn_ref,
+        admin_id=admin_id,
+        db_name=db_alias,
+        service_table=table.db_table,
+        service_id=instance.pk,
+        provider_id=getattr(instance, table.provider_attname, None),
+        txn_amount=_amount(getattr(instance, table.amount_field, None)),
+        txn_status=getattr(instance, table.status_field, None) if table.status_field else None,
+        created_at=getattr(instance, table.created_field, None),
+    )])
+
+
+def record_on_commit(sender, instance, using, **kwargs):
+    """post_save receiver for every registered service table."""
+    table = SERVICE_TABLES.get(sender._meta.db_table)
+    if not table or using == 'default':
+        return
+
+    def _record():
+        try:
+            record_service_transaction(using, table, instance)
+        except Exception as exc:
+            # The tenant write already committed; backfill_txn_directory repairs misses.
+            print(f"Error recording txn_ref directory entry for {using}.{table.db_table}#{instance.pk}: {exc}")
+
+    transaction.on_commit(_record, using=using)
+
+
+def backfill_tenant(db_alias, chunk_size=TXN_DIRECTORY_CHUNK_SIZE):
+    """Copies every row of the tenant's all_service_transactions view into the directory."""
+    admin_id = _admin_id_for(db_alias)
+    if admin_id is None:
+        raise Admin.DoesNotExist(f"No admin owns database {db_alias}")
+
+    rows = (
+        ServiceTransaction.objects.using(db_alias)
+        .exclude(txn_ref__isnull=True).exclude(txn_ref='')
+        .values_list('service_table', 'service_id', 'txn_ref', 'provider_id', 'txn_amount', 'txn_status', 'created_at')
+        .iterator(chunk_size=chunk_size)
+    )
+
+    total = 0
+    pending = []
+    for service_table, service_id, txn_ref, provider_id, txn_amount, txn_status, created_at in rows:
+        pending.append(TransactionReference(
+            txn_ref=txn_ref, admin_id=admin_id, db_name=db_alias,
+            service_table=service_table, service_id=service_id, provider_id=provider_id,
+            txn_amount=txn_amount, txn_status=txn_status, created_at=created_at,
+        ))
+        if len(pending) >= chunk_size:
+            _upsert(pending)
+            total += len(pending)
+            pending = []
+    if pending:
+        _upsert(pending)
+        total += len(pending)
+    return total
+
+
+def resolve_txn_ref(txn_ref, admin_id=None, service_table=None):
+    """
+    Directory entry for txn_ref, narrowed by admin and service table when given.
+    Returns None when the reference is unknown or still ambiguous.
+    """
+    entries = TransactionReference.objects.using('default').filter(txn_ref=txn_ref)
+    if admin_id:
+        entries = entries.filter(admin_id=admin_id)
+    if service_table:
+        entries = entries.filter(service_table=service_table)
+    matches = list(entries[:2])
+    return matches[0] if len(matches) == 1 else None
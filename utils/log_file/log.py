@@ -5,30 +5,16 @@ from pathlib import Path
 from loguru import logger
 from django.core.files.uploadedfile import UploadedFile
 from dotenv import load_dotenv
+from utils.database.tenant_domains import resolve_client_name
 
 load_dotenv()
 
-DB_DOMAIN_MAPPING = os.getenv("DB_DOMAIN_MAPPING", "{}")
-
-try:
-    domain_to_client_map = json.loads(DB_DOMAIN_MAPPING)
-except json.JSONDecodeError as exc:
-    print(f"Failed to parse DB_DOMAIN_MAPPING JSON: {exc}")
-    domain_to_client_map = {}
-
-
 LOG_BASE_DIRECTORY = "application_logs"
 logger.remove()
 
 
 def extract_client_from_domain(host_domain: str):
-    host_domain = host_domain.lower().replace("https://", "").replace("http://", "").strip("/")
-
-    for client_key, domain_list in domain_to_client_map.items():
-        if any(host_domain == d.lower() for d in domain_list):
-            return client_key.split("_")[-1] 
-    
-    return "unknown_client"
+    return resolve_client_name(host_domain)
 
 
 def clean_old_logs(log_path: Path):
@@ -106,7 +92,7 @@ def save_api_log(request,endpoint_source: str,input_payload,output_response,serv
         if client_override == "fintach_backend_db":
             client_name = "fintach_backend_db"
         else:
-            client_name = extract_client_from_domain(domain)
+            client_name = getattr(request, "tenant_client", None) or extract_client_from_domain(domain)
             
         safe_input_data = make_serializable(input_payload)
 
@@ -0,0 +1,185 @@
+from collections import defaultdict
+from datetime import timedelta
+from decimal import Decimal
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, Count, DecimalField, F, Sum, Value, When
+from django.db.models.functions import Coalesce, TruncDay, TruncMonth
+from django.utils.timezone import now
+from admin_hub.models import WalletCheckpoint, WalletHistory
+from admin_hub.thread_local import get_current_tenant
+from utils.wallet.engine import WALLET_BALANCE_FIELDS, balance_field
+
+
+CHECKPOINT_CHUNK_SIZE = 2000
+
+PERIOD_TRUNC = {
+    WalletCheckpoint.PERIOD_DAILY: TruncDay,
+    WalletCheckpoint.PERIOD_MONTHLY: TruncMonth,
+}
+
+SIGNED_AMOUNT = Case(
+    When(change_type='CR', then=F('changed_amount')),
+    When(change_type='DR', then=-F('changed_amount')),
+    default=Value(Decimal('0')),
+    output_field=DecimalField(max_digits=20, decimal_places=3),
+)
+
+
+def wallet_names(field):
+    """Every wallet_name that history rows use for the balance column `field`."""
+    return [name for name, target in WALLET_BALANCE_FIELDS.items() if target == field]
+
+
+def _next_period(start, period):
+    if period == WalletCheckpoint.PERIOD_DAILY:
+        return start + timedelta(days=1)
+    if start.month == 12:
+        return start.replace(year=start.year + 1, month=1)
+    return start.replace(month=start.month + 1)
+
+
+def _current_period_start(period):
+    """Start of the newest period that is not yet safe to checkpoint."""
+    # Rows stamped just before a boundary can commit just after it.
+    cutoff = now() - timedelta(seconds=getattr(settings, 'WALLET_CHECKPOINT_GRACE', 300))
+    start = cutoff.replace(hour=0, minute=0, second=0, microsecond=0)
+    if period == WalletCheckpoint.PERIOD_MONTHLY:
+        start = start.replace(day=1)
+    return start
+
+
+def _latest_checkpoints(db_alias, before=None, user_id=None, period=None, wallet=None):
+    """{(user_id, wallet_name): checkpoint} holding the newest checkpoint of each pair."""
+    checkpoints = WalletCheckpoint.objects.using(db_alias)
+    if before is not None:
+        checkpoints = checkpoints.filter(period_end__lte=before)
+    if user_id is not None:
+        checkpoints = checkpoints.filter(user_id=user_id)
+    if period is not None:
+        checkpoints = checkpoints.filter(period=period)
+    if wallet is not None:
+        checkpoints = checkpoints.filter(wallet_name=wallet)
+    checkpoints = checkpoints.order_by('user_id', 'wallet_name', '-period_end').distinct('user_id', 'wallet_name')
+    return {(checkpoint.user_id, checkpoint.wallet_name): checkpoint for checkpoint in checkpoints}
+
+
+def build_checkpoints(period, db_alias=None, chunk_size=CHECKPOINT_CHUNK_SIZE):
+    """
+    Adds checkpoints for every complete `period` since the tenant's last one.
+
+    One grouped query sums the signed history per (user, wallet, period);
+    each new checkpoint is the pair's previous checkpoint plus that sum. Only
+    pairs with activity in a period get a row. as-of reads use whichever
+    checkpoint is nearest, so quiet wallets need none. Returns rows written.
+    """
+    db_alias = db_alias or get_current_tenant() or 'default'
+    trunc = PERIOD_TRUNC[period]
+    last_end = WalletCheckpoint.objects.using(db_alias).filter(period=period).order_by('-period_end').values_list('period_end', flat=True).first()
+    until = _current_period_start(period)
+    if last_end is not None and last_end >= until:
+        return 0
+
+    # Seed from the newest checkpoint of either series at or before last_end:
+    # both are complete up to their own end, and pruning may have removed a
+    # quiet wallet's last daily row while a monthly one still covers it.
+    running = {}
+    if last_end is not None:
+        running = {key: checkpoint.balance for key, checkpoint in _latest_checkpoints(db_alias, before=last_end).items()}
+
+    history = WalletHistory.objects.using(db_alias).filter(created_at__lt=until)
+    if last_end is not None:
+        history = history.filter(created_at__gte=last_end)
+    buckets = (
+        history.annotate(bucket=trunc('created_at'))
+        .values('bucket', 'user_id', 'wallet_name')
+        .annotate(delta=Coalesce(Sum(SIGNED_AMOUNT), Value(Decimal('0')), output_field=DecimalField(max_digits=20, decimal_places=3)), entries=Count('history_id'))
+        .order_by('bucket')
+    )
+
+    written = 0
+    pending = []
+    current_bucket = None
+    period_deltas = defaultdict(lambda: [Decimal('0'), 0])
+
+    def flush_period():
+        for (user_id, field), (delta, entries) in period_deltas.items():
+            balance = running.get((user_id, field), Decimal('0')) + delta
+            running[(user_id, field)] = balance
+            pending.append(WalletCheckpoint(
+                user_id=user_id, wallet_name=field, period=period,
+                period_end=_next_period(current_bucket, period), balance=balance, entry_count=entries,
+            ))
+        period_deltas.clear()
+
+    with transaction.atomic(using=db_alias):
+        for row in buckets.iterator(chunk_size=chunk_size):
+            field = balance_field(row['wallet_name'])
+            if not field:
+                continue
+            if row['bucket'] != current_bucket:
+                if current_bucket is not None:
+                    flush_period()
+                current_bucket = row['bucket']
+            totals = period_deltas[(row['user_id'], field)]
+            totals[0] += row['delta']
+            totals[1] += row['entries']
+
+            if len(pending) >= chunk_size:
+                WalletCheckpoint.objects.using(db_alias).bulk_create(pending, ignore_conflicts=True)
+                written += len(pending)
+                pending = []
+
+        if current_bucket is not None:
+            flush_period()
+        if pending:
+            WalletCheckpoint.objects.using(db_alias).bulk_create(pending, ignore_conflicts=True)
+            written += len(pending)
+    return written
+
+
+def prune_daily_checkpoints(before, db_alias=None):
+    """Drops daily checkpoints older than `before` that a monthly checkpoint already covers."""
+    db_alias = db_alias or get_current_tenant() or 'default'
+    covered_until = WalletCheckpoint.objects.using(db_alias).filter(
+        period=WalletCheckpoint.PERIOD_MONTHLY
+    ).order_by('-period_end').values_list('period_end', flat=True).first()
+    if covered_until is None:
+        return 0
+    deleted, _ = WalletCheckpoint.objects.using(db_alias).filter(
+        period=WalletCheckpoint.PERIOD_DAILY, period_end__lt=min(before, covered_until)
+    ).delete()
+    return deleted
+
+
+def _balance_from(db_alias, user_id, field, as_of, checkpoint):
+    tail = WalletHistory.objects.using(db_alias).filter(user_id=user_id, wallet_name__in=wallet_names(field), created_at__lt=as_of)
+    if checkpoint:
+        tail = tail.filter(created_at__gte=checkpoint.period_end)
+    delta = tail.aggregate(delta=Sum(SIGNED_AMOUNT))['delta'] or Decimal('0')
+    return (checkpoint.balance if checkpoint else Decimal('0')) + delta
+
+
+def balances_as_of(user_id, as_of, db_alias=None):
+    """
+    {balance field: balance} for the user at instant `as_of`: the nearest
+    checkpoint at or before as_of plus the signed history after it, so the
+    cost is one indexed read per wallet plus the tail since its checkpoint.
+    """
+    db_alias = db_alias or get_current_tenant() or 'default'
+    checkpoints = {
+        wallet: checkpoint for (_, wallet), checkpoint in _latest_checkpoints(db_alias, before=as_of, user_id=user_id).items()
+    }
+    return {
+        field: _balance_from(db_alias, user_id, field, as_of, checkpoints.get(field))
+        for field in sorted(set(WALLET_BALANCE_FIELDS.values()))
+    }
+
+
+def balance_as_of(user_id, wallet, as_of, db_alias=None):
+    field = balance_field(wallet)
+    if not field:
+        raise ValueError(f"Unknown wallet: {wallet}")
+    db_alias = db_alias or get_current_tenant() or 'default'
+    checkpoint = _latest_checkpoints(db_alias, before=as_of, user_id=user_id, wallet=field).get((user_id, field))
+    return _balance_from(db_alias, user_id, field, as_of, checkpoint)
@@ -0,0 +1,172 @@
+from decimal import Decimal, InvalidOperation
+from django.db import connections, transaction
+from django.utils.timezone import now
+from admin_hub.models import PortalUserBalance, WalletHistory
+from admin_hub.thread_local import get_current_tenant
+
+
+# Older ledger rows and API payloads use the legacy wallet names.
+WALLET_BALANCE_FIELDS = {
+    'main_wallet': 'primary_balance',
+    'commission_wallet': 'earnings_balance',
+    'cashin_wallet': 'deposit_balance',
+    'pg_wallet': 'gateway_balance',
+    'primary_balance': 'primary_balance',
+    'earnings_balance': 'earnings_balance',
+    'deposit_balance': 'deposit_balance',
+    'gateway_balance': 'gateway_balance',
+}
+HOLD_FIELD = 'hold_balance'
+
+
+class WalletError(Exception):
+    pass
+
+
+class WalletNotFound(WalletError):
+    pass
+
+
+class InsufficientBalance(WalletError):
+    pass
+
+
+class Posting:
+    __slots__ = ("history_id", "user_id", "wallet", "amount", "change_type", "balance_after")
+
+    def __init__(self, history_id, user_id, wallet, amount, change_type, balance_after):
+        self.history_id = history_id
+        self.user_id = user_id
+        self.wallet = wallet
+        self.amount = amount
+        self.change_type = change_type
+        self.balance_after = balance_after
+
+
+def balance_field(wallet_name):
+    return WALLET_BALANCE_FIELDS.get(wallet_name)
+
+
+def _amount(raw_amount):
+    try:
+        amount = Decimal(str(raw_amount))
+    except (InvalidOperation, TypeError, ValueError):
+        raise WalletError("Invalid amount.")
+    if not amount.is_finite() or amount <= 0:
+        raise WalletError("Amount must be greater than zero.")
+    return amount
+
+
+def _wallet(wallet_name):
+    field = balance_field(wallet_name)
+    if not field:
+        raise WalletError(f"Unknown wallet: {wallet_name}")
+    return field
+
+
+def _column(model, field_name):
+    return model._meta.get_field(field_name).column
+
+
+def _post(db_alias, user_id, deltas, history_field, change_type, amount, action_name, remarks, reference_id):
+    """
+    One statement: apply `deltas` ({balance field: signed amount}) to the
+    user's wallet row, refusing to take any touched balance below zero, and
+    insert the WalletHistory row from the UPDATE's RETURNING.
+
+    The UPDATE takes the row lock itself, so concurrent postings queue on
+    the row instead of overwriting each other, and nothing is held between
+    statements.
+    """
+    db_alias = db_alias or get_current_tenant() or 'default'
+    qn = connections[db_alias].ops.quote_name
+    balances = PortalUserBalance._meta.db_table
+    history = WalletHistory._meta.db_table
+    user_column = _column(PortalUserBalance, 'user')
+
+    assignments, guards, params = [], [], []
+    for field, delta in deltas.items():
+        column = qn(_column(PortalUserBalance, field))
+        assignments.append(f"{column} = COALESCE({column}, 0) + %s")
+        params.append(delta)
+        if delta < 0:
+            guards.append(f"COALESCE({column}, 0) + %s >= 0")
+    assignments.append(f"{qn(_column(PortalUserBalance, 'last_updated_on'))} = %s")
+    posted_at = now()
+    params.append(posted_at)
+    params.append(user_id)
+    params += [delta for delta in deltas.values() if delta < 0]
+
+    sql = f"""
+        WITH moved AS (
+            UPDATE {qn(balances)} SET {', '.join(assignments)}
+            WHERE {qn(user_column)} = %s{''.join(f' AND {guard}' for guard in guards)}
+            RETURNING {qn(user_column)} AS user_id, {qn(_column(PortalUserBalance, history_field))} AS balance_after
+        )
+        INSERT INTO {qn(history)} (
+            {qn(_column(WalletHistory, 'reference_id'))}, {qn(_column(WalletHistory, 'action_name'))},
+            {qn(_column(WalletHistory, 'user'))}, {qn(_column(WalletHistory, 'wallet_name'))},
+            {qn(_column(WalletHistory, 'changed_amount'))}, {qn(_column(WalletHistory, 'change_type'))},
+            {qn(_column(WalletHistory, 'balance_after'))}, {qn(_column(WalletHistory, 'remarks'))},
+            {qn(_column(WalletHistory, 'transaction_date'))}, {qn(_column(WalletHistory, 'created_at'))}
+        )
+        SELECT %s, %s, moved.user_id, %s, %s, %s, moved.balance_after, %s, %s, %s FROM moved
+        RETURNING {qn(WalletHistory._meta.pk.column)}, {qn(_column(WalletHistory, 'balance_after'))}
+    """
+    params += [reference_id, action_name[:150], history_field, amount, change_type, (remarks or '')[:500], posted_at, posted_at]
+
+    with connections[db_alias].cursor() as cursor:
+        cursor.execute(sql, params)
+        row = cursor.fetchone()
+
+    if row is None:
+        # Only the failure path pays for telling the two cases apart.
+        if not PortalUserBalance.objects.using(db_alias).filter(user_id=user_id).exists():
+            raise WalletNotFound(f"Wallet not found for user {user_id}.")
+        raise InsufficientBalance("Insufficient balance.")
+    return Posting(row[0], user_id, history_field, amount, change_type, row[1])
+
+
+def credit(user_id, wallet, amount, action_name, remarks='', reference_id=None, db_alias=None):
+    field, amount = _wallet(wallet), _amount(amount)
+    return _post(db_alias, user_id, {field: amount}, field, 'CR', amount, action_name, remarks, reference_id)
+
+
+def debit(user_id, wallet, amount, action_name, remarks='', reference_id=None, db_alias=None):
+    field, amount = _wallet(wallet), _amount(amount)
+    return _post(db_alias, user_id, {field: -amount}, field, 'DR', amount, action_name, remarks, reference_id)
+
+
+def hold(user_id, amount, action_name, remarks='', reference_id=None, wallet='primary_balance', db_alias=None):
+    """Moves amount from wallet into hold_balance."""
+    field, amount = _wallet(wallet), _amount(amount)
+    return _post(db_alias, user_id, {field: -amount, HOLD_FIELD: amount}, field, 'DR', amount, action_name, remarks, reference_id)
+
+
+def release(user_id, amount, action_name, remarks='', reference_id=None, wallet='primary_balance', refund=True, db_alias=None):
+    """
+    Takes amount off hold_balance. With refund it goes back to wallet;
+    otherwise the hold is consumed and the history row is written against hold_balance.
+    """
+    amount = _amount(amount)
+    if refund:
+        field = _wallet(wallet)
+        return _post(db_alias, user_id, {HOLD_FIELD: -amount, field: amount}, field, 'CR', amount, action_name, remarks, reference_id)
+    return _post(db_alias, user_id, {HOLD_FIELD: -amount}, HOLD_FIELD, 'DR', amount, action_name, remarks, reference_id)
+
+
+def transfer(from_user_id, to_user_id, amount, action_name, remarks='', reference_id=None,
+             from_wallet='primary_balance', to_wallet='primary_balance', db_alias=None):
+    """Debit and credit in one transaction; (debit posting, credit posting)."""
+    if from_user_id == to_user_id and balance_field(from_wallet) == balance_field(to_wallet):
+        raise WalletError("Cannot transfer to the same wallet.")
+    db_alias = db_alias or get_current_tenant() or 'default'
+    with transaction.atomic(using=db_alias):
+        # Rows are always locked in user_id order so opposite transfers cannot deadlock.
+        if from_user_id <= to_user_id:
+            debited = debit(from_user_id, from_wallet, amount, action_name, remarks, reference_id, db_alias)
+            credited = credit(to_user_id, to_wallet, amount, action_name, remarks, reference_id, db_alias)
+        else:
+            credited = credit(to_user_id, to_wallet, amount, action_name, remarks, reference_id, db_alias)
+            debited = debit(from_user_id, from_wallet, amount, action_name, remarks, reference_id, db_alias)
+    return debited, credited
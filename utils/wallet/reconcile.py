@@ -0,0 +1,108 @@
+from decimal import Decimal
+from django.db.models import Case, CharField, Max, Sum, Value, When
+from admin_hub.models import PortalUserBalance, WalletCheckpoint, WalletHistory
+from utils.wallet.checkpoints import SIGNED_AMOUNT, _latest_checkpoints, wallet_names
+from utils.wallet.engine import WALLET_BALANCE_FIELDS
+
+
+RECONCILE_BATCH_SIZE = 5000
+RECONCILE_TOLERANCE = Decimal('0.01')
+BALANCE_FIELDS = sorted(set(WALLET_BALANCE_FIELDS.values()))
+
+# Folds legacy wallet names into their balance column inside the GROUP BY.
+BALANCE_FIELD_OF = Case(
+    *[When(wallet_name__in=wallet_names(field), then=Value(field)) for field in BALANCE_FIELDS],
+    default=Value(None),
+    output_field=CharField(),
+)
+
+
+def _checkpoint_watermark(db_alias):
+    """(period, period_end) of the checkpoint series that reaches furthest, or (None, None)."""
+    latest = (
+        WalletCheckpoint.objects.using(db_alias).values('period')
+        .annotate(reached=Max('period_end')).order_by('-reached').first()
+    )
+    if not latest:
+        return None, None
+    return latest['period'], latest['reached']
+
+
+def expected_balances(db_alias, use_checkpoints=True, batch_size=RECONCILE_BATCH_SIZE):
+    """
+    {(user_id, balance field): expected balance} from the wallet history.
+
+    With checkpoints, each pair starts from its newest checkpoint of either
+    series at or before the furthest watermark, and only history after that
+    watermark is aggregated; otherwise the whole history is. Either way it is
+    one GROUP BY, streamed.
+    """
+    expected = {}
+    history = WalletHistory.objects.using(db_alias).filter(user_id__isnull=False)
+    if use_checkpoints:
+        _, watermark = _checkpoint_watermark(db_alias)
+        if watermark is not None:
+            # Not only the furthest series: pruning may have dropped a quiet
+            # wallet's daily rows while a monthly checkpoint still covers it.
+            expected = {
+                key: checkpoint.balance
+                for key, checkpoint in _latest_checkpoints(db_alias, before=watermark).items()
+            }
+            history = history.filter(created_at__gte=watermark)
+
+    rows = (
+        history.annotate(balance_field=BALANCE_FIELD_OF)
+        .exclude(balance_field__isnull=True)
+        .values('user_id', 'balance_field')
+        .annotate(delta=Sum(SIGNED_AMOUNT))
+        .order_by()
+        .values_list('user_id', 'balance_field', 'delta')
+    )
+    for user_id, field, delta in rows.iterator(chunk_size=batch_size):
+        expected[(user_id, field)] = expected.get((user_id, field), Decimal('0')) + (delta or Decimal('0'))
+    return expected
+
+
+def _compare_batch(batch, expected, tolerance):
+    mismatches = []
+    for user_id, *actuals in batch:
+        for field, actual in zip(BALANCE_FIELDS, actuals):
+            actual = actual or Decimal('0')
+            wanted = expected.pop((user_id, field), Decimal('0'))
+            if abs(actual - wanted) > tolerance:
+                mismatches.append((user_id, field, wanted, actual))
+    return mismatches
+
+
+def reconcile_tenant(db_alias, use_checkpoints=True, tolerance=RECONCILE_TOLERANCE, batch_size=RECONCILE_BATCH_SIZE):
+    """
+    Compares every PortalUserBalance column with its expected balance from
+    history. Returns (wallets checked, [(user_id, field, expected, actual)]).
+    History for users without a wallet row is reported with actual None.
+    """
+    expected = expected_balances(db_alias, use_checkpoints, batch_size)
+    balances = (
+        PortalUserBalance.objects.using(db_alias).exclude(user_id__isnull=True)
+        .order_by('user_id').values_list('user_id', *BALANCE_FIELDS)
+    )
+
+    checked = 0
+    mismatches = []
+    batch = []
+    for row in balances.iterator(chunk_size=batch_size):
+        batch.append(row)
+        if len(batch) >= batch_size:
+            mismatches += _compare_batch(batch, expected, tolerance)
+            checked += len(batch)
+            batch = []
+    if batch:
+        mismatches += _compare_batch(batch, expected, tolerance)
+        checked += len(batch)
+
+    # Whatever is left had history but no wallet row.
+    mismatches += [
+        (user_id, field, wanted, None)
+        for (user_id, field), wanted in sorted(expected.items())
+        if abs(wanted) > tolerance
+    ]
+    return checked, mismatches
@@ -0,0 +1,163 @@
+from collections import defaultdict
+from decimal import Decimal
+from django.db import transaction
+from django.db.models import Case, F, Value, When
+from django.utils.timezone import now
+from admin_hub.models import GlTrn, GovernmentChargeLog, PortalUserBalance, WalletHistory
+from admin_hub.thread_local import get_current_tenant
+from utils.wallet.engine import balance_field
+
+
+REVERSIBLE_STATUSES = ('SUCCESS', 'IN PROGRESS', 'DISPUTE RAISED')
+
+
+class ReversalError(Exception):
+    pass
+
+
+class AlreadyReversed(ReversalError):
+    pass
+
+
+def _reverse_of(nature):
+    return 'DR' if nature == 'CR' else 'CR'
+
+
+def _ledger_ids(service_table, txn_pk, member_id):
+    entries = GlTrn.objects.filter(source_table=service_table.db_table, linked_service_id=txn_pk)
+    if member_id is not None:
+        entries = entries.filter(member_id=member_id)
+    return list(entries.values_list('entry_id', flat=True))
+
+
+def _wallet_entries(gl_ids, member_id):
+    entries = WalletHistory.objects.filter(reference_id__in=gl_ids).order_by('history_id')
+    if member_id is not None:
+        entries = entries.filter(user_id=member_id)
+    # Entries on wallets without a balance column have nothing to undo.
+    return [entry for entry in entries if balance_field(entry.wallet_name)]
+
+
+def _reversal_rows(entries, balances):
+    """
+    One row per wallet entry with its reverse direction and the running
+    balance after it, starting from the balances in `balances`.
+    """
+    running = {}
+    rows = []
+    for entry in entries:
+        field = balance_field(entry.wallet_name)
+        key = (entry.user_id, field)
+        if key not in running:
+            account = balances.get(entry.user_id)
+            running[key] = Decimal(getattr(account, field, None) or 0) if account else Decimal('0')
+        amount = entry.changed_amount or Decimal('0')
+        delta = -amount if entry.change_type == 'CR' else amount
+        current = running[key]
+        running[key] = current + delta
+        rows.append({
+            'entry': entry,
+            'balance_field': field,
+            'amount': amount,
+            'delta': delta,
+            'reverse_type': _reverse_of(entry.change_type),
+            'current_balance': current,
+            'balance_after': running[key],
+        })
+    return rows
+
+
+def preview_reversal(service_table, txn_pk, member_id=None):
+    """Reversal rows for a transaction against current balances; writes nothing."""
+    gl_ids = _ledger_ids(service_table, txn_pk, member_id)
+    if not gl_ids:
+        raise ReversalError("No ledger entries found.")
+    entries = _wallet_entries(gl_ids, member_id)
+    balances = {
+        account.user_id: account
+        for account in PortalUserBalance.objects.filter(user_id__in={entry.user_id for entry in entries})
+    }
+    return _reversal_rows(entries, balances)
+
+
+def reverse_transaction(service_table, txn_pk, remarks_for, action_name=None, member_id=None,
+                        govt_charge_filter=None, performed_by=None, eligible_statuses=REVERSIBLE_STATUSES):
+    """
+    Reverses every wallet movement booked against one service-table row of
+    the current tenant in a single transaction.
+
+    The service row is locked first so concurrent reversals of the same
+    transaction serialise and the second one fails the status check. The
+    touched PortalUserBalance rows are then locked once, in primary key
+    order, and each receives a single UPDATE of F() deltas aggregated per
+    wallet. Compensating WalletHistory rows are bulk-inserted and the ledger
+    entries flipped with one UPDATE. `remarks_for(row)` builds the remarks
+    of each compensating entry; without `action_name` it keeps the original
+    entry's action.
+    """
+    db_alias = get_current_tenant() or 'default'
+    model = service_table.model
+    with transaction.atomic(using=db_alias):
+        txn_record = model.objects.select_for_update().filter(pk=txn_pk).first()
+        if txn_record is None:
+            raise ReversalError("Transaction not found.")
+        current_status = getattr(txn_record, service_table.status_field)
+        if current_status == 'REVERSED':
+            raise AlreadyReversed("Already reversed")
+        if eligible_statuses and current_status not in eligible_statuses:
+            raise ReversalError("Transaction status not eligible.")
+
+        gl_ids = _ledger_ids(service_table, txn_pk, member_id)
+        if not gl_ids:
+            raise ReversalError("No ledger entries to reverse.")
+        entries = _wallet_entries(gl_ids, member_id)
+
+        user_ids = {entry.user_id for entry in entries}
+        balances = {
+            account.user_id: account
+            for account in PortalUserBalance.objects.select_for_update().filter(user_id__in=user_ids).order_by('balance_id')
+        }
+        rows = _reversal_rows(entries, balances)
+
+        deltas = defaultdict(lambda: defaultdict(Decimal))
+        for row in rows:
+            deltas[row['entry'].user_id][row['balance_field']] += row['delta']
+
+        updated_on = now()
+        for user_id, wallet_deltas in deltas.items():
+            account = balances.get(user_id)
+            if account is None:
+                raise ReversalError(f"Wallet not found for user {user_id}.")
+            PortalUserBalance.objects.filter(pk=account.pk).update(
+                last_updated_on=updated_on,
+                last_updated_by=performed_by,
+                **{field: F(field) + delta for field, delta in wallet_deltas.items()}
+            )
+
+        WalletHistory.objects.bulk_create([
+            WalletHistory(
+                reference_id=row['entry'].reference_id,
+                action_name=action_name or row['entry'].action_name,
+                user_id=row['entry'].user_id,
+                wallet_name=row['entry'].wallet_name,
+                changed_amount=row['amount'],
+                change_type=row['reverse_type'],
+                balance_after=row['balance_after'],
+                remarks=remarks_for(row)[:500],
+                transaction_date=updated_on,
+            )
+            for row in rows if row['amount'] > 0
+        ])
+
+        GlTrn.objects.filter(entry_id__in=gl_ids).update(
+            entry_nature=Case(When(entry_nature='CR', then=Value('DR')), default=Value('CR'))
+        )
+
+        if govt_charge_filter:
+            GovernmentChargeLog.objects.filter(**govt_charge_filter).update(is_active=False)
+
+        # save() rather than update() so the txn_ref directory hears about it.
+        setattr(txn_record, service_table.status_field, 'REVERSED')
+        txn_record.save(update_fields=[service_table.status_field])
+
+    return rows
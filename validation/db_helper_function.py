@@ -1,11 +1,14 @@
 import os
-import json
+from decimal import Decimal
 from django.conf import settings
 from django.db import connections
-from admin_hub.models import Adcharges, AdServiceProvider
-from admin_hub.thread_local import get_current_request 
+from admin_hub.models import AdServiceProvider
+from admin_hub.thread_local import get_current_request, get_current_tenant
 from dotenv import load_dotenv
-from django.db.utils import ConnectionHandler
+from utils.database.charge_slabs import charge_slabs
+from utils.database.tenant_connections import register_tenant_database
+from utils.database.tenant_directory import tenant_directory
+from utils.database.tenant_domains import request_domain
 from user_agents import parse
 from utils.log_file.log import save_api_log
 
@@ -48,36 +51,21 @@ from utils.log_file.log import save_api_log
 
 load_dotenv()
 
-DOMAIN_DB_MAPPING_JSON = os.getenv("DOMAIN_DB_MAPPING", "[]")
-
-try:
-    domain_database_map = json.loads(DOMAIN_DB_MAPPING_JSON)
-except json.JSONDecodeError as err:
-    print(f"Error parsing DOMAIN_DB_MAPPING JSON: {err}")
-    domain_database_map = []
-
 
 def get_database_from_domain():
     try:
+        resolved_alias = get_current_tenant()
+        if resolved_alias:
+            return resolved_alias
+
         request = get_current_request()
         if not request:
             return None
 
-        raw_domain = (
-            request.META.get("HTTP_DOMAIN") or
-            request.META.get("HTTP_ORIGIN") or
-            request.META.get("HTTP_HOST") or
-            ""
-        )
-        clean_domain = raw_domain.replace("https://", "").replace("http://", "").strip("/").lower()
-
-        for entry in domain_database_map:
-            for db_alias, allowed_domains in entry.items():
-                if clean_domain in [d.lower() for d in allowed_domains]:
-                    switch_to_database(db_alias)
-                    return db_alias
-
-        return None
+        db_alias = getattr(request, 'tenant_db', None) or tenant_directory.alias_for_domain(request_domain(request))
+        if db_alias:
+            switch_to_database(db_alias)
+        return db_alias
     except Exception as exc:
         print(f"Failed to resolve database from domain: {exc}")
         return None
@@ -124,26 +112,7 @@ def is_service_assigned_to_user(request, service_provider_id: int) -> bool:
 
 
 def switch_to_database(db_alias: str) -> str:
-    if db_alias in settings.DATABASES:
-        return db_alias
-
-    settings.DATABASES[db_alias] = {
-        'ENGINE': 'django.db.backends.postgresql',
-        'NAME': db_alias,
-        'USER': settings.DATABASES['default']['USER'],
-        'PASSWORD': settings.DATABASES['default']['PASSWORD'],
-        'HOST': settings.DATABASES['default']['HOST'],
-        'PORT': settings.DATABASES['default']['PORT'],
-        'ATOMIC_REQUESTS': True,
-        'AUTOCOMMIT': True,
-        'CONN_MAX_AGE': 0,
-        'CONN_HEALTH_CHECKS': False,
-        'OPTIONS': {},
-        'TIME_ZONE': None,
-    }
-
-    connections._connections = ConnectionHandler(settings.DATABASES)
-    return db_alias
+    return register_tenant_database(db_alias)
 
 
 def calculate_and_apply_charges(
@@ -161,7 +130,9 @@ def calculate_and_apply_charges(
     charge_tier: str,
     txn_reference_id,
     sub_service_id=None,
-    portal_user_id=None
+    portal_user_id=None,
+    operator_id=None,
+    charge_type=None
 ) -> bool:
     try:
         save_api_log(
@@ -170,28 +141,24 @@ def calculate_and_apply_charges(
             sp_id=provider_id, api_category="Charge Processing"
         )
 
-        gst_percentage = float(provider_instance.hsn_sac.tax_rate or 0)
-        charge_slabs = Adcharges.objects.filter(service_provider_id=provider_id)
-        selected_charge = None
-
-        if charge_slabs.exists():
-            for slab in charge_slabs:
-                if slab.minimum <= txn_amount <= slab.maximum:
-                    selected_charge = slab
-                    break
-            if not selected_charge:
-                selected_charge = charge_slabs.first()  
-                
+        db_alias = get_database_from_domain() or 'default'
+        provider_charges = charge_slabs.provider(db_alias, provider_id)
+        amount = Decimal(str(txn_amount))
+        selected_charge = (
+            provider_charges.slab_for(amount, identifier_value=operator_id, transaction_type=charge_type)
+            if provider_charges else None
+        )
+        gst_percentage = provider_charges.gst_rate if provider_charges else Decimal('0')
+
         if selected_charge:
-            charge_rate = selected_charge.rate
-            rate_is_percent = selected_charge.rate_type == "is_percent"
-            charge_nature = selected_charge.charges_type
+            rate_is_percent = selected_charge.is_percent
+            charge_nature = selected_charge.transaction_type
+            base_commission = selected_charge.charge_for(amount)
         else:
-            charge_rate = 0.0
             rate_is_percent = False
             charge_nature = None
+            base_commission = Decimal('0')
 
-        base_commission = (txn_amount * charge_rate / 100) if rate_is_percent else charge_rate
         gst_amount_on_commission = base_commission - (base_commission / (1 + (gst_percentage / 100)))
 
         save_api_log(
@@ -199,8 +166,8 @@ def calculate_and_apply_charges(
             {
                 "status": "processing",
                 "charges": {
-                    "base_commission": round(base_commission, 2),
-                    "gst_on_commission": round(gst_amount_on_commission, 2),
+                    "base_commission": float(round(base_commission, 2)),
+                    "gst_on_commission": float(round(gst_amount_on_commission, 2)),
                     "rate_type": "percent" if rate_is_percent else "flat"
                 }
             },